@@ -0,0 +1,214 @@
+"""
+Benchmark suite for the Python AES, GHASH and AES-GCM implementations
+
+Usage:
+
+    python benchmarks/bench.py [--output results.json] [--baseline benchmarks/baseline.json]
+                               [--threshold 0.25] [--quick] [--filter SUBSTRING]
+
+Every benchmark reports per-call latency, calls/s, and where it applies MB/s and
+blocks/s. Results are written as JSON; when a baseline is given, any benchmark whose
+calls/s dropped by more than the threshold, or that is missing from the baseline, is
+reported and the exit status is 1.
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src", "python"))
+
+import aes_fast  # noqa: E402
+import aes_gcm  # noqa: E402
+from aes import AES  # noqa: E402
+from aes_bitslice import BitslicedAES  # noqa: E402
+from aes_fast import FastAES  # noqa: E402
+from aes_gcm import AESGCM  # noqa: E402
+from gcm_context import export_context, import_context  # noqa: E402
+from gf128 import GF128Table  # noqa: E402
+
+KEY_SIZES = (16, 24, 32)
+
+# (message bytes, AAD bytes) for end-to-end GCM
+GCM_SIZES = ((0, 0), (0, 1024), (64, 16), (1024, 16), (65536, 64), (1 << 20, 64), (4 << 20, 64))
+
+# Smallest total run time of one measurement
+MIN_TIME = 0.2
+
+
+def measure(fn, nbytes: int = 0, repeat: int = 3) -> dict:
+    """Time fn(), returning the best of `repeat` runs of an auto-sized loop."""
+
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        elapsed = time.perf_counter() - start
+        if elapsed >= MIN_TIME or number >= 1 << 20:
+            break
+        number *= 2 if elapsed == 0 else max(2, int(MIN_TIME / elapsed) + 1)
+
+    best = elapsed / number
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        best = min(best, (time.perf_counter() - start) / number)
+
+    result = {"latency_us": best * 1e6, "calls_per_s": 1 / best if best > 0 else float("inf")}
+    if nbytes:
+        result["mb_per_s"] = nbytes / best / 1e6
+        result["blocks_per_s"] = nbytes / 16 / best
+
+    return result
+
+
+def _uncached(fn):
+    """Run fn with the key schedule and H caches cleared, so every call pays full setup."""
+
+    def run():
+        aes_fast.SCHEDULE_CACHE.clear()
+        aes_gcm.H_CACHE.clear()
+        return fn()
+
+    return run
+
+
+def benchmarks(quick: bool):
+    """Yield (name, callable, bytes processed per call)."""
+
+    block = bytes(range(16))
+    batch = bytes(65536)
+
+    for key_len in KEY_SIZES:
+        bits = key_len * 8
+        key = bytes(range(key_len))
+
+        for name, cipher in (("aes", AES), ("fast_aes", FastAES)):
+            ciph = cipher(key)
+            yield f"{name}{bits}.encrypt", lambda c=ciph: c.encrypt(block), 16
+            yield f"{name}{bits}.decrypt", lambda c=ciph: c.decrypt(block), 16
+            yield f"{name}{bits}.init", _uncached(lambda c=cipher, k=key: c(k)), 0
+
+        ciph = FastAES(key)
+        yield f"fast_aes{bits}.encrypt_blocks_64k", lambda c=ciph: c.encrypt_blocks(batch), 65536
+        yield f"fast_aes{bits}.decrypt_blocks_64k", lambda c=ciph: c.decrypt_blocks(batch), 65536
+
+        ciph = BitslicedAES(key)
+        name = f"bitsliced_aes{bits}"
+        yield f"{name}.encrypt_blocks_64k", lambda c=ciph: c.encrypt_blocks(batch), 65536
+        yield f"{name}.decrypt_blocks_64k", lambda c=ciph: c.decrypt_blocks(batch), 65536
+
+        yield f"aes_gcm{bits}.init", _uncached(lambda k=key: AESGCM(k)), 0
+        yield f"aes_gcm{bits}.init_cached", lambda k=key: AESGCM(k), 0
+        context = export_context(AESGCM(key))
+        yield f"aes_gcm{bits}.import_context", _uncached(lambda c=context: import_context(c)), 0
+
+    gcm = AESGCM(bytes(16))
+    h = gcm.H
+    x = bytes(range(16, 32))
+    for bits in (4, 8):
+        table = GF128Table(int.from_bytes(h, "big"), bits)
+        yield f"gf_mul.table{bits}", lambda t=table: t.mul(0x0123456789ABCDEF0123456789ABCDEF), 16
+    yield "gf_mul.bitserial", lambda: gcm._gf_mul(x, h), 16
+    yield "ghash_64k", lambda: gcm._ghash(batch), 65536
+    yield "ghash_ref_4k", lambda: gcm._ghash_ref(batch[:4096]), 4096
+
+    iv = bytes(12)
+    for size, aad_size in GCM_SIZES:
+        if quick and size > 65536:
+            continue
+        plaintext = bytes(size)
+        aad = bytes(aad_size)
+        c, t = gcm.encrypt(plaintext, iv, aad)
+        name = f"aes_gcm128.{{}}_{size}_aad{aad_size}"
+        yield name.format("encrypt"), lambda p=plaintext, a=aad: gcm.encrypt(p, iv, a), size
+        yield (
+            name.format("decrypt"),
+            lambda c=c, a=aad, t=t: gcm.decrypt(c, iv, a, t),
+            size,
+        )
+
+    for aad_size in (1024, 65536):
+        aad = bytes(aad_size)
+        yield f"aes_gcm128.mac_aad{aad_size}", lambda a=aad: gcm.mac(iv, a), aad_size
+
+    for size in (64, 1500):
+        messages = [(i.to_bytes(12, "big"), bytes(size), bytes(16)) for i in range(1000)]
+        name = f"aes_gcm128.encrypt_many_1000x{size}"
+        yield name, lambda m=messages: gcm.encrypt_many(m), 1000 * size
+
+
+def compare(results: dict, baseline: dict, threshold: float):
+    """Return ([(name, ratio)] slower than baseline by more than threshold, [names missing
+    from baseline])."""
+
+    regressions = []
+    missing = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if base is None:
+            missing.append(name)
+            continue
+        ratio = result["calls_per_s"] / base["calls_per_s"]
+        if ratio < 1 - threshold:
+            regressions.append((name, ratio))
+
+    return regressions, missing
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--output", help="write results as JSON to this path")
+    parser.add_argument("--baseline", help="baseline JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.25, help="allowed slowdown ratio")
+    parser.add_argument("--quick", action="store_true", help="skip multi-MB messages")
+    parser.add_argument("--filter", default="", help="only run benchmarks containing this")
+    args = parser.parse_args(argv)
+
+    results = {}
+    for name, fn, nbytes in benchmarks(args.quick):
+        if args.filter not in name:
+            continue
+        results[name] = measure(fn, nbytes)
+
+        r = results[name]
+        rate = f"{r['mb_per_s']:10.3f} MB/s" if "mb_per_s" in r else " " * 15
+        print(f"{name:40s} {r['latency_us']:14.2f} us {rate}")
+
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "machine": platform.machine(),
+            "numpy": aes_fast.np is not None,
+        },
+        "results": results,
+    }
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+            f.write("\n")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)["results"]
+
+        regressions, missing = compare(results, baseline, args.threshold)
+        for name, ratio in regressions:
+            print(f"[Regression] {name}: {ratio:.2f}x of baseline", file=sys.stderr)
+        for name in missing:
+            print(f"[Missing] {name}: not in baseline, regenerate it", file=sys.stderr)
+        if regressions or missing:
+            return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
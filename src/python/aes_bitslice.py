@@ -0,0 +1,464 @@
+"""
+Bitsliced AES implementation
+Reference: FIPS PUB 197,
+           J. Boyar, R. Peralta, "A depth-16 circuit for the AES S-box", 2011
+           (SubBytes circuit)
+
+N blocks are transposed into 8 bit-planes, one Python int each: bit j * N + b of plane k
+is bit k of state byte j of block b. SubBytes is evaluated as a Boolean circuit over
+the planes, ShiftRows and MixColumns move N-bit lanes with shifts and masks, and the
+key schedule runs SubWord through the same circuit. The transpose itself uses shifts,
+masks and fixed-stride slices, so no step indexes a table with key or data bytes,
+unlike the SBOX and T-table lookups in `AES` and `FastAES`.
+
+CPython's big integer operations are not guaranteed to run in constant time; this
+removes the cache-timing channel of secret-indexed lookups, not every timing channel.
+"""
+
+from typing import Final
+
+from aes import byte_view, output_view
+from key_cache import LRUCache
+
+# Blocks transposed together; wider batches amortize the per-operation overhead
+BATCH_BLOCKS = 4096
+
+# Lane masks per batch size
+_MASKS = LRUCache(maxsize=64)
+
+# Transpose masks per batch size
+_BIT_MASKS = LRUCache(maxsize=64)
+
+
+def _bit_masks(n: int):
+    """Masks over 16n bytes: bit 0 of each byte, then the low 2, 4, 8 bits of each 2, 4, 8 bytes."""
+
+    patterns = (b"\x01", b"\x03\x00", b"\x0f\x00\x00\x00", b"\xff" + bytes(7))
+    return tuple(int.from_bytes(p * (16 * n // len(p)), "little") for p in patterns)
+
+
+def _pack(data: bytes, n: int):
+    """Transpose n blocks into 8 bit-planes with shifts and masks only.
+
+    Bit k of every byte is gathered into the low byte of its 8-byte group in three
+    shift/mask steps, and those bytes are taken with a fixed-stride slice.
+    """
+
+    columns = b"".join(data[j::16] for j in range(16))  # byte j of block b at j * n + b
+    x = int.from_bytes(columns, "little")
+    m1, m2, m4, m8 = _BIT_MASKS.get(n, lambda: _bit_masks(n))
+
+    planes = []
+    for k in range(8):
+        y = (x >> k) & m1
+        y = (y | y >> 7) & m2
+        y = (y | y >> 14) & m4
+        y = (y | y >> 28) & m8
+        planes.append(int.from_bytes(y.to_bytes(16 * n, "little")[::8], "little"))
+
+    return planes
+
+
+def _unpack(planes, n: int) -> bytes:
+    """Inverse of _pack."""
+
+    width = 16 * n
+    m1, m2, m4, _ = _BIT_MASKS.get(n, lambda: _bit_masks(n))
+    spread = bytearray(width)
+
+    columns = 0
+    for k, plane in enumerate(planes):
+        spread[::8] = plane.to_bytes(2 * n, "little")
+        y = int.from_bytes(spread, "little")
+        y = (y | y << 28) & m4
+        y = (y | y << 14) & m2
+        y = (y | y << 7) & m1
+        columns |= y << k
+    columns = columns.to_bytes(width, "little")
+
+    out = bytearray(width)
+    for j in range(16):
+        out[j::16] = columns[j * n : (j + 1) * n]
+
+    return bytes(out)
+
+
+def _spread(mask16: int, n: int) -> int:
+    """Widen bit j of a 16-bit mask to lane j (n ones at j * n)."""
+
+    lanes = int(("0" * (n - 1)).join(format(mask16, "016b")), 2)
+    return lanes * ((1 << n) - 1)
+
+
+def _masks(n: int):
+    """(all lanes, row 0, row 1, row 2, row 3) for lanes of n bits; lane j is in row j % 4."""
+
+    rows = tuple(_spread(0x1111 << r, n) for r in range(4))
+    return ((1 << 16 * n) - 1,) + rows
+
+
+def _sub_bytes(planes, one: int):
+    """Boyar-Peralta S-box circuit over bit-planes; `one` is the all-ones plane."""
+
+    U7, U6, U5, U4, U3, U2, U1, U0 = planes  # U0 is the most significant bit
+
+    T1 = U0 ^ U3
+    T2 = U0 ^ U5
+    T3 = U0 ^ U6
+    T4 = U3 ^ U5
+    T5 = U4 ^ U6
+    T6 = T1 ^ T5
+    T7 = U1 ^ U2
+    T8 = U7 ^ T6
+    T9 = U7 ^ T7
+    T10 = T6 ^ T7
+    T11 = U1 ^ U5
+    T12 = U2 ^ U5
+    T13 = T3 ^ T4
+    T14 = T6 ^ T11
+    T15 = T5 ^ T11
+    T16 = T5 ^ T12
+    T17 = T9 ^ T16
+    T18 = U3 ^ U7
+    T19 = T7 ^ T18
+    T20 = T1 ^ T19
+    T21 = U6 ^ U7
+    T22 = T7 ^ T21
+    T23 = T2 ^ T22
+    T24 = T2 ^ T10
+    T25 = T20 ^ T17
+    T26 = T3 ^ T16
+    T27 = T1 ^ T12
+
+    M1 = T13 & T6
+    M2 = T23 & T8
+    M3 = T14 ^ M1
+    M4 = T19 & U7
+    M5 = M4 ^ M1
+    M6 = T3 & T16
+    M7 = T22 & T9
+    M8 = T26 ^ M6
+    M9 = T20 & T17
+    M10 = M9 ^ M6
+    M11 = T1 & T15
+    M12 = T4 & T27
+    M13 = M12 ^ M11
+    M14 = T2 & T10
+    M15 = M14 ^ M11
+    M16 = M3 ^ M2
+    M17 = M5 ^ T24
+    M18 = M8 ^ M7
+    M19 = M10 ^ M15
+    M20 = M16 ^ M13
+    M21 = M17 ^ M15
+    M22 = M18 ^ M13
+    M23 = M19 ^ T25
+    M24 = M22 ^ M23
+    M25 = M22 & M20
+    M26 = M21 ^ M25
+    M27 = M20 ^ M21
+    M28 = M23 ^ M25
+    M29 = M28 & M27
+    M30 = M26 & M24
+    M31 = M20 & M23
+    M32 = M27 & M31
+    M33 = M27 ^ M25
+    M34 = M21 & M22
+    M35 = M24 & M34
+    M36 = M24 ^ M25
+    M37 = M21 ^ M29
+    M38 = M32 ^ M33
+    M39 = M23 ^ M30
+    M40 = M35 ^ M36
+    M41 = M38 ^ M40
+    M42 = M37 ^ M39
+    M43 = M37 ^ M38
+    M44 = M39 ^ M40
+    M45 = M42 ^ M41
+    M46 = M44 & T6
+    M47 = M40 & T8
+    M48 = M39 & U7
+    M49 = M43 & T16
+    M50 = M38 & T9
+    M51 = M37 & T17
+    M52 = M42 & T15
+    M53 = M45 & T27
+    M54 = M41 & T10
+    M55 = M44 & T13
+    M56 = M40 & T23
+    M57 = M39 & T19
+    M58 = M43 & T3
+    M59 = M38 & T22
+    M60 = M37 & T20
+    M61 = M42 & T1
+    M62 = M45 & T4
+    M63 = M41 & T2
+
+    L0 = M61 ^ M62
+    L1 = M50 ^ M56
+    L2 = M46 ^ M48
+    L3 = M47 ^ M55
+    L4 = M54 ^ M58
+    L5 = M49 ^ M61
+    L6 = M62 ^ L5
+    L7 = M46 ^ L3
+    L8 = M51 ^ M59
+    L9 = M52 ^ M53
+    L10 = M53 ^ L4
+    L11 = M60 ^ L2
+    L12 = M48 ^ M51
+    L13 = M50 ^ L0
+    L14 = M52 ^ M61
+    L15 = M55 ^ L1
+    L16 = M56 ^ L0
+    L17 = M57 ^ L1
+    L18 = M58 ^ L8
+    L19 = M63 ^ L4
+    L20 = L0 ^ L1
+    L21 = L1 ^ L7
+    L22 = L3 ^ L12
+    L23 = L18 ^ L2
+    L24 = L15 ^ L9
+    L25 = L6 ^ L10
+    L26 = L7 ^ L9
+    L27 = L8 ^ L10
+    L28 = L11 ^ L14
+    L29 = L11 ^ L17
+
+    return [
+        one ^ L6 ^ L23,  # S7, least significant bit
+        one ^ L13 ^ L27,
+        L25 ^ L29,
+        L20 ^ L22,
+        L6 ^ L21,
+        one ^ L19 ^ L28,
+        one ^ L16 ^ L26,
+        L6 ^ L24,  # S0
+    ]
+
+
+def _inv_affine(planes):
+    """Linear part of the inverse S-box affine map: b_i = b_{i+2} ^ b_{i+5} ^ b_{i+7}."""
+
+    return [planes[(i + 2) % 8] ^ planes[(i + 5) % 8] ^ planes[(i + 7) % 8] for i in range(8)]
+
+
+def _inv_sub_bytes(planes, one: int):
+    """InvSubBytes through the forward circuit.
+
+    The inverse affine map is L(x) ^ 0x05 with L linear, so inversion in GF(2^8) is
+    L(S(y)) ^ 0x05 and InvS(x) = L(S(L(x) ^ 0x05)) ^ 0x05.
+    """
+
+    x = _inv_affine(planes)
+    x[0] ^= one
+    x[2] ^= one
+
+    x = _inv_affine(_sub_bytes(x, one))
+    x[0] ^= one
+    x[2] ^= one
+
+    return x
+
+
+def _xtime(planes):
+    """Multiply every byte by x in GF(2^8)."""
+
+    p0, p1, p2, p3, p4, p5, p6, p7 = planes
+    return [p7, p0 ^ p7, p1, p2 ^ p7, p3 ^ p7, p4, p5, p6]
+
+
+def _rotate_rows(plane: int, r: int, n: int, masks) -> int:
+    """Move byte (row + r, column) of every column to (row, column)."""
+
+    low = 0
+    for row in range(4 - r):
+        low |= masks[1 + row]
+    return ((plane >> r * n) & low) | ((plane << (4 - r) * n) & (masks[0] ^ low))
+
+
+def _shift_rows(planes, n: int, masks, inverse: bool = False):
+    """Rotate row r left by r columns, or right for InvShiftRows."""
+
+    full = masks[0]
+    width = 16 * n
+    out = []
+    for plane in planes:
+        p = plane & masks[1]
+        for r in range(1, 4):
+            row = plane & masks[1 + r]
+            s = 4 * r * n if not inverse else width - 4 * r * n
+            p |= (row >> s) | ((row << (width - s)) & full)
+        out.append(p)
+
+    return out
+
+
+def _mix_columns(planes, n: int, masks):
+    """out_r = 2 a_r ^ 3 a_{r+1} ^ a_{r+2} ^ a_{r+3}, computed as 2 t_r ^ t_{r+1} ^ a_{r+3}
+    with t_r = a_r ^ a_{r+1}.
+    """
+
+    t = [p ^ _rotate_rows(p, 1, n, masks) for p in planes]
+    t2 = _xtime(t)
+
+    return [
+        t2[k] ^ _rotate_rows(t[k], 1, n, masks) ^ _rotate_rows(planes[k], 3, n, masks)
+        for k in range(8)
+    ]
+
+
+def _inv_mix_columns(planes, n: int, masks):
+    """InvMixColumns as a_r ^= 4 (a_r ^ a_{r+2}) followed by MixColumns."""
+
+    u = _xtime(_xtime([p ^ _rotate_rows(p, 2, n, masks) for p in planes]))
+    return _mix_columns([p ^ q for p, q in zip(planes, u)], n, masks)
+
+
+class BitslicedAES:
+    """AES over bit-planes of many blocks, with the same interface as `FastAES`.
+
+    Single-block calls transpose one block; use encrypt_blocks and decrypt_blocks
+    on wide batches.
+    """
+
+    __slots__ = ("key", "Nk", "Nb", "Nr", "rk")
+
+    def __init__(self, key):
+        if len(key) not in [16, 24, 32]:
+            raise ValueError("Key must be either 16, 24, or 32 bytes long.")
+
+        self.key: Final = key
+
+        self.Nk = len(key) // 4
+        self.Nb = 4
+        self.Nr = self.Nk + 6
+
+        self.rk = self._key_expansion()  # Round keys, 16 bytes each
+
+    def encrypt(self, plaintext: bytes) -> bytes:
+        """Encrypt a single block of 16 bytes using AES."""
+
+        plaintext = byte_view(plaintext)
+        if len(plaintext) != 16:
+            raise ValueError("Plaintext must be 16 bytes long.")
+
+        return self._crypt(plaintext, decrypt=False)
+
+    def decrypt(self, ciphertext: bytes) -> bytes:
+        """Decrypt a single block of 16 bytes using AES."""
+
+        ciphertext = byte_view(ciphertext)
+        if len(ciphertext) != 16:
+            raise ValueError("Ciphertext must be 16 bytes long.")
+
+        return self._crypt(ciphertext, decrypt=True)
+
+    def encrypt_blocks(self, data: bytes) -> bytes:
+        """Encrypt any multiple of 16 bytes (ECB), BATCH_BLOCKS blocks at a time."""
+
+        return self._batched(data, decrypt=False)
+
+    def decrypt_blocks(self, data: bytes) -> bytes:
+        """Decrypt any multiple of 16 bytes (ECB), BATCH_BLOCKS blocks at a time."""
+
+        return self._batched(data, decrypt=True)
+
+    def encrypt_into(self, src, dst):
+        """encrypt_blocks from one buffer into another, a batch at a time; src may be dst."""
+
+        self._batched(src, decrypt=False, out=dst)
+
+    def decrypt_into(self, src, dst):
+        """decrypt_blocks from one buffer into another, a batch at a time; src may be dst."""
+
+        self._batched(src, decrypt=True, out=dst)
+
+    def _batched(self, data, decrypt: bool, out=None) -> bytes:
+        data = byte_view(data)
+        if len(data) % 16 != 0:
+            raise ValueError("Data length must be a multiple of 16 bytes.")
+
+        step = 16 * BATCH_BLOCKS
+        if out is None:
+            return b"".join(
+                self._crypt(data[i : i + step], decrypt) for i in range(0, len(data), step)
+            )
+
+        out = output_view(out, len(data))
+        for i in range(0, len(data), step):
+            out[i : i + step] = self._crypt(data[i : i + step], decrypt)
+
+    def _crypt(self, data, decrypt: bool) -> bytes:
+        """Run one batch, padded with zero blocks to a multiple of 8 so lanes are whole bytes."""
+
+        n = len(data) // 16
+        n += -n % 8
+        masks = _MASKS.get(n, lambda: _masks(n))
+        rk = self._round_keys(n)
+
+        planes = _pack(bytes(data) + bytes(16 * n - len(data)), n)
+        if decrypt:
+            planes = self._decrypt_planes(planes, rk, n, masks)
+        else:
+            planes = self._encrypt_planes(planes, rk, n, masks)
+
+        return _unpack(planes, n)[: len(data)]
+
+    def _round_keys(self, n: int):
+        """Round keys as bit-planes, each key byte broadcast to its lane of n blocks."""
+
+        lane = n // 8  # bytes per lane
+        return [
+            [
+                int.from_bytes(b"".join(bytes([0xFF * (b >> k & 1)]) * lane for b in rk), "little")
+                for k in range(8)
+            ]
+            for rk in self.rk
+        ]
+
+    def _encrypt_planes(self, s, rk, n: int, masks):
+        one = masks[0]
+
+        s = [p ^ k for p, k in zip(s, rk[0])]
+        for round in range(1, self.Nr):
+            s = _mix_columns(_shift_rows(_sub_bytes(s, one), n, masks), n, masks)
+            s = [p ^ k for p, k in zip(s, rk[round])]
+
+        s = _shift_rows(_sub_bytes(s, one), n, masks)
+        return [p ^ k for p, k in zip(s, rk[self.Nr])]
+
+    def _decrypt_planes(self, s, rk, n: int, masks):
+        one = masks[0]
+
+        s = [p ^ k for p, k in zip(s, rk[self.Nr])]
+        for round in range(self.Nr - 1, 0, -1):
+            s = _inv_sub_bytes(_shift_rows(s, n, masks, inverse=True), one)
+            s = _inv_mix_columns([p ^ k for p, k in zip(s, rk[round])], n, masks)
+
+        s = _inv_sub_bytes(_shift_rows(s, n, masks, inverse=True), one)
+        return [p ^ k for p, k in zip(s, rk[0])]
+
+    def _sub_word(self, word: bytes) -> bytes:
+        """SubWord through the circuit, so the key schedule has no S-box lookups either."""
+
+        planes = _sub_bytes(_pack(word + bytes(12), 1), 0xFFFF)
+        return _unpack(planes, 1)[:4]
+
+    def _key_expansion(self):
+        key = bytes(byte_view(self.key))  # words are joined with +, which needs bytes
+        w = [key[4 * i : 4 * i + 4] for i in range(self.Nk)]
+
+        rcon = 0x01
+        for i in range(self.Nk, self.Nb * (self.Nr + 1)):
+            temp = w[i - 1]
+            if i % self.Nk == 0:
+                temp = self._sub_word(temp[1:] + temp[:1])
+                temp = bytes([temp[0] ^ rcon]) + temp[1:]
+                rcon = ((rcon << 1) ^ (0x1B if rcon & 0x80 else 0)) & 0xFF
+            elif self.Nk > 6 and i % self.Nk == 4:
+                temp = self._sub_word(temp)
+
+            w.append(bytes(a ^ b for a, b in zip(w[i - self.Nk], temp)))
+
+        return tuple(b"".join(w[4 * r : 4 * r + 4]) for r in range(self.Nr + 1))
@@ -0,0 +1,156 @@
+"""
+AES-CTR (Counter Mode) implementation
+Reference: NIST SP 800-38A, Section 6.5, https://nvlpubs.nist.gov/nistpubs/legacy/sp/nistspecialpublication800-38a.pdf
+"""
+
+from math import ceil
+from typing import Final
+
+import instrument
+from aes import byte_view, output_view
+from aes_fast import FastAES
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - NumPy is optional
+    np = None
+
+# Blocks of keystream generated per batch, bounds the temporary buffers
+CHUNK_BLOCKS = 4096
+
+
+def advance(cb: bytes, n: int, bits: int = 32) -> bytes:
+    """Return the counter block n increments after cb, wrapping the low `bits` bits."""
+
+    x = int.from_bytes(cb, "big")
+    mask = (1 << bits) - 1
+
+    return ((x & ~mask) | ((x + n) & mask)).to_bytes(16, "big")
+
+
+def counter_blocks(icb: bytes, n: int, bits: int = 32) -> bytes:
+    """Return the n consecutive counter blocks starting at icb."""
+
+    if np is not None and n > 1 and bits <= 64:
+        mask = (1 << bits) - 1
+        low = int.from_bytes(icb[8:], "big")
+
+        counters = np.arange(n, dtype=np.uint64) + np.uint64(low & mask)
+        if bits < 64:
+            counters &= np.uint64(mask)
+        counters |= np.uint64(low & ~mask & 0xFFFFFFFFFFFFFFFF)
+
+        blocks = np.empty((n, 16), dtype=np.uint8)
+        blocks[:, :8] = np.frombuffer(icb[:8], dtype=np.uint8)
+        blocks[:, 8:] = counters.astype(">u8").view(np.uint8).reshape(n, 8)
+        return blocks.tobytes()
+
+    return b"".join(advance(icb, i, bits) for i in range(n))
+
+
+def ctr_xor(ciph, icb: bytes, data, offset: int = 0, bits: int = 32, chunk_blocks=None, out=None):
+    """XOR data with the keystream E_K(CB_1) || E_K(CB_2) || ..., starting `offset` bytes in.
+
+    Returns a new bytearray of len(data), or writes into the writable buffer `out`
+    (which may be data itself) and returns it.
+    """
+
+    chunk_blocks = chunk_blocks or CHUNK_BLOCKS
+
+    data = byte_view(data)
+    stats = instrument.current
+    if out is None:
+        out = bytearray(len(data))
+        if stats is not None:
+            stats.allocations += 1
+    block, skip = divmod(offset, 16)
+    cb = advance(icb, block, bits) if block else icb
+
+    i = 0
+    while i < len(data):
+        n = min(chunk_blocks, ceil((skip + len(data) - i) / 16))  # blocks in this chunk
+        keystream = ciph.encrypt_blocks(counter_blocks(cb, n, bits))
+        if stats is not None:
+            stats.block_encryptions += n
+            stats.allocations += 2  # counter blocks, keystream
+
+        m = min(16 * n - skip, len(data) - i)  # bytes of data covered by this chunk
+        a = data[i : i + m]
+        k = keystream[skip : skip + m]
+        out[i : i + m] = (int.from_bytes(a, "big") ^ int.from_bytes(k, "big")).to_bytes(m, "big")
+
+        i += m
+        skip = 0
+        cb = advance(cb, n, bits)
+
+    return out
+
+
+class AESCTR:
+    """AES-CTR with a seekable keystream, matching aes_ctr.sv.
+
+    The counter block starts at iv and its low `counter_bits` bits are incremented per
+    block, like `inc #(.s(32))` in the RTL. Pass 128 for a full-width counter.
+    """
+
+    __slots__ = ("ciph", "iv", "counter_bits", "_offset")
+
+    def __init__(self, key: bytes, iv: bytes, counter_bits: int = 32, cipher=FastAES):
+        if len(iv) != 16:
+            raise ValueError("IV must be 16 bytes long.")
+
+        if not 1 <= counter_bits <= 128:
+            raise ValueError("Counter width must be between 1 and 128 bits.")
+
+        self.ciph = cipher(key)
+        self.iv: Final = bytes(iv)
+        self.counter_bits = counter_bits
+        self._offset = 0  # keystream position of the next update()
+
+    def encrypt(self, data: bytes) -> bytes:
+        """Encrypt a whole message from the start of the keystream."""
+
+        return bytes(ctr_xor(self.ciph, self.iv, data, 0, self.counter_bits))
+
+    def decrypt(self, data: bytes) -> bytes:
+        """Decrypt a whole message from the start of the keystream."""
+
+        return self.encrypt(data)
+
+    def encrypt_into(self, src, dst):
+        """Encrypt a whole message from src into dst, which may be src."""
+
+        src = byte_view(src)
+        ctr_xor(self.ciph, self.iv, src, 0, self.counter_bits, out=output_view(dst, len(src)))
+
+    def decrypt_into(self, src, dst):
+        """Decrypt a whole message from src into dst, which may be src."""
+
+        self.encrypt_into(src, dst)
+
+    def update(self, data: bytes) -> bytes:
+        """Encrypt or decrypt data at the current position and move past it."""
+
+        out = ctr_xor(self.ciph, self.iv, data, self._offset, self.counter_bits)
+        self._offset += len(data)
+
+        return bytes(out)
+
+    def seek(self, offset: int):
+        """Move to any byte offset of the keystream, without processing what comes before."""
+
+        if offset < 0:
+            raise ValueError("Offset must be non-negative.")
+
+        self._offset = offset
+
+    def tell(self) -> int:
+        return self._offset
+
+
+if __name__ == "__main__":
+    import sys
+
+    from file_crypt import main
+
+    sys.exit(main(sys.argv[1:], "ctr"))
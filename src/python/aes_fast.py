@@ -0,0 +1,375 @@
+"""
+Word-oriented (T-table) AES implementation
+Reference: FIPS PUB 197, Section 5.3.5 (Equivalent Inverse Cipher),
+           J. Daemen, V. Rijmen, "AES Proposal: Rijndael", Section 5.2.1
+"""
+
+from typing import Final
+
+from aes import INV_SBOX, SBOX, byte_view, output_view
+from key_cache import LRUCache
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - NumPy is optional, blocks are then processed one by one
+    np = None
+
+
+def _xtime(n: int) -> int:
+    return ((n << 1) ^ (0x1B if (n & 0x80) else 0x00)) & 0xFF
+
+
+def _ror8(word: int) -> int:
+    return ((word >> 8) | (word << 24)) & 0xFFFFFFFF
+
+
+def _build_tables():
+    """Build the encryption (Te0-Te3) and decryption (Td0-Td3) round tables."""
+
+    te0 = []
+    td0 = []
+    for x in range(256):
+        s = SBOX[x]
+        s2 = _xtime(s)
+        s3 = s2 ^ s
+        te0.append((s2 << 24) | (s << 16) | (s << 8) | s3)
+
+        s = INV_SBOX[x]
+        s2 = _xtime(s)
+        s4 = _xtime(s2)
+        s8 = _xtime(s4)
+        s9 = s8 ^ s
+        s11 = s8 ^ s2 ^ s
+        s13 = s8 ^ s4 ^ s
+        s14 = s8 ^ s4 ^ s2
+        td0.append((s14 << 24) | (s9 << 16) | (s13 << 8) | s11)
+
+    te1 = [_ror8(t) for t in te0]
+    te2 = [_ror8(t) for t in te1]
+    te3 = [_ror8(t) for t in te2]
+    td1 = [_ror8(t) for t in td0]
+    td2 = [_ror8(t) for t in td1]
+    td3 = [_ror8(t) for t in td2]
+
+    return (
+        tuple(te0), tuple(te1), tuple(te2), tuple(te3),
+        tuple(td0), tuple(td1), tuple(td2), tuple(td3),
+    )  # fmt: skip
+
+
+TE0, TE1, TE2, TE3, TD0, TD1, TD2, TD3 = _build_tables()
+
+if np is not None:
+    _NP_TE = tuple(np.array(t, dtype=np.uint32) for t in (TE0, TE1, TE2, TE3))
+    _NP_TD = tuple(np.array(t, dtype=np.uint32) for t in (TD0, TD1, TD2, TD3))
+    _NP_SBOX = np.array(SBOX, dtype=np.uint32)
+    _NP_INV_SBOX = np.array(INV_SBOX, dtype=np.uint32)
+
+# Below this many blocks the per-block path is faster than NumPy's per-call overhead
+NUMPY_MIN_BLOCKS = 8
+
+# Blocks per NumPy batch in encrypt_into/decrypt_into, bounds the temporary output
+INTO_CHUNK_BLOCKS = 4096
+
+# Expanded key schedules shared by all FastAES instances, keyed by the cipher key
+SCHEDULE_CACHE = LRUCache(maxsize=1024)
+
+
+class FastAES:
+    """AES with 32-bit round keys and precomputed T-tables.
+
+    Produces the same output as `AES`, which stays the bit-exact reference.
+    Key schedules are looked up in `SCHEDULE_CACHE` before being expanded.
+    """
+
+    __slots__ = ("key", "Nk", "Nb", "Nr", "ek", "dk")
+
+    def __init__(self, key):
+        if len(key) not in [16, 24, 32]:
+            raise ValueError("Key must be either 16, 24, or 32 bytes long.")
+
+        self.key: Final = key
+
+        self.Nk = len(key) // 4
+        self.Nb = 4
+        self.Nr = self.Nk + 6
+
+        # Encryption round keys and equivalent inverse cipher round keys (32-bit words)
+        self.ek, self.dk = SCHEDULE_CACHE.get(bytes(key), self._expand)
+
+    def encrypt(self, plaintext: bytes) -> bytes:
+        """Encrypt a single block of 16 bytes using AES."""
+
+        plaintext = byte_view(plaintext)
+        if len(plaintext) != 16:
+            raise ValueError("Plaintext must be 16 bytes long.")
+
+        return self._encrypt_block(int.from_bytes(plaintext, "big")).to_bytes(16, "big")
+
+    def decrypt(self, ciphertext: bytes) -> bytes:
+        """Decrypt a single block of 16 bytes using AES."""
+
+        ciphertext = byte_view(ciphertext)
+        if len(ciphertext) != 16:
+            raise ValueError("Ciphertext must be 16 bytes long.")
+
+        return self._decrypt_block(int.from_bytes(ciphertext, "big")).to_bytes(16, "big")
+
+    def encrypt_blocks(self, data: bytes) -> bytes:
+        """Encrypt any multiple of 16 bytes, block by block (ECB)."""
+
+        data = byte_view(data)
+        if len(data) % 16 != 0:
+            raise ValueError("Data length must be a multiple of 16 bytes.")
+
+        n = len(data) // 16
+        if np is not None and n >= NUMPY_MIN_BLOCKS:
+            return self._crypt_blocks_np(data, self.ek, _NP_TE, _NP_SBOX, (1, 2, 3))
+
+        return b"".join(
+            self._encrypt_block(int.from_bytes(data[i : i + 16], "big")).to_bytes(16, "big")
+            for i in range(0, len(data), 16)
+        )
+
+    def decrypt_blocks(self, data: bytes) -> bytes:
+        """Decrypt any multiple of 16 bytes, block by block (ECB)."""
+
+        data = byte_view(data)
+        if len(data) % 16 != 0:
+            raise ValueError("Data length must be a multiple of 16 bytes.")
+
+        n = len(data) // 16
+        if np is not None and n >= NUMPY_MIN_BLOCKS:
+            return self._crypt_blocks_np(data, self.dk, _NP_TD, _NP_INV_SBOX, (3, 2, 1))
+
+        return b"".join(
+            self._decrypt_block(int.from_bytes(data[i : i + 16], "big")).to_bytes(16, "big")
+            for i in range(0, len(data), 16)
+        )
+
+    def encrypt_into(self, src, dst):
+        """encrypt_blocks from one buffer into another; src may be dst.
+
+        Blocks are written one by one, or INTO_CHUNK_BLOCKS at a time on the NumPy path.
+        """
+
+        self._crypt_into(src, dst, self._encrypt_block, self.encrypt_blocks)
+
+    def decrypt_into(self, src, dst):
+        """decrypt_blocks from one buffer into another; src may be dst.
+
+        Blocks are written one by one, or INTO_CHUNK_BLOCKS at a time on the NumPy path.
+        """
+
+        self._crypt_into(src, dst, self._decrypt_block, self.decrypt_blocks)
+
+    def _crypt_into(self, src, dst, crypt_block, crypt_blocks):
+        src = byte_view(src)
+        if len(src) % 16 != 0:
+            raise ValueError("Data length must be a multiple of 16 bytes.")
+
+        out = output_view(dst, len(src))
+        if np is not None and len(src) // 16 >= NUMPY_MIN_BLOCKS:
+            step = 16 * INTO_CHUNK_BLOCKS
+            for i in range(0, len(src), step):
+                out[i : i + step] = crypt_blocks(src[i : i + step])
+            return
+
+        for i in range(0, len(src), 16):
+            block = crypt_block(int.from_bytes(src[i : i + 16], "big"))
+            out[i : i + 16] = block.to_bytes(16, "big")
+
+    def _crypt_blocks_np(self, data, rk, tables, sbox, shift):
+        """Run all blocks through each round at once as (N,) uint32 column vectors.
+
+        `shift` gives the column feeding the T1, T2 and T3 lookups: ShiftRows for
+        encryption (1, 2, 3), InvShiftRows for decryption (3, 2, 1).
+        """
+
+        t0, t1, t2, t3 = tables
+        a, b, c = shift
+        rk = np.array(rk, dtype=np.uint32)
+
+        words = np.frombuffer(data, dtype=">u4").astype(np.uint32).reshape(-1, 4)
+        s = [words[:, j] ^ rk[j] for j in range(4)]
+
+        for round in range(1, self.Nr):
+            k = 4 * round
+            s = [
+                t0[s[j] >> 24]
+                ^ t1[(s[(j + a) % 4] >> 16) & 0xFF]
+                ^ t2[(s[(j + b) % 4] >> 8) & 0xFF]
+                ^ t3[s[(j + c) % 4] & 0xFF]
+                ^ rk[k + j]
+                for j in range(4)
+            ]
+
+        k = 4 * self.Nr
+        out = np.empty((len(s[0]), 4), dtype=">u4")
+        for j in range(4):
+            out[:, j] = (
+                (sbox[s[j] >> 24] << 24)
+                | (sbox[(s[(j + a) % 4] >> 16) & 0xFF] << 16)
+                | (sbox[(s[(j + b) % 4] >> 8) & 0xFF] << 8)
+                | sbox[s[(j + c) % 4] & 0xFF]
+            ) ^ rk[k + j]
+
+        return out.tobytes()
+
+    def _encrypt_block(self, block: int) -> int:
+        """Encrypt a 128-bit block given as an integer."""
+
+        rk = self.ek
+        te0, te1, te2, te3 = TE0, TE1, TE2, TE3
+
+        s0 = (block >> 96) ^ rk[0]
+        s1 = (block >> 64 & 0xFFFFFFFF) ^ rk[1]
+        s2 = (block >> 32 & 0xFFFFFFFF) ^ rk[2]
+        s3 = (block & 0xFFFFFFFF) ^ rk[3]
+
+        k = 4
+        for _ in range(self.Nr - 1):  # Round 1 to Nr-1
+            t0 = te0[s0 >> 24] ^ te1[s1 >> 16 & 0xFF] ^ te2[s2 >> 8 & 0xFF] ^ te3[s3 & 0xFF]
+            t1 = te0[s1 >> 24] ^ te1[s2 >> 16 & 0xFF] ^ te2[s3 >> 8 & 0xFF] ^ te3[s0 & 0xFF]
+            t2 = te0[s2 >> 24] ^ te1[s3 >> 16 & 0xFF] ^ te2[s0 >> 8 & 0xFF] ^ te3[s1 & 0xFF]
+            t3 = te0[s3 >> 24] ^ te1[s0 >> 16 & 0xFF] ^ te2[s1 >> 8 & 0xFF] ^ te3[s2 & 0xFF]
+            s0 = t0 ^ rk[k]
+            s1 = t1 ^ rk[k + 1]
+            s2 = t2 ^ rk[k + 2]
+            s3 = t3 ^ rk[k + 3]
+            k += 4
+
+        # Final round: SubBytes and ShiftRows only
+        sbox = SBOX
+        t0 = (
+            sbox[s0 >> 24] << 24
+            | sbox[s1 >> 16 & 0xFF] << 16
+            | sbox[s2 >> 8 & 0xFF] << 8
+            | sbox[s3 & 0xFF]
+        )
+        t1 = (
+            sbox[s1 >> 24] << 24
+            | sbox[s2 >> 16 & 0xFF] << 16
+            | sbox[s3 >> 8 & 0xFF] << 8
+            | sbox[s0 & 0xFF]
+        )
+        t2 = (
+            sbox[s2 >> 24] << 24
+            | sbox[s3 >> 16 & 0xFF] << 16
+            | sbox[s0 >> 8 & 0xFF] << 8
+            | sbox[s1 & 0xFF]
+        )
+        t3 = (
+            sbox[s3 >> 24] << 24
+            | sbox[s0 >> 16 & 0xFF] << 16
+            | sbox[s1 >> 8 & 0xFF] << 8
+            | sbox[s2 & 0xFF]
+        )
+
+        return (
+            (t0 ^ rk[k]) << 96 | (t1 ^ rk[k + 1]) << 64 | (t2 ^ rk[k + 2]) << 32 | (t3 ^ rk[k + 3])
+        )
+
+    def _decrypt_block(self, block: int) -> int:
+        """Decrypt a 128-bit block given as an integer (equivalent inverse cipher)."""
+
+        rk = self.dk
+        td0, td1, td2, td3 = TD0, TD1, TD2, TD3
+
+        s0 = (block >> 96) ^ rk[0]
+        s1 = (block >> 64 & 0xFFFFFFFF) ^ rk[1]
+        s2 = (block >> 32 & 0xFFFFFFFF) ^ rk[2]
+        s3 = (block & 0xFFFFFFFF) ^ rk[3]
+
+        k = 4
+        for _ in range(self.Nr - 1):  # Round (Nr - 1) to 1
+            t0 = td0[s0 >> 24] ^ td1[s3 >> 16 & 0xFF] ^ td2[s2 >> 8 & 0xFF] ^ td3[s1 & 0xFF]
+            t1 = td0[s1 >> 24] ^ td1[s0 >> 16 & 0xFF] ^ td2[s3 >> 8 & 0xFF] ^ td3[s2 & 0xFF]
+            t2 = td0[s2 >> 24] ^ td1[s1 >> 16 & 0xFF] ^ td2[s0 >> 8 & 0xFF] ^ td3[s3 & 0xFF]
+            t3 = td0[s3 >> 24] ^ td1[s2 >> 16 & 0xFF] ^ td2[s1 >> 8 & 0xFF] ^ td3[s0 & 0xFF]
+            s0 = t0 ^ rk[k]
+            s1 = t1 ^ rk[k + 1]
+            s2 = t2 ^ rk[k + 2]
+            s3 = t3 ^ rk[k + 3]
+            k += 4
+
+        # Final round: InvShiftRows and InvSubBytes only
+        isbox = INV_SBOX
+        t0 = (
+            isbox[s0 >> 24] << 24
+            | isbox[s3 >> 16 & 0xFF] << 16
+            | isbox[s2 >> 8 & 0xFF] << 8
+            | isbox[s1 & 0xFF]
+        )
+        t1 = (
+            isbox[s1 >> 24] << 24
+            | isbox[s0 >> 16 & 0xFF] << 16
+            | isbox[s3 >> 8 & 0xFF] << 8
+            | isbox[s2 & 0xFF]
+        )
+        t2 = (
+            isbox[s2 >> 24] << 24
+            | isbox[s1 >> 16 & 0xFF] << 16
+            | isbox[s0 >> 8 & 0xFF] << 8
+            | isbox[s3 & 0xFF]
+        )
+        t3 = (
+            isbox[s3 >> 24] << 24
+            | isbox[s2 >> 16 & 0xFF] << 16
+            | isbox[s1 >> 8 & 0xFF] << 8
+            | isbox[s0 & 0xFF]
+        )
+
+        return (
+            (t0 ^ rk[k]) << 96 | (t1 ^ rk[k + 1]) << 64 | (t2 ^ rk[k + 2]) << 32 | (t3 ^ rk[k + 3])
+        )
+
+    def _sub_word(self, word: int) -> int:
+        return (
+            SBOX[word >> 24] << 24
+            | SBOX[word >> 16 & 0xFF] << 16
+            | SBOX[word >> 8 & 0xFF] << 8
+            | SBOX[word & 0xFF]
+        )
+
+    def _rot_word(self, word: int) -> int:
+        return ((word << 8) | (word >> 24)) & 0xFFFFFFFF
+
+    def _expand(self):
+        ek = self._key_expansion()
+        return ek, self._inv_key_expansion(ek)
+
+    def _key_expansion(self):
+        w = [int.from_bytes(self.key[4 * i : 4 * i + 4], "big") for i in range(self.Nk)]
+
+        rcon = 0x01
+        for i in range(self.Nk, self.Nb * (self.Nr + 1)):
+            temp = w[i - 1]
+            if i % self.Nk == 0:
+                temp = self._sub_word(self._rot_word(temp)) ^ (rcon << 24)
+                rcon = _xtime(rcon)
+            elif self.Nk > 6 and i % self.Nk == 4:
+                temp = self._sub_word(temp)
+
+            w.append(w[i - self.Nk] ^ temp)
+
+        return tuple(w)
+
+    def _inv_key_expansion(self, ek):
+        """Round keys for the equivalent inverse cipher, in decryption order."""
+
+        dk = []
+        for round in range(self.Nr, -1, -1):
+            for c in range(self.Nb):
+                word = ek[round * self.Nb + c]
+                if 0 < round < self.Nr:
+                    # InvMixColumns(word): Td tables apply InvSubBytes, so undo it with SBOX
+                    word = (
+                        TD0[SBOX[word >> 24]]
+                        ^ TD1[SBOX[word >> 16 & 0xFF]]
+                        ^ TD2[SBOX[word >> 8 & 0xFF]]
+                        ^ TD3[SBOX[word & 0xFF]]
+                    )
+                dk.append(word)
+
+        return tuple(dk)
@@ -3,99 +3,448 @@ AES-GCM (Galois/Counter Mode) implementation
 Reference: NIST SP 800-38D, https://nvlpubs.nist.gov/nistpubs/legacy/sp/nistspecialpublication800-38d.pdf
 """
 
-from math import ceil
+import hmac
 from typing import Final
 
-from aes import AES
+import instrument
+from aes import byte_view, output_view
+from aes_ctr import counter_blocks, ctr_xor
+from aes_fast import FastAES
+from gf128 import AggregatedGHASH, GF128Table
+from key_cache import LRUCache
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - NumPy is optional
+    np = None
+
+# Hash subkeys H = AES_K(0^128) and their multiplication tables, keyed by (cipher, key, bits)
+H_CACHE = LRUCache(maxsize=1024)
+
+# Blocks of keystream generated per batch in _gctr, bounds the temporary buffers
+GCTR_CHUNK_BLOCKS = 4096
+
+# Tag lengths allowed by SP 800-38D, in bytes
+TAG_LENGTHS = (16, 15, 14, 13, 12, 8, 4)
+
+# Smallest batch for which encrypt_many/decrypt_many run GHASH across messages in NumPy
+GHASH_MANY_MIN = 8
 
 
 class AESGCM:
-    def __init__(self, key: bytes):
-        self.ciph = AES(key)
+    __slots__ = ("ciph", "H", "t", "_htable", "_aggregated")
+
+    def __init__(
+        self,
+        key: bytes,
+        cipher=FastAES,
+        table_bits: int = 8,
+        aggregate: int = 0,
+        tag_length: int = 16,
+    ):
+        if tag_length not in TAG_LENGTHS:
+            raise ValueError(f"Tag length must be one of {TAG_LENGTHS} bytes.")
+
+        stats = instrument.current
+        if stats is not None:
+            mark = stats.begin("init")
+
+        self.ciph = cipher(key)  # Block cipher, `AES` selects the byte-oriented reference
+
+        h, self._htable = H_CACHE.get(
+            (cipher, bytes(key), table_bits), lambda: self._hash_subkey(table_bits)
+        )
+        self.H: Final = h  # H = AES_K(0^128)
+        self.t = tag_length  # authentication tag length in bytes
 
-        self.H: Final = self.ciph.encrypt(bytes(16))  # H = AES_K(0^128)
-        self.t = 16  # authentication tag length in bytes
+        # GHASH over `aggregate` blocks per reduction with H powers, 0 for the serial path
+        self._aggregated = (
+            AggregatedGHASH(int.from_bytes(h, "big"), aggregate) if aggregate > 0 else None
+        )
+
+        if stats is not None:
+            stats.stage("setup", mark)
+            stats.end(0, 0)
 
     def encrypt(self, plaintext: bytes, iv: bytes, aad: bytes):
-        if len(iv) == 12:
-            j0 = iv + bytes([0, 0, 0, 1])
-        else:
-            raise NotImplementedError("IV length other than 96 bits is not implemented.")
-
-        C = self._gctr(self._inc32(j0), plaintext)
-        u = 16 * ceil(len(C) / 16) - len(C)
-        v = 16 * ceil(len(aad) / 16) - len(aad)
-
-        # S = A || 0^u || C || 0^v || len(A)_64 || len(C)_64
-        S = self._ghash(
-            aad
-            + bytes(v)
-            + C
-            + bytes(u)
-            + (len(aad) * 8).to_bytes(8, "big")
-            + (len(C) * 8).to_bytes(8, "big")
-        )
-        T = self._gctr(j0, S)[: self.t]
+        C = bytearray(len(byte_view(plaintext)))
+        T = self.encrypt_into(plaintext, C, iv, aad)
+        if instrument.current is not None:
+            instrument.current.allocations += 2  # output, bytes copy
 
-        return C, T
+        return bytes(C), T
 
     def decrypt(self, ciphertext: bytes, iv: bytes, aad: bytes, tag: bytes):
+        """Check the tag, then decrypt: a forged message costs GHASH only, no plaintext."""
+
+        P = bytearray(len(byte_view(ciphertext)))
+        self.decrypt_into(ciphertext, P, iv, aad, tag)
+        if instrument.current is not None:
+            instrument.current.allocations += 2  # output, bytes copy
+
+        return bytes(P)
+
+    def encrypt_into(self, src, dst, iv: bytes, aad: bytes) -> bytes:
+        """Encrypt src into the writable buffer dst, which may be src, and return the tag.
+
+        src, dst and aad may be any buffer-protocol objects; nothing is copied.
+        """
+
+        src = byte_view(src)
+        dst = output_view(dst, len(src))
+        aad = byte_view(aad)
+
+        stats = instrument.current
+        if stats is not None:
+            mark = stats.begin("encrypt")
+
+        j0 = self._j0(iv)
+        if stats is not None:
+            mark = stats.stage("j0", mark)
+
+        self._gctr(self._inc32(j0), src, dst)
+        if stats is not None:
+            mark = stats.stage("gctr", mark)
+
+        S = self._ghash_s(aad, dst)
+        if stats is not None:
+            mark = stats.stage("ghash", mark)
+
+        T = self._gctr(j0, S)[: self.t]
+        if stats is not None:
+            stats.stage("tag", mark)
+            stats.end(len(aad), len(dst))
+
+        return T
+
+    def decrypt_into(self, src, dst, iv: bytes, aad: bytes, tag: bytes):
+        """Check the tag, then decrypt src into dst, which may be src.
+
+        dst is left untouched when the tag does not match.
+        """
+
         if len(tag) != self.t:
             raise ValueError("Indication of inauthenticity failed: invalid tag length.")
 
-        if len(iv) == 12:
-            j0 = iv + bytes([0, 0, 0, 1])
-        else:
-            raise NotImplementedError("IV length other than 96 bits is not implemented.")
-
-        P = self._gctr(self._inc32(j0), ciphertext)
-        u = 16 * ceil(len(ciphertext) / 16) - len(ciphertext)
-        v = 16 * ceil(len(aad) / 16) - len(aad)
-
-        # S = A || 0^u || C || 0^v || len(A)_64 || len(C)_64
-        S = self._ghash(
-            aad
-            + bytes(v)
-            + ciphertext
-            + bytes(u)
-            + (len(aad) * 8).to_bytes(8, "big")
-            + (len(ciphertext) * 8).to_bytes(8, "big")
-        )
+        src = byte_view(src)
+        dst = output_view(dst, len(src))
+        aad = byte_view(aad)
+
+        stats = instrument.current
+        if stats is not None:
+            mark = stats.begin("decrypt")
+
+        j0 = self._j0(iv)
+        if stats is not None:
+            mark = stats.stage("j0", mark)
+
+        S = self._ghash_s(aad, src)
+        if stats is not None:
+            mark = stats.stage("ghash", mark)
+
         T = self._gctr(j0, S)[: self.t]
+        if stats is not None:
+            mark = stats.stage("tag", mark)
 
-        if T == tag:
-            return P
-        else:
+        if not hmac.compare_digest(T, tag):
+            if stats is not None:
+                stats.end(len(aad), len(src))
             raise ValueError("Indication of inauthenticity failed: tag does not match.")
 
+        self._gctr(self._inc32(j0), src, dst)
+        if stats is not None:
+            stats.stage("gctr", mark)
+            stats.end(len(aad), len(src))
+
+    def verify(self, ciphertext: bytes, iv: bytes, aad: bytes, tag: bytes) -> bool:
+        """Return whether tag authenticates (iv, aad, ciphertext), without decrypting."""
+
+        if len(tag) != self.t:
+            return False
+
+        aad, ciphertext = byte_view(aad), byte_view(ciphertext)
+        stats = instrument.current
+        if stats is not None:
+            stats.begin("verify")
+
+        S = self._ghash_s(aad, ciphertext)
+        valid = hmac.compare_digest(self._gctr(self._j0(iv), S)[: self.t], tag)
+        if stats is not None:
+            stats.end(len(aad), len(ciphertext))
+
+        return valid
+
+    def encrypt_many(self, messages):
+        """Encrypt a sequence of (iv, plaintext, aad), returning [(C, T), ...] in order.
+
+        The keystream of all messages, J0 blocks included, comes from one batched call
+        to the block cipher.
+        """
+
+        messages = list(messages)
+        stats = instrument.current
+        if stats is not None:
+            stats.begin("encrypt_many")
+
+        j0s = [self._j0(iv) for iv, _, _ in messages]
+        blocks = self._gctr_many(j0s, [plaintext for _, plaintext, _ in messages])
+        hashes = self._ghash_s_many([aad for _, _, aad in messages], [C for _, C in blocks])
+        results = []
+
+        for (e_j0, C), s in zip(blocks, hashes):
+            results.append((C, self._xor_bytes(s, e_j0)[: self.t]))
+
+        if stats is not None:
+            stats.end(*_batch_lengths(messages))
+
+        return results
+
+    def decrypt_many(self, messages):
+        """Decrypt a sequence of (iv, ciphertext, aad, tag), returning plaintexts in order.
+
+        All tags are checked first, and only authentic messages are decrypted; the
+        others, including those with an invalid IV, give None in their place.
+        """
+
+        messages = list(messages)
+        stats = instrument.current
+        if stats is not None:
+            stats.begin("decrypt_many")
+
+        valid, j0s = [], []
+        for i, (iv, _, _, _) in enumerate(messages):
+            try:
+                j0s.append(self._j0(iv))
+            except ValueError:
+                continue  # a bad IV only fails its own message
+            valid.append(i)
+
+        e_j0s = self._encrypt_blocks(b"".join(j0s))
+        hashes = self._ghash_s_many(
+            [messages[i][2] for i in valid], [messages[i][1] for i in valid]
+        )
+
+        authentic, nonces = [], []
+        for k, (i, s) in enumerate(zip(valid, hashes)):
+            tag = messages[i][3]
+            T = self._xor_bytes(s, e_j0s[16 * k : 16 * k + 16])[: self.t]
+            if len(tag) == self.t and hmac.compare_digest(T, tag):
+                authentic.append(i)
+                nonces.append(j0s[k])
+
+        blocks = self._gctr_many(nonces, [messages[i][1] for i in authentic])
+
+        results = [None] * len(messages)
+        for i, (_, P) in zip(authentic, blocks):
+            results[i] = P
+
+        if stats is not None:
+            stats.end(*_batch_lengths(messages))
+
+        return results
+
+    def encryptor(self, iv: bytes) -> "AESGCMEncryptor":
+        """Start an incremental encryption under iv."""
+
+        return AESGCMEncryptor(self, iv)
+
+    def decryptor(self, iv: bytes) -> "AESGCMDecryptor":
+        """Start an incremental decryption under iv."""
+
+        return AESGCMDecryptor(self, iv)
+
+    def mac(self, iv: bytes, aad: bytes) -> bytes:
+        """GMAC: the tag of encrypt(b"", iv, aad), from GHASH over aad and E_K(J0) only."""
+
+        aad = byte_view(aad)
+        stats = instrument.current
+        if stats is not None:
+            stats.begin("mac")
+
+        T = self._mac(iv, aad)
+        if stats is not None:
+            stats.end(len(aad), 0)
+
+        return T
+
+    def verify_mac(self, iv: bytes, aad: bytes, tag: bytes) -> bool:
+        """Return whether tag is the GMAC of aad under iv."""
+
+        if len(tag) != self.t:
+            return False
+
+        aad = byte_view(aad)
+        stats = instrument.current
+        if stats is not None:
+            stats.begin("verify_mac")
+
+        valid = hmac.compare_digest(self._mac(iv, aad), tag)
+        if stats is not None:
+            stats.end(len(aad), 0)
+
+        return valid
+
+    def gmac(self, iv: bytes) -> "GMAC":
+        """Start an incremental GMAC under iv."""
+
+        return GMAC(self, iv)
+
+    def _mac(self, iv: bytes, aad) -> bytes:
+        y = self._ghash_lengths(self._ghash_update(0, aad), len(aad), 0)
+
+        return self._xor_bytes(y.to_bytes(16, "big"), self._encrypt_blocks(self._j0(iv)))[: self.t]
+
+    def _j0(self, iv: bytes) -> bytes:
+        """Pre-counter block J0 = IV || 0^31 || 1 for a 96-bit IV."""
+
+        if len(iv) == 12:
+            return bytes(iv) + bytes([0, 0, 0, 1])
+        if not iv:
+            raise ValueError("IV must not be empty.")
+
+        # Other lengths: J0 = GHASH(IV || 0^(s + 64) || [len(IV)]_64)
+        return self._ghash_lengths(self._ghash_update(0, iv), 0, len(iv)).to_bytes(16, "big")
+
     def _ghash(self, x):
+        return self._ghash_update(0, x).to_bytes(16, "big")  # y_0 = 0^128
+
+    def _ghash_update(self, y: int, x) -> int:
+        """Absorb x into the running GHASH value y, zero-padding a trailing partial block."""
+
+        if len(x) % 16 != 0:
+            full = len(x) - len(x) % 16
+            y = self._ghash_update(y, x[:full])
+            return self._ghash_update(y, bytes(x[full:]) + bytes(16 - len(x) % 16))
+
+        if instrument.current is not None:
+            instrument.current.gf_multiplies += len(x) // 16
+
+        if self._aggregated is not None:
+            return self._aggregated.ghash(x, y)
+
+        mul = self._htable.mul
+        for i in range(0, len(x), 16):
+            y = mul(y ^ int.from_bytes(x[i : i + 16], "big"))
+
+        return y
+
+    def _ghash_s(self, aad, c) -> bytes:
+        """GHASH of S = A || 0^v || C || 0^u || [len(A)]_64 || [len(C)]_64, without building S."""
+
+        y = self._ghash_update(0, aad)
+        y = self._ghash_update(y, c)
+
+        return self._ghash_lengths(y, len(aad), len(c)).to_bytes(16, "big")
+
+    def _ghash_s_many(self, aads, cs):
+        """`_ghash_s` of many messages, advancing all of them one block at a time in NumPy.
+
+        Each S is left-padded with zero blocks to the longest one, which leaves GHASH
+        unchanged, so messages sorted longest first only join once their blocks start.
+        """
+
+        if np is None or len(cs) < GHASH_MANY_MIN:
+            return [self._ghash_s(aad, c) for aad, c in zip(aads, cs)]
+
+        def s_blocks(aad, c):
+            lengths = ((len(aad) * 8) << 64 | (len(c) * 8)).to_bytes(16, "big")
+            return b"".join((aad, bytes(-len(aad) % 16), c, bytes(-len(c) % 16), lengths))
+
+        streams = [s_blocks(aad, c) for aad, c in zip(aads, cs)]
+        order = sorted(range(len(streams)), key=lambda i: -len(streams[i]))
+        lengths = [len(streams[i]) // 16 for i in order]
+        m = lengths[0]
+
+        x = np.frombuffer(
+            b"".join(bytes(16 * (m - n)) + streams[i] for i, n in zip(order, lengths)), dtype=">u8"
+        ).reshape(len(streams), 2 * m)
+        y_hi = np.zeros(len(streams), dtype=np.uint64)
+        y_lo = np.zeros(len(streams), dtype=np.uint64)
+
+        active = 0
+        for j in range(m):
+            while active < len(lengths) and lengths[active] >= m - j:
+                active += 1
+            if instrument.current is not None:
+                instrument.current.gf_multiplies += active
+            y_hi[:active], y_lo[:active] = self._htable.mul_many(
+                y_hi[:active] ^ x[:active, 2 * j], y_lo[:active] ^ x[:active, 2 * j + 1]
+            )
+
+        results = [None] * len(streams)
+        for k, i in enumerate(order):
+            results[i] = (int(y_hi[k]) << 64 | int(y_lo[k])).to_bytes(16, "big")
+
+        return results
+
+    def _ghash_lengths(self, y: int, aad_len: int, c_len: int) -> int:
+        """Absorb the final [len(A)]_64 || [len(C)]_64 block into the running value y."""
+
+        return self._ghash_update(y, ((aad_len * 8) << 64 | (c_len * 8)).to_bytes(16, "big"))
+
+    def _ghash_ref(self, x):
+        """Bit-serial GHASH, kept as the reference for the table-driven `_ghash`"""
+
         m = len(x) // 16
         y = bytes(16)  # y_0 = 0^128
 
+        if instrument.current is not None:
+            instrument.current.gf_multiplies += m
+
         for i in range(1, m + 1):
             x_i = x[(i - 1) * 16 : i * 16]
             y = self._gf_mul(self._xor_bytes(y, x_i), self.H)
 
         return y
 
-    def _gctr(self, icb, x):
-        y = b""
-        n = ceil(len(x) / 16)  # number of blocks
-        len_x_n = len(x) % 16 if len(x) % 16 != 0 and n > 0 else 16  # length of last block
-        cb = icb
+    def _hash_subkey(self, table_bits):
+        h = self._encrypt_blocks(bytes(16))
+        return h, GF128Table(int.from_bytes(h, "big"), table_bits)
 
-        for i in range(1, n):  # i = 1 to n-1
-            x_i = x[(i - 1) * 16 : i * 16]
-            y_i = self._xor_bytes(x_i, self.ciph.encrypt(cb))
+    def _gctr(self, icb, x, out=None):
+        """GCTR into one preallocated buffer, a keystream chunk at a time.
 
-            y += y_i
+        Returns bytes, or writes into the writable buffer `out` when given.
+        """
 
-            cb = self._inc32(cb)
+        if out is not None:
+            ctr_xor(self.ciph, icb, x, chunk_blocks=GCTR_CHUNK_BLOCKS, out=out)
+            return out
 
-        y_i = self._xor_bytes(x[(n - 1) * 16 :], self.ciph.encrypt(cb)[:len_x_n])
-        y += y_i
+        if instrument.current is not None:
+            instrument.current.allocations += 1  # bytes copy
 
-        return y
+        return bytes(ctr_xor(self.ciph, icb, x, chunk_blocks=GCTR_CHUNK_BLOCKS))
+
+    def _gctr_many(self, j0s, xs):
+        """Return [(E_K(J0), GCTR(inc32(J0), x)), ...] from one batch of counter blocks."""
+
+        counts = [1 + -(-len(x) // 16) for x in xs]  # J0 block, then the data blocks
+        keystream = self._encrypt_blocks(_counter_blocks_many(j0s, counts))
+        if instrument.current is not None:
+            instrument.current.allocations += 4  # counter blocks, keystream, data, output
+
+        # XOR everything at once against the data laid out like the keystream
+        parts = []
+        for x, n in zip(xs, counts):
+            parts += (bytes(16), x, bytes(16 * n - 16 - len(x)))
+        out = self._xor_bytes(keystream, b"".join(parts))
+
+        results = []
+        offset = 0
+        for x, n in zip(xs, counts):
+            results.append((out[offset : offset + 16], out[offset + 16 : offset + 16 + len(x)]))
+            offset += 16 * n
+
+        return results
+
+    def _encrypt_blocks(self, data: bytes) -> bytes:
+        """ciph.encrypt_blocks, counted when instrumentation is enabled."""
+
+        if instrument.current is not None:
+            instrument.current.block_encryptions += len(data) // 16
+
+        return self.ciph.encrypt_blocks(data)
 
     def _inc32(self, x: bytes) -> bytes:
         n = len(x)
@@ -128,4 +477,218 @@ class AESGCM:
         return z.to_bytes(16, "big")
 
     def _xor_bytes(self, a: bytes, b: bytes) -> bytes:
-        return bytes(x ^ y for x, y in zip(a, b))
+        """XOR a with the first len(a) bytes of b, as one wide integer operation."""
+
+        n = len(a)
+        return (int.from_bytes(a, "big") ^ int.from_bytes(b[:n], "big")).to_bytes(n, "big")
+
+
+def _batch_lengths(messages):
+    """Total (AAD, payload) bytes of encrypt_many/decrypt_many messages."""
+
+    return sum(len(m[2]) for m in messages), sum(len(m[1]) for m in messages)
+
+
+def _counter_blocks_many(j0s, counts) -> bytes:
+    """Concatenate counts[i] counter blocks from each j0s[i], incrementing the low 32 bits."""
+
+    if np is None or len(j0s) < 2:
+        return b"".join(counter_blocks(j0, n) for j0, n in zip(j0s, counts))
+
+    m = len(j0s)
+    counts = np.asarray(counts, dtype=np.int64)
+    total = int(counts.sum())
+    j0 = np.frombuffer(b"".join(j0s), dtype=np.uint8).reshape(m, 16)
+
+    msg = np.repeat(np.arange(m), counts)  # message of every block
+    step = np.arange(total, dtype=np.uint64) - np.repeat(
+        (np.cumsum(counts) - counts).astype(np.uint64), counts
+    )
+    low = np.ascontiguousarray(j0[:, 12:]).view(">u4").reshape(m).astype(np.uint64)
+    ctr = ((low[msg] + step) & np.uint64(0xFFFFFFFF)).astype(">u4")
+
+    blocks = np.empty((total, 16), dtype=np.uint8)
+    blocks[:, :12] = j0[msg, :12]
+    blocks[:, 12:] = ctr.view(np.uint8).reshape(total, 4)
+
+    return blocks.tobytes()
+
+
+class _AESGCMStream:
+    """Running GCTR and GHASH state shared by the incremental encryptor and decryptor.
+
+    At most one partial block of GHASH input is buffered between calls.
+    """
+
+    __slots__ = ("_gcm", "_j0", "_y", "_pending", "_aad_len", "_data_len",
+                 "_data_started", "_finalized")  # fmt: skip
+
+    def __init__(self, gcm: AESGCM, iv: bytes):
+        self._gcm = gcm
+        self._j0 = gcm._j0(iv)
+        self._y = 0  # running GHASH value
+        self._pending = b""  # partial block not yet absorbed into GHASH
+        self._aad_len = 0
+        self._data_len = 0
+        self._data_started = False
+        self._finalized = False
+
+    def update_aad(self, data: bytes):
+        """Add associated data, all of which must come before the first update()."""
+
+        if self._finalized:
+            raise ValueError("Context has already been finalized.")
+        if self._data_started:
+            raise ValueError("Associated data must be supplied before any payload.")
+
+        data = byte_view(data)
+        self._aad_len += len(data)
+        self._absorb(data)
+
+    def _absorb(self, data):
+        """Feed data to GHASH, keeping any trailing partial block in _pending."""
+
+        data = byte_view(data)
+        if self._pending:
+            head = 16 - len(self._pending)
+            self._pending += bytes(data[:head])
+            data = data[head:]
+            if len(self._pending) < 16:
+                return
+            self._y = self._gcm._ghash_update(self._y, self._pending)
+            self._pending = b""
+
+        full = len(data) - len(data) % 16
+        if full:
+            self._y = self._gcm._ghash_update(self._y, data[:full])
+        self._pending = bytes(data[full:])
+
+    def _flush(self):
+        """Zero-pad and absorb the pending partial block."""
+
+        if self._pending:
+            self._y = self._gcm._ghash_update(self._y, self._pending)
+            self._pending = b""
+
+    def _crypt(self, data) -> bytes:
+        """XOR data with the next len(data) bytes of keystream."""
+
+        if self._finalized:
+            raise ValueError("Context has already been finalized.")
+        if not self._data_started:
+            self._flush()  # end of AAD
+            self._data_started = True
+
+        data = byte_view(data)
+        gcm = self._gcm
+        out = ctr_xor(gcm.ciph, gcm._inc32(self._j0), data, self._data_len, 32, GCTR_CHUNK_BLOCKS)
+        self._data_len += len(data)
+        if instrument.current is not None:
+            instrument.current.allocations += 1  # bytes copy
+
+        return bytes(out)
+
+    def _tag(self) -> bytes:
+        """Finish the message; instrumentation counts the whole stream as one call here."""
+
+        if self._finalized:
+            raise ValueError("Context has already been finalized.")
+        self._finalized = True
+
+        stats = instrument.current
+        if stats is not None:
+            stats.begin(self._op)
+
+        gcm = self._gcm
+        self._flush()
+        y = gcm._ghash_lengths(self._y, self._aad_len, self._data_len)
+        T = gcm._gctr(self._j0, y.to_bytes(16, "big"))[: gcm.t]
+
+        if stats is not None:
+            stats.end(self._aad_len, self._data_len)
+
+        return T
+
+    def _verify(self, tag: bytes):
+        if len(tag) != self._gcm.t:
+            raise ValueError("Indication of inauthenticity failed: invalid tag length.")
+
+        if not hmac.compare_digest(self._tag(), tag):
+            raise ValueError("Indication of inauthenticity failed: tag does not match.")
+
+
+class AESGCMEncryptor(_AESGCMStream):
+    """Incremental AES-GCM encryption, see `AESGCM.encryptor`."""
+
+    __slots__ = ()
+    _op = "encryptor"
+
+    def update(self, plaintext: bytes) -> bytes:
+        """Encrypt the next piece of plaintext and return the matching ciphertext."""
+
+        ciphertext = self._crypt(plaintext)
+        self._absorb(ciphertext)
+        return ciphertext
+
+    def finalize(self) -> bytes:
+        """Finish the message and return the authentication tag."""
+
+        return self._tag()
+
+
+class AESGCMDecryptor(_AESGCMStream):
+    """Incremental AES-GCM decryption, see `AESGCM.decryptor`.
+
+    Plaintext is released before the tag is checked; it must not be trusted until
+    finalize_and_verify() returns.
+    """
+
+    __slots__ = ()
+    _op = "decryptor"
+
+    def update(self, ciphertext: bytes) -> bytes:
+        """Decrypt the next piece of ciphertext and return the matching plaintext."""
+
+        plaintext = self._crypt(ciphertext)
+        self._absorb(ciphertext)
+        return plaintext
+
+    def finalize(self) -> bytes:
+        """Finish the message and return the computed authentication tag."""
+
+        return self._tag()
+
+    def finalize_and_verify(self, tag: bytes):
+        """Finish the message and raise ValueError if tag does not match."""
+
+        self._verify(tag)
+
+
+class GMAC(_AESGCMStream):
+    """Incremental AES-GMAC, see `AESGCM.gmac`: GCM over associated data only."""
+
+    __slots__ = ()
+    _op = "gmac"
+
+    def update(self, data: bytes):
+        """Authenticate the next piece of data."""
+
+        self.update_aad(data)
+
+    def finalize(self) -> bytes:
+        """Finish and return the tag."""
+
+        return self._tag()
+
+    def finalize_and_verify(self, tag: bytes):
+        """Finish and raise ValueError if tag does not match."""
+
+        self._verify(tag)
+
+
+if __name__ == "__main__":
+    import sys
+
+    from file_crypt import main
+
+    sys.exit(main(sys.argv[1:], "gcm"))
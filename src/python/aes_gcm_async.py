@@ -0,0 +1,192 @@
+"""
+asyncio streaming AES-GCM with the cipher work offloaded to an executor
+
+    tag = await encrypt_stream(gcm, iv, reader, writer, aad)
+    await decrypt_stream(gcm, iv, reader, writer, tag, aad)
+
+`reader` is an asyncio.StreamReader or any async iterable of bytes, `writer` an
+asyncio.StreamWriter or anything with write() and an awaitable drain(). The input is
+cut into chunk_size pieces, and each piece is encrypted at its counter offset, together
+with the GHASH of its ciphertext, by a function running in `executor`. At most
+max_in_flight pieces are queued at once and results are written in order, so memory
+stays bounded however long the stream is. Partial GHASH values are folded with powers
+of H as in `parallel`.
+
+With a ProcessPoolExecutor pieces run in parallel; the default thread pool runs one at
+a time under the GIL but keeps the event loop free between pieces, so smaller pieces
+give other coroutines lower latency.
+
+decrypt_stream writes plaintext before the tag is checked at the end of the stream,
+like `AESGCMDecryptor`: discard the output if it raises.
+"""
+
+import asyncio
+import hmac
+from collections import deque
+from typing import Optional
+
+from aes_ctr import ctr_xor
+from aes_gcm import AESGCM
+from gf128 import gf_mul, gf_pow
+
+# Bytes per executor call, rounded down to whole blocks
+DEFAULT_CHUNK_SIZE = 1 << 16
+
+# Pieces submitted to the executor and not yet written
+DEFAULT_IN_FLIGHT = 4
+
+
+def _crypt_chunk(cipher, key: bytes, icb: bytes, offset: int, data: bytes, ghash_input: bool):
+    """CTR one piece starting `offset` bytes into the message; return (output, GHASH)."""
+
+    out = bytes(ctr_xor(cipher(key), icb, data, offset, 32))
+    gcm = AESGCM(key, cipher)  # H is cached per process after the first piece
+
+    return out, gcm._ghash_update(0, data if ghash_input else out)
+
+
+def _ghash_aad(cipher, key: bytes, aad: bytes) -> int:
+    """GHASH of the associated data, which starts the running value."""
+
+    return AESGCM(key, cipher)._ghash_update(0, aad)
+
+
+async def _read(reader, size: int):
+    if hasattr(reader, "read"):
+        while data := await reader.read(size):
+            yield data
+    else:
+        async for data in reader:
+            yield data
+
+
+async def _pieces(reader, size: int, hold: int, tail: list):
+    """Yield the input in pieces of `size` bytes, the last one shorter.
+
+    The final `hold` bytes are not yielded but appended to `tail`.
+    """
+
+    buf = bytearray()
+    async for data in _read(reader, size):
+        buf += data
+        while len(buf) >= size + hold:
+            yield bytes(buf[:size])
+            del buf[:size]
+
+    body = len(buf) - hold
+    if body < 0:
+        raise ValueError("Stream is shorter than the tag.")
+    if body > 0:
+        yield bytes(buf[:body])
+    tail.append(bytes(buf[body:]))
+
+
+async def _run(gcm: AESGCM, iv, reader, writer, aad, decrypt, hold, options):
+    """Stream reader through GCTR into writer, return (tag, trailing `hold` bytes)."""
+
+    executor, chunk_size, max_in_flight = options
+    chunk_size = max(16, chunk_size - chunk_size % 16)
+    loop = asyncio.get_running_loop()
+
+    j0 = gcm._j0(iv)
+    icb = gcm._inc32(j0)
+    cipher, key = type(gcm.ciph), gcm.ciph.key
+
+    h = int.from_bytes(gcm.H, "big")
+    powers = {}
+    aad_future = loop.run_in_executor(executor, _ghash_aad, cipher, key, bytes(aad))
+    y = None  # the AAD GHASH, awaited when the first piece is folded in
+
+    pending = deque()
+    tail = []
+    offset = 0
+
+    async def write_next():
+        nonlocal y
+
+        n, future = pending.popleft()
+        out, partial = await future
+        if y is None:
+            y = await aad_future
+        if n not in powers:
+            powers[n] = gf_pow(h, n)
+        y = gf_mul(y, powers[n]) ^ partial  # Y <- Y * H^n xor G_piece
+
+        writer.write(out)
+        await writer.drain()
+
+    try:
+        async for piece in _pieces(reader, chunk_size, hold, tail):
+            args = (cipher, key, icb, offset, piece, decrypt)
+            future = loop.run_in_executor(executor, _crypt_chunk, *args)
+            pending.append((-(-len(piece) // 16), future))
+            offset += len(piece)
+
+            if len(pending) >= max_in_flight:
+                await write_next()
+
+        while pending:
+            await write_next()
+        if y is None:
+            y = await aad_future
+    finally:
+        aad_future.cancel()
+        for _, future in pending:
+            future.cancel()
+
+    y = gcm._ghash_lengths(y, len(aad), offset)
+    return gcm._gctr(j0, y.to_bytes(16, "big"))[: gcm.t], tail[0]
+
+
+async def encrypt_stream(
+    gcm: AESGCM,
+    iv: bytes,
+    reader,
+    writer,
+    aad: bytes = b"",
+    append_tag: bool = False,
+    executor=None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    max_in_flight: int = DEFAULT_IN_FLIGHT,
+) -> bytes:
+    """Encrypt everything from reader into writer and return the tag.
+
+    With append_tag the tag is also written after the ciphertext.
+    """
+
+    options = (executor, chunk_size, max_in_flight)
+    tag, _ = await _run(gcm, iv, reader, writer, aad, False, 0, options)
+
+    if append_tag:
+        writer.write(tag)
+        await writer.drain()
+
+    return tag
+
+
+async def decrypt_stream(
+    gcm: AESGCM,
+    iv: bytes,
+    reader,
+    writer,
+    tag: Optional[bytes] = None,
+    aad: bytes = b"",
+    executor=None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    max_in_flight: int = DEFAULT_IN_FLIGHT,
+):
+    """Decrypt everything from reader into writer, then raise ValueError if tag does not match.
+
+    Without tag, the last `gcm.t` bytes of the stream are the tag, as written by
+    encrypt_stream(append_tag=True).
+    """
+
+    if tag is not None and len(tag) != gcm.t:
+        raise ValueError("Indication of inauthenticity failed: invalid tag length.")
+
+    options = (executor, chunk_size, max_in_flight)
+    hold = gcm.t if tag is None else 0
+    expected, trailer = await _run(gcm, iv, reader, writer, aad, True, hold, options)
+
+    if not hmac.compare_digest(expected, trailer if tag is None else tag):
+        raise ValueError("Indication of inauthenticity failed: tag does not match.")
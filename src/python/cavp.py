@@ -0,0 +1,382 @@
+"""
+NIST CAVP response files and differential fuzzing against the reference implementation
+
+Usage:
+
+    python src/python/cavp.py run FILE.rsp ... [--engine fast] [--workers W]
+    python src/python/cavp.py fuzz [--engine bitsliced] [--cases N] [--seed S] [--workers W]
+
+`run` checks every case of AES ECB, CTR and GCM response files, for any key size,
+IV, AAD and tag length. The mode comes from the file name, as in ECBVarKey128.rsp,
+ECBMCT256.rsp (Monte Carlo: 1000 chained blocks per case), gcmEncryptExtIV192.rsp or
+gcmDecrypt128.rsp; CTR files have the ECB layout plus an IV holding the initial
+counter block, incremented over all 128 bits as in SP 800-38A, Appendix F.5.
+
+`fuzz` compares an engine against the byte-oriented `AES` and a bit-serial GCM written
+from SP 800-38D, on random ECB, CTR and GCM cases. Case i depends only on the seed
+and i, and the first mismatching case is reported with its inputs.
+
+Files are read a line at a time and cases are checked in a process pool, a chunk per
+task with at most 2 * workers chunks in flight, so memory stays bounded however many
+cases a file holds.
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from pathlib import Path
+from typing import Optional
+
+from aes import AES
+from aes_bitslice import BitslicedAES
+from aes_ctr import AESCTR, advance
+from aes_fast import FastAES
+from aes_gcm import TAG_LENGTHS, AESGCM
+
+ENGINES = {"reference": AES, "fast": FastAES, "bitsliced": BitslicedAES}
+
+MODES = ("ecb", "ctr", "gcm")
+
+# Cases per task
+CHUNK_CASES = 256
+
+# Inner iterations of a Monte Carlo case
+MCT_ITERATIONS = 1000
+
+# Field names of the GCM files, as used by the ECB ones
+_ALIASES = {"PT": "PLAINTEXT", "CT": "CIPHERTEXT"}
+
+
+def file_mode(path) -> str:
+    """AES mode of a response file, from its name."""
+
+    name = Path(path).name.lower()
+    for mode in ("gcm", "ctr", "ecb"):
+        if name.startswith(mode):
+            return mode
+
+    raise ValueError(f"Unsupported response file: {path}")
+
+
+def read_rsp(lines, source: str = ""):
+    """Yield (location, section, fields) for each case of a response file.
+
+    `section` holds the bracketed headers in force, {"ENCRYPT": ""} or {"KEYLEN": "128", ...};
+    `fields` maps upper-case names to bytes, with FAIL mapped to None.
+    """
+
+    section, fields, start = {}, {}, 0
+    in_header = False
+
+    for number, line in enumerate(lines, 1):
+        line = line.strip()
+        if line.startswith("["):
+            if not in_header:
+                section = {}
+                in_header = True
+            name, _, value = line[1:-1].partition("=")
+            section[name.strip().upper()] = value.strip()
+            continue
+        if line.startswith("#"):
+            continue
+
+        if not line:
+            if fields:
+                yield f"{source}:{start}", section, fields
+                fields, start = {}, 0
+            continue
+
+        in_header = False
+        start = start or number
+        name, _, value = line.partition("=")
+        name = name.strip().upper()
+        if name == "FAIL":
+            fields[name] = None
+        elif name != "COUNT":
+            fields[_ALIASES.get(name, name)] = bytes.fromhex(value.strip())
+
+    if fields:
+        yield f"{source}:{start}", section, fields
+
+
+def check_case(engine, mode: str, section: dict, fields: dict, mct: bool = False):
+    """Check one case against a block cipher class, return a mismatch message or None."""
+
+    key = fields["KEY"]
+    p, c = fields.get("PLAINTEXT"), fields.get("CIPHERTEXT")
+
+    if mode == "ecb":
+        ciph = engine(key)
+        if mct:
+            x = c if "DECRYPT" in section else p
+            step = ciph.decrypt if "DECRYPT" in section else ciph.encrypt
+            for _ in range(MCT_ITERATIONS):
+                x = step(x)
+            expected = p if "DECRYPT" in section else c
+            return None if x == expected else f"Monte Carlo result {x.hex()}"
+
+        if ciph.encrypt_blocks(p) != c:
+            return "ciphertext differs"
+        if ciph.decrypt_blocks(c) != p:
+            return "plaintext differs"
+        return None
+
+    if mode == "ctr":
+        if AESCTR(key, fields["IV"], 128, engine).encrypt(p) != c:
+            return "ciphertext differs"
+        return None
+
+    tag = fields["TAG"]
+    gcm = AESGCM(key, engine, tag_length=len(tag))
+    iv, aad = fields["IV"], fields.get("AAD", b"")
+
+    try:
+        plaintext = gcm.decrypt(c, iv, aad, tag)
+    except ValueError:
+        return None if "FAIL" in fields else "authentic message rejected"
+    if "FAIL" in fields:
+        return "forged message accepted"
+    if plaintext != p:
+        return "plaintext differs"
+    if gcm.encrypt(p, iv, aad) != (c, tag):
+        return "ciphertext or tag differs"
+    return None
+
+
+def _check_chunk(task):
+    """[(location, message)] of the failing cases of one chunk."""
+
+    engine, mode, mct, cases = task
+
+    failures = []
+    for location, section, fields in cases:
+        try:
+            message = check_case(engine, mode, section, fields, mct)
+        except (KeyError, ValueError) as e:
+            message = f"{type(e).__name__}: {e}"
+        if message is not None:
+            failures.append((location, message))
+
+    return failures
+
+
+def _map(fn, tasks, workers: int):
+    """Yield fn(task) for each task in order, keeping at most 2 * workers in flight."""
+
+    if workers == 1:
+        yield from map(fn, tasks)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for task in tasks:
+            pending.append(pool.submit(fn, task))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def _file_tasks(path, engine, mode, counts: list):
+    """Chunks of the cases of one file; counts[0] is incremented per case read."""
+
+    mct = "mct" in Path(path).name.lower()
+    with open(path) as f:
+        cases = read_rsp(f, str(path))
+        while chunk := list(islice(cases, CHUNK_CASES)):
+            counts[0] += len(chunk)
+            yield engine, mode, mct, chunk
+
+
+def run(paths, engine=FastAES, workers: int = 1, mode: Optional[str] = None):
+    """Check every case of the response files, return (cases, [(location, message)])."""
+
+    counts = [0]
+    tasks = (
+        task
+        for path in paths
+        for task in _file_tasks(path, engine, mode or file_mode(path), counts)
+    )
+
+    failures = []
+    for chunk in _map(_check_chunk, tasks, workers):
+        failures.extend(chunk)
+
+    return counts[0], failures
+
+
+def _reference_gcm(key: bytes, iv: bytes, plaintext: bytes, aad: bytes, t: int):
+    """(C, T) straight from SP 800-38D: byte-oriented AES and bit-serial GHASH."""
+
+    ciph = AES(key)
+    gcm = AESGCM(key, AES)
+
+    def pad(x):
+        return x + bytes(-len(x) % 16)
+
+    def lengths(a, b):
+        return (8 * a).to_bytes(8, "big") + (8 * b).to_bytes(8, "big")
+
+    if len(iv) == 12:
+        j0 = iv + bytes([0, 0, 0, 1])
+    else:
+        j0 = gcm._ghash_ref(pad(iv) + lengths(0, len(iv)))
+
+    C = bytearray(plaintext)
+    for i in range(0, len(C), 16):
+        keystream = ciph.encrypt(advance(j0, i // 16 + 1))
+        C[i : i + 16] = bytes(x ^ k for x, k in zip(C[i : i + 16], keystream))
+    C = bytes(C)
+
+    S = gcm._ghash_ref(pad(aad) + pad(C) + lengths(len(aad), len(C)))
+    T = bytes(x ^ y for x, y in zip(ciph.encrypt(j0), S))
+
+    return C, T[:t]
+
+
+def fuzz_case(seed, index: int):
+    """Random inputs of case `index`: (mode, key, parameters dict)."""
+
+    rng = random.Random(f"{seed}/{index}")
+    mode = rng.choice(MODES)
+    key = rng.randbytes(rng.choice((16, 24, 32)))
+
+    if mode == "ecb":
+        return mode, key, {"data": rng.randbytes(16 * rng.randrange(1, 40))}
+
+    if mode == "ctr":
+        # Counters near 2^32 and 2^128 wrap inside the message
+        icb = rng.choice((rng.randbytes(16), rng.randbytes(12) + b"\xff" * 4, b"\xff" * 16))
+        return mode, key, {"icb": icb, "data": rng.randbytes(rng.randrange(0, 600))}
+
+    iv_len = rng.choice((12, 12, 1, 8, 16, 60, rng.randrange(1, 129)))
+    return mode, key, {
+        "iv": rng.randbytes(iv_len),
+        "plaintext": rng.randbytes(rng.randrange(0, 300)),
+        "aad": rng.randbytes(rng.choice((0, 16, rng.randrange(0, 100)))),
+        "tag_length": rng.choice(TAG_LENGTHS),
+        "table_bits": rng.choice((4, 8)),
+        "aggregate": rng.choice((0, 0, 1, 4, 7)),
+    }
+
+
+def check_fuzz_case(engine, mode: str, key: bytes, params: dict):
+    """Compare engine against the reference on one fuzz case, return a mismatch or None."""
+
+    if mode == "ecb":
+        data, ciph, ref = params["data"], engine(key), AES(key)
+        expected = b"".join(ref.encrypt(data[i : i + 16]) for i in range(0, len(data), 16))
+        if ciph.encrypt_blocks(data) != expected:
+            return "encrypt_blocks differs"
+        if ciph.decrypt_blocks(expected) != data:
+            return "decrypt_blocks differs"
+        return None
+
+    if mode == "ctr":
+        icb, data, ref = params["icb"], params["data"], AES(key)
+        keystream = b"".join(ref.encrypt(advance(icb, i, 128)) for i in range(-(-len(data) // 16)))
+        expected = bytes(x ^ k for x, k in zip(data, keystream))
+        ctr = AESCTR(key, icb, 128, engine)
+        if ctr.encrypt(data) != expected:
+            return "encrypt differs"
+        ctr.seek(len(data) // 3)
+        if ctr.update(expected[len(data) // 3 :]) != data[len(data) // 3 :]:
+            return "update after seek differs"
+        return None
+
+    p = dict(params)
+    iv, plaintext, aad, t = p.pop("iv"), p.pop("plaintext"), p.pop("aad"), p["tag_length"]
+    C, T = _reference_gcm(key, iv, plaintext, aad, t)
+
+    gcm = AESGCM(key, engine, **p)
+    if gcm.encrypt(plaintext, iv, aad) != (C, T):
+        return "encrypt differs"
+    if gcm.decrypt(C, iv, aad, T) != plaintext:
+        return "decrypt differs"
+    if gcm.verify(C, iv, aad, bytes([T[0] ^ 1]) + T[1:]):
+        return "forged tag accepted"
+    return None
+
+
+def _fuzz_chunk(task):
+    """(index, message) of the first failing case of a chunk, or None."""
+
+    engine, seed, start, end = task
+
+    for index in range(start, end):
+        mode, key, params = fuzz_case(seed, index)
+        try:
+            message = check_fuzz_case(engine, mode, key, params)
+        except Exception as e:  # a crash is a mismatch too
+            message = f"{type(e).__name__}: {e}"
+        if message is not None:
+            return index, message
+
+    return None
+
+
+def fuzz(engine=FastAES, cases: int = 1000, seed=0, workers: int = 1):
+    """Run cases 0 .. cases - 1, return (index, mode, key, params, message) of the first
+    mismatch, or None."""
+
+    tasks = (
+        (engine, seed, start, min(start + CHUNK_CASES, cases))
+        for start in range(0, cases, CHUNK_CASES)
+    )
+
+    for result in _map(_fuzz_chunk, tasks, workers):
+        if result is not None:  # chunks arrive in order, so this is the first one
+            index, message = result
+            return (index, *fuzz_case(seed, index), message)
+
+    return None
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="NIST CAVP vectors and differential fuzzing")
+    parser.add_argument("--engine", choices=ENGINES, default="fast")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="check CAVP .rsp files")
+    run_parser.add_argument("files", nargs="+")
+    run_parser.add_argument("--mode", choices=MODES, help="instead of guessing from file names")
+
+    fuzz_parser = commands.add_parser("fuzz", help="compare an engine against the reference")
+    fuzz_parser.add_argument("--cases", type=int, default=10000)
+    fuzz_parser.add_argument("--seed", default="0")
+
+    args = parser.parse_args(argv)
+    engine = ENGINES[args.engine]
+    start = time.perf_counter()
+
+    if args.command == "run":
+        count, failures = run(args.files, engine, args.workers, args.mode)
+        for location, message in failures:
+            print(f"[Error] {location}: {message}", file=sys.stderr)
+        elapsed = time.perf_counter() - start
+        print(f"[Info] {count} cases, {len(failures)} failed in {elapsed:.2f} s", file=sys.stderr)
+        return 1 if failures else 0
+
+    mismatch = fuzz(engine, args.cases, args.seed, args.workers)
+    elapsed = time.perf_counter() - start
+    if mismatch is not None:
+        index, mode, key, params, message = mismatch
+        print(f"[Error] case {index} ({mode}): {message}", file=sys.stderr)
+        print(f"  key = {key.hex()}", file=sys.stderr)
+        for name, value in params.items():
+            value = value.hex() if isinstance(value, bytes) else value
+            print(f"  {name} = {value}", file=sys.stderr)
+        return 1
+
+    print(f"[Info] {args.cases} cases match in {elapsed:.2f} s", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,185 @@
+"""
+File encryption with memory-mapped I/O
+
+Entry points:
+
+    python -m aes_gcm encrypt|decrypt --key HEX --iv HEX [--aad HEX] INPUT OUTPUT
+    python -m aes_ctr encrypt|decrypt --key HEX --iv HEX [--counter-bits N] INPUT OUTPUT
+
+The input is memory-mapped and processed in fixed-size chunks straight into a
+memory-mapped output file of the same size, so memory use does not grow with the file.
+GCM writes the tag as hex to a sidecar file (OUTPUT.tag on encryption, INPUT.tag is read
+on decryption unless --tag or --tag-file is given). Decryption checks the tag before
+writing any plaintext.
+"""
+
+import argparse
+import mmap
+import os
+import sys
+import time
+
+from aes_ctr import AESCTR
+from aes_gcm import AESGCM
+
+# Bytes handed to the cipher per step
+DEFAULT_CHUNK_SIZE = 1 << 20
+
+
+def _process(src_path: str, dst_path: str, update, chunk_size: int, check=None) -> int:
+    """Run update() over src in chunks, writing its output to dst. Returns the size.
+
+    check(view), if given, sees the whole mapped input before dst is opened; it raises
+    to stop with nothing written.
+    """
+
+    if os.path.exists(dst_path) and os.path.samefile(src_path, dst_path):
+        raise ValueError("INPUT and OUTPUT must be different files.")  # dst is truncated
+
+    with open(src_path, "rb") as src:
+        size = os.fstat(src.fileno()).st_size
+        # empty files cannot be mapped
+        src_map = mmap.mmap(src.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+        try:
+            with memoryview(src_map) as view:
+                if check is not None:
+                    check(view)
+
+                with open(dst_path, "w+b") as dst:
+                    dst.truncate(size)
+                    if size == 0:
+                        update(b"")
+                        return 0
+
+                    dst_map = mmap.mmap(dst.fileno(), size, access=mmap.ACCESS_WRITE)
+                    try:
+                        for start in range(0, size, chunk_size):
+                            end = min(start + chunk_size, size)
+                            dst_map[start:end] = update(view[start:end])
+                        dst_map.flush()
+                    finally:
+                        dst_map.close()
+        finally:
+            if size:
+                src_map.close()
+
+    return size
+
+
+def gcm_encrypt_file(
+    key: bytes,
+    iv: bytes,
+    src_path: str,
+    dst_path: str,
+    aad: bytes = b"",
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> bytes:
+    """Encrypt src into dst with AES-GCM and return the tag."""
+
+    enc = AESGCM(key).encryptor(iv)
+    enc.update_aad(aad)
+    _process(src_path, dst_path, enc.update, chunk_size)
+
+    return enc.finalize()
+
+
+def gcm_decrypt_file(
+    key: bytes,
+    iv: bytes,
+    src_path: str,
+    dst_path: str,
+    tag: bytes,
+    aad: bytes = b"",
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+):
+    """Decrypt src into dst with AES-GCM, or raise ValueError with dst untouched.
+
+    The tag is checked by a GHASH-only pass over the mapped ciphertext, and dst is
+    written by a CTR pass only once it matches.
+    """
+
+    gcm = AESGCM(key)
+
+    def check(ciphertext):
+        if not gcm.verify(ciphertext, iv, aad, tag):
+            raise ValueError("Indication of inauthenticity failed: tag does not match.")
+
+    ctr = AESCTR(key, gcm._inc32(gcm._j0(iv)))
+    _process(src_path, dst_path, ctr.update, chunk_size, check)
+
+
+def ctr_crypt_file(
+    key: bytes,
+    iv: bytes,
+    src_path: str,
+    dst_path: str,
+    counter_bits: int = 32,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+):
+    """Encrypt or decrypt src into dst with AES-CTR."""
+
+    _process(src_path, dst_path, AESCTR(key, iv, counter_bits).update, chunk_size)
+
+
+def _parser(mode: str) -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog=f"python -m aes_{mode}", description=f"AES-{mode.upper()} file encryption"
+    )
+    parser.add_argument("operation", choices=["encrypt", "decrypt"])
+    parser.add_argument("input")
+    parser.add_argument("output")
+
+    key = parser.add_mutually_exclusive_group(required=True)
+    key.add_argument("--key", help="key as hex (16, 24 or 32 bytes)")
+    key.add_argument("--key-file", help="file holding the raw key bytes")
+
+    parser.add_argument("--iv", required=True, help="IV as hex")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+
+    if mode == "gcm":
+        parser.add_argument("--aad", default="", help="associated data as hex")
+        parser.add_argument("--tag", help="expected tag as hex (decrypt)")
+        parser.add_argument("--tag-file", help="tag sidecar path")
+    else:
+        parser.add_argument("--counter-bits", type=int, default=32)
+
+    return parser
+
+
+def main(argv=None, mode: str = "gcm") -> int:
+    args = _parser(mode).parse_args(argv)
+    start = time.perf_counter()
+
+    try:
+        if args.key is not None:
+            key = bytes.fromhex(args.key)
+        else:
+            with open(args.key_file, "rb") as f:
+                key = f.read()
+        iv = bytes.fromhex(args.iv)
+
+        if mode == "gcm":
+            aad = bytes.fromhex(args.aad)
+            if args.operation == "encrypt":
+                tag = gcm_encrypt_file(key, iv, args.input, args.output, aad, args.chunk_size)
+                with open(args.tag_file or args.output + ".tag", "w") as f:
+                    f.write(tag.hex() + "\n")
+            else:
+                if args.tag is not None:
+                    tag = bytes.fromhex(args.tag)
+                else:
+                    with open(args.tag_file or args.input + ".tag") as f:
+                        tag = bytes.fromhex(f.read().strip())
+                gcm_decrypt_file(key, iv, args.input, args.output, tag, aad, args.chunk_size)
+        else:
+            ctr_crypt_file(key, iv, args.input, args.output, args.counter_bits, args.chunk_size)
+    except (OSError, ValueError) as e:
+        print(f"[Error] {e}", file=sys.stderr)
+        return 1
+
+    elapsed = time.perf_counter() - start
+    size = os.path.getsize(args.output)
+    rate = size / elapsed / 1e6 if elapsed > 0 else float("inf")
+    print(f"[Info] {size} bytes in {elapsed:.3f} s ({rate:.2f} MB/s)", file=sys.stderr)
+
+    return 0
@@ -0,0 +1,164 @@
+"""
+Flat, shareable AES-GCM contexts for process pools
+
+export_context() packs everything AESGCM derives from a key into one byte string, all
+integers big-endian:
+
+    size                contents
+    16                  header: b"AGCM", version, key bytes, table bits, tag bytes, k
+    16 (Nr + 1)         encryption round keys, 32-bit words
+    16 (Nr + 1)         equivalent inverse cipher round keys
+    16                  H
+    16 * 2^table_bits   Shoup table n * H
+    16 k                H^1 .. H^k, only with aggregate = k > 0
+    16 * 768 k          carry-less multiply tables of each power (low, high, sum halves)
+
+    shm = share_context(AESGCM(key, aggregate=4))  # once, in the parent
+    gcm = attach_context(shm.name)  # in each worker
+
+Attaching reads the tables straight out of the buffer: no key expansion, block
+encryption or table generation. Python integers cannot live in shared memory, so each
+process still holds its own decoded copy of the tables, but not a second copy of the
+buffer; the buffer can be closed once attached. The schedule and H are also added to
+SCHEDULE_CACHE and H_CACHE, so later AESGCM(key) calls in that process are cache hits.
+
+The reduction table of GF128Table does not depend on the key and is not stored.
+"""
+
+import struct
+from itertools import repeat
+from multiprocessing.shared_memory import SharedMemory
+from operator import lshift, or_
+
+from aes_fast import SCHEDULE_CACHE, FastAES
+from aes_gcm import H_CACHE, AESGCM
+from gf128 import REDUCTION, AggregatedGHASH, GF128Table, _Clmul64
+
+MAGIC = b"AGCM"
+VERSION = 1
+
+# magic, version, key length, table bits, tag length, aggregation factor
+_HEADER = struct.Struct(">4sBBBBH6x")
+
+
+def _new(cls, **fields):
+    """Instance of cls with its slots set directly, bypassing __init__."""
+
+    obj = cls.__new__(cls)
+    for name, value in fields.items():
+        setattr(obj, name, value)
+
+    return obj
+
+
+def _pack(values) -> bytes:
+    return b"".join(v.to_bytes(16, "big") for v in values)
+
+
+def _unpack(view, offset: int, count: int):
+    """count 16-byte integers at offset, and the offset after them."""
+
+    q = struct.unpack_from(f">{2 * count}Q", view, offset)  # (high, low) halves, in C
+    values = tuple(map(or_, map(lshift, q[0::2], repeat(64)), q[1::2]))
+
+    return values, offset + 16 * count
+
+
+def context_size(key_len: int, table_bits: int = 8, aggregate: int = 0) -> int:
+    """Length in bytes of an exported context."""
+
+    rounds = key_len // 4 + 6
+    return _HEADER.size + 32 * (rounds + 1) + 16 * (1 + (1 << table_bits)) + 16 * 769 * aggregate
+
+
+def export_context(gcm: AESGCM) -> bytes:
+    """Serialize the precomputed state of gcm, which must use FastAES."""
+
+    ciph, table, aggregated = gcm.ciph, gcm._htable, gcm._aggregated
+    if not isinstance(ciph, FastAES):
+        raise ValueError("Only FastAES contexts can be exported.")
+
+    k = aggregated.k if aggregated is not None else 0
+    words = struct.Struct(f">{len(ciph.ek)}I")
+    parts = [
+        _HEADER.pack(MAGIC, VERSION, len(ciph.key), table.bits, gcm.t, k),
+        words.pack(*ciph.ek),
+        words.pack(*ciph.dk),
+        gcm.H,
+        _pack(table._m),
+    ]
+    if k:
+        parts.append(_pack(aggregated.powers))
+        for muls in aggregated._mul:
+            parts.extend(_pack(mul.__self__._t) for mul in muls)
+
+    return b"".join(parts)
+
+
+def import_context(buf) -> AESGCM:
+    """Rebuild an AESGCM from an exported context held in any buffer-protocol object."""
+
+    view = memoryview(buf).cast("B")
+    if len(view) < _HEADER.size:
+        raise ValueError("Not an AES-GCM context.")
+
+    magic, version, key_len, bits, t, k = _HEADER.unpack_from(view)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError("Not an AES-GCM context.")
+    if key_len not in (16, 24, 32) or bits not in REDUCTION:
+        raise ValueError("Invalid AES-GCM context header.")
+    if len(view) < context_size(key_len, bits, k):
+        raise ValueError("AES-GCM context is truncated.")
+
+    nk = key_len // 4
+    nr = nk + 6
+    words = struct.Struct(f">{4 * (nr + 1)}I")
+    offset = _HEADER.size
+    ek = words.unpack_from(view, offset)
+    dk = words.unpack_from(view, offset + words.size)
+    offset += 2 * words.size
+
+    key = struct.pack(f">{nk}I", *ek[:nk])  # the first Nk schedule words are the key
+    h = bytes(view[offset : offset + 16])
+    m, offset = _unpack(view, offset + 16, 1 << bits)
+
+    ciph = _new(FastAES, key=key, Nk=nk, Nb=4, Nr=nr, ek=ek, dk=dk)
+    table = _new(GF128Table, h=int.from_bytes(h, "big"), bits=bits, _m=m, _r=REDUCTION[bits])
+    table._np = None
+
+    aggregated = None
+    if k:
+        powers, offset = _unpack(view, offset, k)
+        mul = []
+        for _ in range(k):
+            halves = []
+            for _ in range(3):
+                entries, offset = _unpack(view, offset, 256)
+                halves.append(_new(_Clmul64, _t=entries).mul)
+            mul.append(tuple(halves))
+        aggregated = _new(AggregatedGHASH, k=k, powers=powers, _mul=tuple(mul))
+
+    SCHEDULE_CACHE.get(key, lambda: (ek, dk))
+    H_CACHE.get((FastAES, key, bits), lambda: (h, table))
+
+    return _new(AESGCM, ciph=ciph, H=h, t=t, _htable=table, _aggregated=aggregated)
+
+
+def share_context(gcm: AESGCM) -> SharedMemory:
+    """Export gcm into a new shared memory block; the caller closes and unlinks it."""
+
+    data = export_context(gcm)
+    shm = SharedMemory(create=True, size=len(data))
+    shm.buf[: len(data)] = data
+
+    return shm
+
+
+def attach_context(name: str) -> AESGCM:
+    """import_context() from the shared memory block called name."""
+
+    shm = SharedMemory(name=name)
+    try:
+        return import_context(shm.buf)
+    finally:
+        shm.close()
@@ -0,0 +1,272 @@
+"""
+GF(2^128) arithmetic for GHASH
+Reference: NIST SP 800-38D, Section 6.3,
+           D. McGrew, J. Viega, "The Galois/Counter Mode of Operation (GCM)", Section 4.1
+
+Field elements are 128-bit integers in GCM bit order: the most significant bit of the
+integer holds the coefficient of x^0.
+"""
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - NumPy is optional
+    np = None
+
+R = 0xE1_00_00_00_00_00_00_00_00_00_00_00_00_00_00_00
+
+
+def _mul_x(v: int) -> int:
+    """Multiply by x: shift towards the high-degree end and reduce."""
+
+    return (v >> 1) ^ R if v & 1 else v >> 1
+
+
+def _reduction_table(bits: int):
+    """r[n] = reduction term when the low `bits` bits n are shifted out by x^bits."""
+
+    r = []
+    for n in range(1 << bits):
+        v = n
+        for _ in range(bits):
+            v = _mul_x(v)
+        r.append(v)
+
+    return tuple(r)
+
+
+REDUCTION = {4: _reduction_table(4), 8: _reduction_table(8)}
+
+
+class GF128Table:
+    """Multiplication by a fixed element H using Shoup's precomputed tables.
+
+    `bits` selects the table size: 4 (16-entry tables, 32 lookups per multiply) or
+    8 (256-entry tables, 16 lookups per multiply).
+    """
+
+    __slots__ = ("h", "bits", "_m", "_r", "_np")
+
+    def __init__(self, h: int, bits: int = 8):
+        if bits not in (4, 8):
+            raise ValueError("Table size must be either 4 or 8 bits.")
+
+        self.h = h
+        self.bits = bits
+
+        size = 1 << bits
+
+        # _m[n] = n * H, where the top `bits` bits of the integer hold n
+        m = [0] * size
+        v = h
+        i = size >> 1
+        while i:
+            m[i] = v
+            v = _mul_x(v)
+            i >>= 1
+        for i in range(2, size):
+            if i & (i - 1):
+                high = 1 << (i.bit_length() - 1)
+                m[i] = m[high] ^ m[i ^ high]
+
+        self._m = tuple(m)
+        self._r = REDUCTION[bits]  # does not depend on H, shared by every table
+        self._np = None  # NumPy copies of the tables, built by mul_many (same on every build)
+
+    def mul(self, x: int) -> int:
+        """Return x * H."""
+
+        m = self._m
+        r = self._r
+        bits = self.bits
+        mask = (1 << bits) - 1
+
+        # Horner's rule from the highest-degree chunk: z = z * x^bits + n_k * H
+        z = m[x & mask]
+        for shift in range(bits, 128, bits):
+            z = (z >> bits) ^ r[z & mask] ^ m[(x >> shift) & mask]
+
+        return z
+
+    def mul_many(self, hi, lo):
+        """Return x * H for arrays of elements x split into uint64 halves (needs NumPy).
+
+        Each step of the loop in mul() is applied to all elements at once. The
+        reduction terms only reach the high half.
+        """
+
+        if self._np is None:
+            low = (1 << 64) - 1
+            self._np = (
+                np.array([v >> 64 for v in self._m], dtype=np.uint64),
+                np.array([v & low for v in self._m], dtype=np.uint64),
+                np.array([v >> 64 for v in self._r], dtype=np.uint64),
+            )
+        m_hi, m_lo, r_hi = self._np
+
+        bits = np.uint64(self.bits)
+        carry = np.uint64(64 - self.bits)
+        mask = np.uint64((1 << self.bits) - 1)
+
+        n = lo & mask
+        z_hi, z_lo = m_hi[n], m_lo[n]
+        for shift in range(self.bits, 128, self.bits):
+            n = z_lo & mask
+            z_lo = (z_lo >> bits) | (z_hi << carry)
+            z_hi = (z_hi >> bits) ^ r_hi[n]
+
+            n = ((lo >> np.uint64(shift)) if shift < 64 else (hi >> np.uint64(shift - 64))) & mask
+            z_hi ^= m_hi[n]
+            z_lo ^= m_lo[n]
+
+        return z_hi, z_lo
+
+
+# Bit-reflected representation used by the RTL (ghash.sv): bit i of the integer holds the
+# coefficient of x^i, so carry-less products are plain shifts and XORs.
+
+_REV8 = bytes(int(f"{i:08b}"[::-1], 2) for i in range(256))
+
+M128 = (1 << 128) - 1
+
+
+def reverse128(x: int) -> int:
+    """Convert between GCM bit order and the reflected representation."""
+
+    return int.from_bytes(x.to_bytes(16, "big").translate(_REV8), "little")
+
+
+def clmul(a: int, b: int) -> int:
+    """Carry-less multiplication without reduction (gf_mul.sv)."""
+
+    z = 0
+    while b:
+        if b & 1:
+            z ^= a
+        a <<= 1
+        b >>= 1
+
+    return z
+
+
+def karatsuba(a: int, b: int) -> int:
+    """128 x 128 -> 255-bit carry-less product from three 64-bit products (karatsuba_core.sv)."""
+
+    a_lo, a_hi = a & 0xFFFFFFFFFFFFFFFF, a >> 64
+    b_lo, b_hi = b & 0xFFFFFFFFFFFFFFFF, b >> 64
+
+    z0 = clmul(a_lo, b_lo)
+    z1 = clmul(a_lo ^ a_hi, b_lo ^ b_hi)
+    z2 = clmul(a_hi, b_hi)
+
+    return (z2 << 128) ^ ((z1 ^ z2 ^ z0) << 64) ^ z0
+
+
+def reduce256(z: int) -> int:
+    """Reduce a 255-bit product modulo x^128 + x^7 + x^2 + x + 1 (gf128_reduction.sv)."""
+
+    hi = z >> 128
+    t = hi ^ (hi << 1) ^ (hi << 2) ^ (hi << 7)
+    t2 = t >> 128  # at most 7 bits spill over x^128 again
+
+    return (z & M128) ^ (t & M128) ^ t2 ^ (t2 << 1) ^ (t2 << 2) ^ (t2 << 7)
+
+
+def gf_mul(a: int, b: int) -> int:
+    """Multiply two arbitrary elements given in GCM bit order."""
+
+    return reverse128(reduce256(karatsuba(reverse128(a), reverse128(b))))
+
+
+def gf_pow(h: int, n: int) -> int:
+    """Return h^n (GCM bit order), by square-and-multiply."""
+
+    z = 1 << 127  # the element 1
+    while n:
+        if n & 1:
+            z = gf_mul(z, h)
+        h = gf_mul(h, h)
+        n >>= 1
+
+    return z
+
+
+class _Clmul64:
+    """Carry-less multiplication by a fixed 64-bit operand with 8-bit windows."""
+
+    __slots__ = ("_t",)
+
+    def __init__(self, b: int):
+        t = [0] * 256
+        for n in range(1, 256):
+            high = n.bit_length() - 1
+            t[n] = t[n ^ (1 << high)] ^ (b << high)
+        self._t = tuple(t)
+
+    def mul(self, a: int) -> int:
+        t = self._t
+        z = 0
+        for shift in range(56, -8, -8):
+            z = (z << 8) ^ t[(a >> shift) & 0xFF]
+
+        return z
+
+
+class AggregatedGHASH:
+    """GHASH over groups of k blocks using precomputed H^1..H^k.
+
+    Each group computes (Y xor X_1) * H^k xor X_2 * H^(k-1) xor ... xor X_k * H with
+    Karatsuba 64-bit-half multiplies and one deferred reduction, so the k products
+    are independent of each other.
+    """
+
+    __slots__ = ("k", "powers", "_mul")
+
+    def __init__(self, h: int, k: int = 4):
+        if k < 1:
+            raise ValueError("Aggregation factor must be at least 1.")
+
+        self.k = k
+
+        # powers[i] = H^(i + 1) in GCM bit order
+        table = GF128Table(h)
+        powers = [h]
+        for _ in range(k - 1):
+            powers.append(table.mul(powers[-1]))
+        self.powers = tuple(powers)
+
+        # Per power: multipliers for the low half, high half and their sum (Karatsuba)
+        self._mul = []
+        for p in powers:
+            p = reverse128(p)
+            lo, hi = p & 0xFFFFFFFFFFFFFFFF, p >> 64
+            self._mul.append((_Clmul64(lo).mul, _Clmul64(hi).mul, _Clmul64(lo ^ hi).mul))
+        self._mul = tuple(self._mul)
+
+    def ghash(self, x: bytes, y: int = 0) -> int:
+        """Absorb x (a multiple of 16 bytes) into the running value y, both in GCM bit order."""
+
+        xr = bytes(x).translate(_REV8)  # reflect bits; byte order is reversed per block below
+        y = reverse128(y)
+        n = len(x) // 16
+
+        for start in range(0, n, self.k):
+            count = min(self.k, n - start)
+            z = 0
+
+            for j in range(count):
+                i = 16 * (start + j)
+                a = int.from_bytes(xr[i : i + 16], "little")
+                if j == 0:
+                    a ^= y
+
+                # X_j * H^(count - j), unreduced
+                mul_lo, mul_hi, mul_mid = self._mul[count - j - 1]
+                a_lo, a_hi = a & 0xFFFFFFFFFFFFFFFF, a >> 64
+                z0 = mul_lo(a_lo)
+                z2 = mul_hi(a_hi)
+                z1 = mul_mid(a_lo ^ a_hi)
+                z ^= (z2 << 128) ^ ((z1 ^ z2 ^ z0) << 64) ^ z0
+
+            y = reduce256(z)
+
+        return reverse128(y)
@@ -0,0 +1,251 @@
+"""
+Golden hex vectors for the RTL testbenches
+
+Usage:
+
+    python src/python/golden.py OUTPUT [--blocks N] [--seed S] [--workers W]
+                                       [--tests test_aes_gcm ...] [--key-sizes 128 ...]
+
+Writes OUTPUT/<test>[/aes<key size>]/*.hex in the layout the testbenches read with
+$readmemh: one hex word per line, no trailing newline. Pass `tests` as OUTPUT to
+replace the checked-in vectors. The testbench arrays are fixed-size, so for N blocks
+each tb.sv needs:
+
+    test_aes            NUM_TESTS N; plaintext and ciphertext [0:N-1] (now [0:0])
+    test_key_expansion  NUM_TESTS N; round_key [(Nr+1)*N-1:0] (now [Nr*NUM_TESTS:0]);
+                        the check reads 11 round keys per key, so N > 1 is AES-128 only
+    test_aes_ctr,       NUM_TESTS N
+    test_aes_gcm
+    test_mix_columns,   NUM_TESTS N
+    test_gf128_mul,
+    test_karatsuba
+    test_ghash          M N (din [M-1:0]); NUM_TESTS stays 1, for the one dout
+
+and MAX_CYCLES above the length of the run in every test: at least N cycles plus the
+pipeline latency, about 2N for test_aes, whose input is enabled at random.
+
+Random data comes from the seed, test, key size and chunk index, so the files do not
+depend on the number of workers. Chunks are generated in a process pool and written
+in order as they complete, so memory use does not grow with the number of blocks.
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from aes import AES
+from aes_ctr import ctr_xor
+from aes_fast import FastAES
+from aes_gcm import AESGCM
+from gf128 import GF128Table, gf_mul, gf_pow, karatsuba, reduce256
+from rtl_model import mix_columns
+
+TESTS = ("test_aes", "test_key_expansion", "test_aes_ctr", "test_aes_gcm",
+         "test_mix_columns", "test_gf128_mul", "test_karatsuba", "test_ghash")  # fmt: skip
+
+# Tests with one directory per key size
+KEYED = ("test_aes", "test_key_expansion", "test_aes_ctr", "test_aes_gcm")
+
+KEY_SIZES = (128, 192, 256)
+
+# Blocks (or keys, or operand pairs) per task
+CHUNK_BLOCKS = 1 << 14
+
+
+def _rng(seed, *path) -> random.Random:
+    return random.Random("/".join(map(str, (seed, *path))))
+
+
+def _lines(data: bytes, width: int = 16):
+    """Hex lines of `width` bytes each."""
+
+    h = data.hex()
+    step = 2 * width
+    return [h[i : i + step] for i in range(0, len(h), step)]
+
+
+def _ints(data: bytes, width: int = 16):
+    return [int.from_bytes(data[i : i + width], "big") for i in range(0, len(data), width)]
+
+
+def _pack(values, width: int = 16) -> bytes:
+    return b"".join(v.to_bytes(width, "big") for v in values)
+
+
+def _setup(test: str, key_bits: int, seed) -> dict:
+    """Per-directory constants: the key, IV or H every chunk shares."""
+
+    rng = _rng(seed, test, key_bits)
+    setup = {"key": rng.randbytes(key_bits // 8)}
+    if test == "test_aes_ctr":
+        setup["iv"] = rng.randbytes(16)
+    elif test == "test_aes_gcm":
+        setup["iv"] = rng.randbytes(12)
+    elif test == "test_ghash":
+        setup["h"] = rng.randbytes(16)
+
+    return setup
+
+
+def _chunk(task):
+    """Generate blocks [start, start + count) of one directory.
+
+    Returns ({file name: hex lines}, partial GHASH of the chunk or None).
+    """
+
+    test, key_bits, seed, index, start, count = task
+    setup = _setup(test, key_bits, seed)
+    rng = _rng(seed, test, key_bits, index)
+
+    if test == "test_key_expansion":
+        keys = [rng.randbytes(key_bits // 8) for _ in range(count)]
+        round_keys = b"".join(_pack(FastAES(k).ek, 4) for k in keys)
+        return {"key": [k.hex() for k in keys], "round_key": _lines(round_keys)}, None
+
+    data = rng.randbytes(16 * count)
+
+    if test == "test_aes":
+        out = FastAES(setup["key"]).encrypt_blocks(data)
+        return {"plaintext": _lines(data), "ciphertext": _lines(out)}, None
+
+    if test == "test_aes_ctr":
+        out = ctr_xor(FastAES(setup["key"]), setup["iv"], data, 16 * start, 32)
+        return {"plaintext": _lines(data), "ciphertext": _lines(out)}, None
+
+    if test == "test_aes_gcm":
+        gcm = AESGCM(setup["key"])
+        icb = gcm._inc32(gcm._j0(setup["iv"]))
+        out = ctr_xor(gcm.ciph, icb, data, 16 * start, 32)
+        return {"plaintext": _lines(data), "ciphertext": _lines(out)}, gcm._ghash_update(0, out)
+
+    if test == "test_mix_columns":
+        out = _pack(mix_columns(x) for x in _ints(data))
+        return {"input": _lines(data), "golden": _lines(out)}, None
+
+    if test == "test_ghash":
+        mul = GF128Table(int.from_bytes(setup["h"], "big")).mul
+        y = 0
+        for x in _ints(data):
+            y = mul(y ^ x)
+        return {"din": _lines(data)}, y
+
+    # test_gf128_mul, test_karatsuba: operand pairs, reflected bit order as in ghash.sv
+    b = rng.randbytes(16 * count)
+    products = [karatsuba(x, y) for x, y in zip(_ints(data), _ints(b))]
+    if test == "test_karatsuba":
+        result = _lines(_pack(products, 32), 32)
+    else:
+        result = _lines(_pack(reduce256(z) for z in products))
+    return {"a": _lines(data), "b": _lines(b), "result": result}, None
+
+
+def _chunks(tasks, workers: int):
+    """Yield _chunk(task) for each task in order, keeping at most 2 * workers in flight."""
+
+    if workers == 1:
+        yield from map(_chunk, tasks)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for task in tasks:
+            pending.append(pool.submit(_chunk, task))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def _write(f, lines, first: bool):
+    """Append hex lines to an open file, newline-separated without a trailing newline."""
+
+    if not first:
+        f.write("\n")
+    f.write("\n".join(lines))
+
+
+def generate(output, test: str, key_bits: int = 128, blocks: int = 100, seed=0, workers=1):
+    """Write the vectors of one test directory, return its path."""
+
+    if test not in TESTS:
+        raise ValueError(f"Unknown test: {test}")
+    if blocks < 1:
+        raise ValueError("At least one block is required.")
+
+    directory = Path(output) / test
+    if test in KEYED:
+        directory /= f"aes{key_bits}"
+    directory.mkdir(parents=True, exist_ok=True)
+
+    setup = _setup(test, key_bits, seed)
+    if test == "test_aes":
+        round_keys = b"".join(AES(setup["key"]).w)
+        (directory / "round_key.hex").write_text("\n".join(_lines(round_keys)))
+    elif test in ("test_aes_ctr", "test_aes_gcm"):
+        (directory / "key.hex").write_text(setup["key"].hex())
+        (directory / "iv.hex").write_text(setup["iv"].hex())
+    elif test == "test_ghash":
+        (directory / "h.hex").write_text(setup["h"].hex())
+
+    tasks = [
+        (test, key_bits, seed, index, start, min(CHUNK_BLOCKS, blocks - start))
+        for index, start in enumerate(range(0, blocks, CHUNK_BLOCKS))
+    ]
+
+    files = {}
+    y = 0
+    powers = {}  # H^n per chunk length
+    try:
+        for i, (chunk, partial) in enumerate(_chunks(tasks, workers)):
+            for name, lines in chunk.items():
+                if name not in files:
+                    files[name] = open(directory / f"{name}.hex", "w")
+                _write(files[name], lines, i == 0)
+
+            if partial is not None:  # Y <- Y * H^n xor G_chunk
+                n = tasks[i][5]
+                if n not in powers:
+                    h = setup.get("h") or AESGCM(setup["key"]).H
+                    powers[n] = gf_pow(int.from_bytes(h, "big"), n)
+                y = gf_mul(y, powers[n]) ^ partial
+    finally:
+        for f in files.values():
+            f.close()
+
+    if test == "test_aes_gcm":
+        gcm = AESGCM(setup["key"])
+        s = gcm._ghash_lengths(y, 0, 16 * blocks).to_bytes(16, "big")
+        (directory / "tag.hex").write_text(gcm._gctr(gcm._j0(setup["iv"]), s).hex())
+    elif test == "test_ghash":
+        (directory / "dout.hex").write_text(y.to_bytes(16, "big").hex())
+
+    return directory
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Golden hex vectors for the RTL testbenches")
+    parser.add_argument("output", help="root directory, `tests` to replace the checked-in files")
+    parser.add_argument("--blocks", type=int, default=100, help="blocks (or keys) per test")
+    parser.add_argument("--seed", default="0")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--tests", nargs="+", choices=TESTS, default=TESTS)
+    parser.add_argument("--key-sizes", type=int, nargs="+", choices=KEY_SIZES, default=KEY_SIZES)
+    args = parser.parse_args(argv)
+
+    for test in args.tests:
+        for key_bits in args.key_sizes if test in KEYED else (128,):
+            start = time.perf_counter()
+            path = generate(args.output, test, key_bits, args.blocks, args.seed, args.workers)
+            elapsed = time.perf_counter() - start
+            print(f"[Info] {path}: {args.blocks} blocks in {elapsed:.2f} s", file=sys.stderr)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,105 @@
+"""
+Opt-in instrumentation of the AES-GCM hot paths
+
+    stats = instrument.enable()
+    gcm = AESGCM(key)
+    gcm.encrypt(plaintext, iv, aad)
+    instrument.disable()
+    print(stats.as_dict())
+
+While disabled, `current` is None and each instrumented call only pays one module
+attribute lookup and a few `is not None` checks. Stats are not locked; enable them
+from one thread at a time.
+"""
+
+from time import perf_counter
+
+# Stages timed per call, in the order AESGCM.encrypt runs them
+STAGES = ("setup", "j0", "gctr", "ghash", "tag")
+
+# Active Stats, None while instrumentation is disabled
+current = None
+
+
+class Stats:
+    """Counters and per-stage wall time accumulated while instrumentation is enabled.
+
+    `hook`, if given, is called after every public AESGCM call with a dict holding the
+    operation name, its byte counts and the seconds spent in each stage of that call.
+    """
+
+    __slots__ = ("hook", "calls", "block_encryptions", "gf_multiplies", "bytes_processed",
+                 "allocations", "stage_seconds", "_call")  # fmt: skip
+
+    def __init__(self, hook=None):
+        self.hook = hook
+        self.reset()
+
+    def reset(self):
+        self.calls = 0
+        self.block_encryptions = 0  # single-block cipher invocations
+        self.gf_multiplies = 0  # GF(2^128) multiplications by H or a power of H
+        self.bytes_processed = 0  # AAD and payload bytes
+        self.allocations = 0  # output, counter block and keystream buffers built by the data path
+        self.stage_seconds = dict.fromkeys(STAGES, 0.0)
+        self._call = None
+
+    def begin(self, op: str) -> float:
+        """Start timing one call, return the stage start mark."""
+
+        self._call = {"op": op}
+        return perf_counter()
+
+    def stage(self, name: str, mark: float) -> float:
+        """Close the stage that started at mark, return the start mark of the next one."""
+
+        now = perf_counter()
+        elapsed = now - mark
+        self.stage_seconds[name] += elapsed
+        if self._call is not None:
+            self._call[name] = elapsed
+
+        return now
+
+    def end(self, aad_len: int, data_len: int):
+        """Finish the call started by begin() and pass its record to the hook.
+
+        Work counters are incremented where the work happens, not here.
+        """
+
+        self.calls += 1
+        self.bytes_processed += aad_len + data_len
+
+        call, self._call = self._call, None
+        if self.hook is not None and call is not None:
+            call["aad_bytes"] = aad_len
+            call["data_bytes"] = data_len
+            self.hook(call)
+
+    def as_dict(self) -> dict:
+        return {
+            "calls": self.calls,
+            "block_encryptions": self.block_encryptions,
+            "gf_multiplies": self.gf_multiplies,
+            "bytes_processed": self.bytes_processed,
+            "allocations": self.allocations,
+            "stage_seconds": dict(self.stage_seconds),
+        }
+
+
+def enable(hook=None) -> Stats:
+    """Start collecting into a fresh Stats object and return it."""
+
+    global current
+    current = Stats(hook)
+
+    return current
+
+
+def disable():
+    """Stop collecting and return the Stats gathered so far (or None)."""
+
+    global current
+    stats, current = current, None
+
+    return stats
@@ -0,0 +1,81 @@
+"""
+Bounded LRU cache for per-key precomputation (key schedules, GHASH subkeys)
+"""
+
+from collections import OrderedDict
+from threading import Lock
+from typing import NamedTuple
+
+
+class CacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+
+class LRUCache:
+    """Least-recently-used mapping from key material to derived values.
+
+    Values are shared by every object built from the same key, so their cached state
+    must be safe to share: immutable, or only ever filled in with the same result (as
+    the NumPy tables GF128Table.mul_many builds on first use).
+    A `maxsize` of 0 disables caching.
+    """
+
+    __slots__ = ("_data", "_lock", "maxsize", "hits", "misses")
+
+    def __init__(self, maxsize: int = 1024):
+        if maxsize < 0:
+            raise ValueError("Cache size must be non-negative.")
+
+        self._data = OrderedDict()
+        self._lock = Lock()
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, factory):
+        """Return the cached value for key, computing it with factory() on a miss."""
+
+        with self._lock:
+            value = self._data.get(key)
+            if value is not None:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return value
+            self.misses += 1
+
+        value = factory()
+
+        if self.maxsize > 0:
+            with self._lock:
+                self._data[key] = value
+                self._data.move_to_end(key)
+                while len(self._data) > self.maxsize:
+                    self._data.popitem(last=False)
+
+        return value
+
+    def resize(self, maxsize: int):
+        """Change the capacity, evicting the least recently used entries if needed."""
+
+        if maxsize < 0:
+            raise ValueError("Cache size must be non-negative.")
+
+        with self._lock:
+            self.maxsize = maxsize
+            while len(self._data) > maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        """Drop all entries and reset the statistics."""
+
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def info(self) -> CacheInfo:
+        with self._lock:
+            return CacheInfo(self.hits, self.misses, self.maxsize, len(self._data))
@@ -0,0 +1,140 @@
+"""
+Keystream pregeneration for AES-GCM sends whose IV is known before the message
+
+    pool = KeystreamPool(AESGCM(key))
+    pool.reserve(iv, 1500)  # E_K(J0) and 94 keystream blocks, computed in the background
+    ...
+    C, T = pool.encrypt(plaintext, iv, aad)  # XOR and GHASH only
+
+Each reservation is used once: encrypt() removes it, and an IV cannot be reserved again
+while it is pending. At most `max_reservations` are held, reserving more evicts the
+oldest one. Keystream that is consumed, released or evicted is overwritten with zeros
+(best effort: CPython may have copied it elsewhere).
+"""
+
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+
+from aes import byte_view
+from aes_ctr import counter_blocks, ctr_xor
+from aes_gcm import AESGCM
+
+
+def _generate(cipher, key: bytes, j0: bytes, blocks: int) -> bytearray:
+    """E_K(J0) || E_K(inc32(J0)) || ... for `blocks` blocks after J0."""
+
+    return bytearray(cipher(key).encrypt_blocks(counter_blocks(j0, 1 + blocks)))
+
+
+def _wipe(future):
+    if not future.cancelled() and future.exception() is None:
+        buf = future.result()
+        buf[:] = bytes(len(buf))
+
+
+class KeystreamPool:
+    """Bounded set of IV reservations whose keystream a background worker precomputes.
+
+    `executor` defaults to a single worker thread owned by the pool; a process pool
+    also works, since workers only receive the key and J0.
+    """
+
+    def __init__(self, gcm: AESGCM, max_reservations: int = 64, executor=None):
+        if max_reservations < 1:
+            raise ValueError("At least one reservation is required.")
+
+        self.gcm = gcm
+        self.max_reservations = max_reservations
+        self._own_executor = executor is None
+        self._executor = executor or ThreadPoolExecutor(1, thread_name_prefix="keystream")
+        self._reserved = OrderedDict()  # j0 -> (reserved bytes, future of the keystream)
+        self._lock = Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self._reserved)
+
+    def reserve(self, iv: bytes, size: int):
+        """Start generating the tag block and keystream for a message of up to size bytes."""
+
+        if size < 0:
+            raise ValueError("Size must be non-negative.")
+
+        gcm = self.gcm
+        j0 = gcm._j0(iv)
+        args = (type(gcm.ciph), gcm.ciph.key, j0, -(-size // 16))
+
+        with self._lock:
+            if j0 in self._reserved:
+                raise ValueError("IV is already reserved.")
+            self._reserved[j0] = (size, self._executor.submit(_generate, *args))
+
+            while len(self._reserved) > self.max_reservations:
+                self._discard(self._reserved.popitem(last=False)[1])
+
+    def release(self, iv: bytes):
+        """Drop the reservation of iv, if any, and wipe its keystream."""
+
+        with self._lock:
+            entry = self._reserved.pop(self.gcm._j0(iv), None)
+        if entry is not None:
+            self._discard(entry)
+
+    def encrypt(self, plaintext: bytes, iv: bytes, aad: bytes):
+        """`AESGCM.encrypt` using the reserved keystream of iv.
+
+        Without a reservation, or if its generation has not started yet, the message is
+        encrypted inline; bytes past the reserved size are generated inline too.
+        """
+
+        gcm = self.gcm
+        j0 = gcm._j0(iv)
+        with self._lock:
+            entry = self._reserved.pop(j0, None)
+
+        plaintext = byte_view(plaintext)
+
+        if entry is None or entry[1].cancel():
+            return gcm.encrypt(plaintext, iv, aad)
+
+        size, future = entry
+        keystream = future.result()
+        try:
+            C = bytearray(len(plaintext))
+            m = min(size, len(plaintext))
+            if m:
+                p = int.from_bytes(plaintext[:m], "big")
+                C[:m] = (p ^ int.from_bytes(keystream[16 : 16 + m], "big")).to_bytes(m, "big")
+            if m < len(plaintext):
+                out = memoryview(C)[m:]
+                ctr_xor(gcm.ciph, gcm._inc32(j0), memoryview(plaintext)[m:], m, out=out)
+
+            S = gcm._ghash_s(byte_view(aad), C)
+            T = gcm._xor_bytes(S, keystream[:16])[: gcm.t]
+        finally:
+            _wipe(future)
+
+        return bytes(C), T
+
+    def close(self):
+        """Wipe every reservation, and shut down the worker thread if the pool owns it."""
+
+        with self._lock:
+            entries = list(self._reserved.values())
+            self._reserved.clear()
+        for entry in entries:
+            self._discard(entry)
+
+        if self._own_executor:
+            self._executor.shutdown(wait=True)
+
+    def _discard(self, entry):
+        _, future = entry
+        if not future.cancel():
+            future.add_done_callback(_wipe)  # runs now if the keystream is ready
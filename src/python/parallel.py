@@ -0,0 +1,184 @@
+"""
+Multi-process AES-CTR and AES-GCM for large payloads
+
+The counter range is split into chunks that a process pool encrypts independently.
+Input and output live in `multiprocessing.shared_memory`, so payloads are never
+pickled. For GCM each worker also returns the GHASH of its chunk of ciphertext, and
+the parent folds the partial values together with powers of H:
+
+    Y <- Y * H^(n_i) xor G_i
+
+which gives a tag bit-identical to the serial path. Decryption hashes the ciphertext
+in a first pass and checks the tag before any chunk is decrypted.
+"""
+
+import hmac
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+
+from aes_ctr import AESCTR, ctr_xor
+from aes_gcm import AESGCM
+from gf128 import gf_mul, gf_pow
+
+# Bytes per task, rounded up to whole blocks
+DEFAULT_CHUNK_SIZE = 1 << 20
+
+_GHASH_NONE = 0
+_GHASH_OUTPUT = 1  # encryption: GHASH over the produced ciphertext
+_GHASH_INPUT = 2  # decryption: GHASH over the received ciphertext, no CTR
+
+
+def _work(task):
+    """Process one chunk in a worker and return its partial GHASH (or 0)."""
+
+    cipher, key, icb, bits, src_name, dst_name, start, end, ghash = task
+
+    src = SharedMemory(name=src_name)
+    dst = SharedMemory(name=dst_name)
+    try:
+        with src.buf[start:end] as data:
+            if ghash == _GHASH_INPUT:
+                gcm = AESGCM(key, cipher)  # H is cached per process after the first task
+                return gcm._ghash_update(0, data)
+
+            out = ctr_xor(cipher(key), icb, data, start, bits)
+            dst.buf[start:end] = out
+
+            partial = 0
+            if ghash == _GHASH_OUTPUT:
+                partial = AESGCM(key, cipher)._ghash_update(0, out)
+
+        return partial
+    finally:
+        src.close()
+        dst.close()
+
+
+def _run(cipher, key, icb, bits, data, ghash, workers, chunk_size, executor, verify=None):
+    """Run ctr_xor over data in parallel, return (output, [(blocks, partial GHASH), ...]).
+
+    With _GHASH_INPUT the partial GHASH values come from a first pass that only hashes
+    the input; verify(partials) runs on them, and the CTR pass starts only if it returns.
+    """
+
+    chunk_size = -(-max(chunk_size, 16) // 16) * 16
+    size = len(data)
+
+    src = SharedMemory(create=True, size=size)
+    dst = SharedMemory(create=True, size=size)
+    pool = executor or ProcessPoolExecutor(max_workers=workers or os.cpu_count())
+    try:
+        src.buf[:size] = data
+
+        tasks = []
+        for start in range(0, size, chunk_size):
+            end = min(start + chunk_size, size)
+            tasks.append((cipher, key, icb, bits, src.name, dst.name, start, end, ghash))
+        blocks = [-(-(task[7] - task[6]) // 16) for task in tasks]
+
+        partials = list(pool.map(_work, tasks))
+        if ghash == _GHASH_INPUT:
+            verify(list(zip(blocks, partials)))
+            list(pool.map(_work, [task[:-1] + (_GHASH_NONE,) for task in tasks]))
+
+        output = bytes(dst.buf[:size])
+    finally:
+        if executor is None:
+            pool.shutdown()
+        src.close()
+        src.unlink()
+        dst.close()
+        dst.unlink()
+
+    return output, list(zip(blocks, partials))
+
+
+def _combine(gcm: AESGCM, y: int, partials) -> int:
+    """Fold partial chunk GHASH values into the running value y."""
+
+    h = int.from_bytes(gcm.H, "big")
+    powers = {}
+
+    for n, partial in partials:
+        if n not in powers:
+            powers[n] = gf_pow(h, n)
+        y = gf_mul(y, powers[n]) ^ partial
+
+    return y
+
+
+def _tag(gcm: AESGCM, j0: bytes, y: int, aad_len: int, data_len: int) -> bytes:
+    y = gcm._ghash_lengths(y, aad_len, data_len)
+
+    return gcm._gctr(j0, y.to_bytes(16, "big"))[: gcm.t]
+
+
+def gcm_encrypt(
+    gcm: AESGCM,
+    plaintext,
+    iv: bytes,
+    aad: bytes,
+    workers=None,
+    chunk_size=DEFAULT_CHUNK_SIZE,
+    executor=None,
+):
+    """Parallel `AESGCM.encrypt`. Payloads of one chunk or less run serially."""
+
+    if len(plaintext) <= chunk_size:
+        return gcm.encrypt(plaintext, iv, aad)
+
+    j0 = gcm._j0(iv)
+    icb = gcm._inc32(j0)
+    args = (workers, chunk_size, executor)
+    C, partials = _run(type(gcm.ciph), gcm.ciph.key, icb, 32, plaintext, _GHASH_OUTPUT, *args)
+
+    y = _combine(gcm, gcm._ghash_update(0, aad), partials)
+    return C, _tag(gcm, j0, y, len(aad), len(C))
+
+
+def gcm_decrypt(
+    gcm: AESGCM,
+    ciphertext,
+    iv: bytes,
+    aad: bytes,
+    tag: bytes,
+    workers=None,
+    chunk_size=DEFAULT_CHUNK_SIZE,
+    executor=None,
+):
+    """Parallel `AESGCM.decrypt`. Payloads of one chunk or less run serially.
+
+    The tag is checked after a GHASH-only pass, before any chunk is decrypted.
+    """
+
+    if len(ciphertext) <= chunk_size:
+        return gcm.decrypt(ciphertext, iv, aad, tag)
+
+    if len(tag) != gcm.t:
+        raise ValueError("Indication of inauthenticity failed: invalid tag length.")
+
+    j0 = gcm._j0(iv)
+    icb = gcm._inc32(j0)
+
+    def verify(partials):
+        y = _combine(gcm, gcm._ghash_update(0, aad), partials)
+        if not hmac.compare_digest(_tag(gcm, j0, y, len(aad), len(ciphertext)), tag):
+            raise ValueError("Indication of inauthenticity failed: tag does not match.")
+
+    args = (workers, chunk_size, executor, verify)
+    P, _ = _run(type(gcm.ciph), gcm.ciph.key, icb, 32, ciphertext, _GHASH_INPUT, *args)
+
+    return P
+
+
+def ctr_crypt(ctr: AESCTR, data, workers=None, chunk_size=DEFAULT_CHUNK_SIZE, executor=None):
+    """Parallel `AESCTR.encrypt` / `AESCTR.decrypt`."""
+
+    if len(data) <= chunk_size:
+        return ctr.encrypt(data)
+
+    args = (workers, chunk_size, executor)
+    out, _ = _run(type(ctr.ciph), ctr.ciph.key, ctr.iv, ctr.counter_bits, data, _GHASH_NONE, *args)
+
+    return out
@@ -0,0 +1,744 @@
+"""
+Cycle-level model of the RTL in src/rtl
+
+Every class keeps the registers of its SystemVerilog module and advances them once per
+clock in tick(). Combinational signals are computed from the current register values
+before any register changes, so ready/valid handshakes, pipeline stalls and FSM
+transitions land on the same cycles as in simulation. The data path is computed for
+real (round keys from the key expansion FSM, one AES step per pipeline stage, Karatsuba
+products in GHASH) and simulate_ctr/simulate_gcm check the results against the Python
+reference.
+
+Usage:
+
+    python src/python/rtl_model.py gcm --blocks 100 --key-bits 128 --valid-pattern 1101
+
+Behaviour of the RTL that the model reproduces:
+
+- aes_gcm.sv feeds only key_i[127:0] to the core, so 192/256-bit GCM does not match
+  the reference. aes_ctr.sv handles all key sizes.
+- aes_gcm.sv has no AAD input (len(A) is 0 in the length block) and whole blocks only.
+- For decryption aes_gcm.sv feeds GHASH from din_i only when it differs from the
+  previous cycle's value. Two equal consecutive ciphertext blocks, or a block first
+  presented with din_valid_i low, are left out and the tag is wrong. Like the
+  testbenches, the drivers here hold din_i on the next block whatever din_valid_i is.
+"""
+
+import argparse
+import random
+import sys
+from collections import deque
+from itertools import cycle
+from typing import NamedTuple
+
+from aes import AES, SBOX
+from aes_ctr import ctr_xor
+from aes_gcm import AESGCM
+from gf128 import M128, karatsuba, reduce256, reverse128
+
+# define.svh: key size -> (Nk, Nr, EXP_PER_CYCLE)
+PARAMS = {128: (4, 10, 4), 192: (6, 12, 6), 256: (8, 14, 4)}
+
+Nb = 4
+
+_SBOX = bytes(SBOX)
+_XTIME = bytes(((n << 1) ^ (0x1B if n & 0x80 else 0)) & 0xFF for n in range(256))
+
+# shift_rows.sv on the column-major state: byte 4c + r comes from column c + r
+_SHIFT_ROWS = tuple(4 * ((c + r) % 4) + r for c in range(4) for r in range(4))
+
+
+def sub_bytes(state: int) -> int:
+    return int.from_bytes(state.to_bytes(16, "big").translate(_SBOX), "big")
+
+
+def shift_rows(state: int) -> int:
+    s = state.to_bytes(16, "big")
+    return int.from_bytes(bytes(s[i] for i in _SHIFT_ROWS), "big")
+
+
+def mix_columns(state: int) -> int:
+    s = state.to_bytes(16, "big")
+    out = bytearray(16)
+    for c in range(0, 16, 4):
+        a0, a1, a2, a3 = s[c : c + 4]
+        t = a0 ^ a1 ^ a2 ^ a3
+        out[c] = a0 ^ t ^ _XTIME[a0 ^ a1]
+        out[c + 1] = a1 ^ t ^ _XTIME[a1 ^ a2]
+        out[c + 2] = a2 ^ t ^ _XTIME[a2 ^ a3]
+        out[c + 3] = a3 ^ t ^ _XTIME[a3 ^ a0]
+    return int.from_bytes(out, "big")
+
+
+def _sub_word(word: int) -> int:
+    return int.from_bytes(word.to_bytes(4, "big").translate(_SBOX), "big")
+
+
+def _rot_word(word: int) -> int:
+    return ((word << 8) | (word >> 24)) & 0xFFFFFFFF
+
+
+def _inc32(x: int) -> int:
+    """inc.sv with s = 32."""
+
+    return (x & ~0xFFFFFFFF) | ((x + 1) & 0xFFFFFFFF)
+
+
+class Fifo:
+    """fifo.sv: data_o is registered and reads 0 in cycles without a pop."""
+
+    __slots__ = ("depth", "queue", "data_o", "peak")
+
+    def __init__(self, depth: int):
+        if depth < 2:
+            raise ValueError("FIFO depth must be at least 2.")
+
+        self.depth = depth
+        self.reset()
+        self.peak = 0  # highest occupancy seen, survives reset
+
+    def reset(self):
+        self.queue = deque()
+        self.data_o = 0
+
+    @property
+    def empty(self) -> bool:
+        return not self.queue
+
+    @property
+    def full(self) -> bool:
+        return len(self.queue) == self.depth
+
+    @property
+    def almost_full(self) -> bool:
+        return len(self.queue) >= self.depth - 2
+
+    def tick(self, push: bool, data: int, pop: bool):
+        do_push = push and not self.full
+        do_pop = pop and not self.empty
+
+        self.data_o = self.queue.popleft() if do_pop else 0
+        if do_push:
+            self.queue.append(data)
+            self.peak = max(self.peak, len(self.queue))
+
+
+class KeyExpansion:
+    """key_expansion.sv: one S_SUB_WORD / S_EXPAND pair per EXP_PER_CYCLE words."""
+
+    __slots__ = ("key_bits", "Nk", "Nr", "exp_per_cycle", "state", "idx", "w", "rcon", "temp")
+
+    def __init__(self, key_bits: int):
+        self.key_bits = key_bits
+        self.Nk, self.Nr, self.exp_per_cycle = PARAMS[key_bits]
+
+        self.state = "S_IDLE"
+        self.idx = self.Nk
+        self.w = [0] * (Nb * (self.Nr + 1))
+        self.rcon = 0x01
+        self.temp = 0
+
+    @property
+    def ready(self) -> bool:
+        return self.state == "S_IDLE"
+
+    @property
+    def valid(self) -> bool:
+        return self.state == "S_DONE"
+
+    def round_keys(self):
+        w = self.w
+        return [
+            w[i] << 96 | w[i + 1] << 64 | w[i + 2] << 32 | w[i + 3] for i in range(0, len(w), Nb)
+        ]
+
+    def tick(self, valid_i: bool, key: int):
+        state, idx, w, Nk = self.state, self.idx, self.w, self.Nk
+        aes256 = self.key_bits == 256
+
+        def word(i):  # reads past the schedule (AES-192, last pair) only feed dropped writes
+            return w[i] if i < len(w) else 0
+
+        if state == "S_IDLE":
+            if valid_i:
+                for i in range(Nk):
+                    w[i] = (key >> (self.key_bits - 32 * (i + 1))) & 0xFFFFFFFF
+            self.state = "S_SUB_WORD" if valid_i else "S_IDLE"
+            self.idx = Nk
+            self.rcon = 0x01
+
+        elif state == "S_SUB_WORD":
+            x = word(idx - 1)
+            self.temp = _sub_word(x if aes256 and idx % 8 else _rot_word(x))
+            self.state = "S_EXPAND"
+
+        elif state == "S_EXPAND":
+            first = not aes256 or idx % 8 == 0
+            prev = word(idx - Nk) ^ self.temp ^ (self.rcon << 24 if first else 0)
+            for i in range(self.exp_per_cycle):
+                if i:
+                    prev ^= word(idx - Nk + i)
+                if idx + i < len(w):  # writes past the schedule are dropped
+                    w[idx + i] = prev
+
+            if first:
+                self.rcon = _XTIME[self.rcon]
+            self.state = "S_DONE" if idx >= len(w) else "S_SUB_WORD"
+            self.idx = idx + self.exp_per_cycle
+
+        else:  # S_DONE
+            self.state = "S_IDLE"
+            self.idx = Nk
+
+
+class AESPipeline:
+    """aes.sv: 2 * Nr registers (sub_bytes and round output per round), stalled by `en`."""
+
+    __slots__ = ("Nr", "valid", "state")
+
+    def __init__(self, Nr: int):
+        self.Nr = Nr
+        self.reset()
+
+    def reset(self):
+        self.valid = [False] * (2 * self.Nr)
+        self.state = [0] * (2 * self.Nr)
+
+    @property
+    def valid_o(self) -> bool:
+        return self.valid[-1]
+
+    @property
+    def ciphertext_o(self) -> int:
+        return self.state[-1]
+
+    def busy(self) -> bool:
+        return any(self.valid)
+
+    def tick(self, en: bool, valid_i: bool, plaintext: int, round_keys):
+        if not en:
+            return
+
+        valid, state = self.valid, self.state
+        new_valid = [False] * len(valid)
+        new_state = list(state)
+
+        for r in range(1, self.Nr + 1):
+            sub, out = 2 * r - 2, 2 * r - 1
+
+            # round r output register, from its sub_bytes register
+            new_valid[out] = valid[sub]
+            if valid[sub]:
+                x = shift_rows(state[sub])
+                if r != self.Nr:
+                    x = mix_columns(x)
+                new_state[out] = x ^ round_keys[r]
+
+            # round r sub_bytes register, from the previous round (or the initial AddRoundKey)
+            if r == 1:
+                new_valid[sub] = valid_i
+                if valid_i:
+                    new_state[sub] = sub_bytes(plaintext ^ round_keys[0])
+            else:
+                new_valid[sub] = valid[sub - 1]
+                if valid[sub - 1]:
+                    new_state[sub] = sub_bytes(state[sub - 1])
+
+        self.valid, self.state = new_valid, new_state
+
+
+class GF128Mul:
+    """gf128_mul.sv: `latency` Karatsuba register levels, reduction on the output."""
+
+    __slots__ = ("valid", "value")
+
+    def __init__(self, latency: int = 4):
+        if latency < 1:
+            raise ValueError("Multiplier latency must be at least 1.")
+
+        self.valid = [False] * latency
+        self.value = [0] * latency
+
+    @property
+    def valid_o(self) -> bool:
+        return self.valid[-1]
+
+    @property
+    def result_o(self) -> int:
+        return reduce256(self.value[-1])
+
+    def reset(self):
+        self.valid = [False] * len(self.valid)
+
+    def tick(self, en: bool, valid_i: bool, a: int, b: int):
+        if not en:
+            return
+
+        valid, value = self.valid, self.value
+        for i in range(len(valid) - 1, 0, -1):
+            valid[i] = valid[i - 1]
+            if valid[i - 1]:
+                value[i] = value[i - 1]
+
+        valid[0] = valid_i
+        if valid_i:
+            value[0] = karatsuba(a, b)
+
+
+class GHASHCore:
+    """ghash.sv: input FIFO and one multiply in flight at a time, in reflected bit order."""
+
+    __slots__ = ("state", "h", "h_cfg_done", "fifo_pop_reg", "mul_output_reg", "fifo", "mul")
+
+    def __init__(self, fifo_depth: int = 32, mul_latency: int = 4):
+        self.state = "S_IDLE"
+        self.h = 0
+        self.h_cfg_done = False
+        self.fifo_pop_reg = False
+        self.mul_output_reg = 0
+        self.fifo = Fifo(fifo_depth)
+        self.mul = GF128Mul(mul_latency)
+
+    @property
+    def din_ready(self) -> bool:
+        return not self.fifo.almost_full and self.h_cfg_done
+
+    @property
+    def dout_valid(self) -> bool:
+        return self.state == "S_LAST_BLOCK" and self.mul.valid_o
+
+    @property
+    def dout(self) -> int:
+        return reverse128(self.mul.result_o)
+
+    def tick(self, din: int, din_valid: bool, last: bool, h: int, h_valid: bool):
+        state, fifo, mul = self.state, self.fifo, self.mul
+        fifo_output = fifo.data_o
+        mul_valid = mul.valid_o
+        mul_input_valid = self.fifo_pop_reg
+
+        fifo_pop = False
+        mul_input = 0
+        if state == "S_FIRST_BLOCK":
+            fifo_pop = not fifo.empty
+            mul_input = fifo_output & M128
+        elif state == "S_STD_BLOCK":
+            fifo_pop = not fifo.empty and mul_valid
+            mul_input = (fifo_output & M128) ^ self.mul_output_reg
+
+        if state == "S_IDLE":
+            state_next = "S_FIRST_BLOCK" if h_valid else "S_IDLE"
+        elif state == "S_FIRST_BLOCK":
+            state_next = "S_STD_BLOCK" if not fifo.empty else "S_FIRST_BLOCK"
+        elif state == "S_STD_BLOCK":
+            state_next = "S_LAST_BLOCK" if fifo_output >> 128 else "S_STD_BLOCK"
+        else:
+            state_next = "S_IDLE" if mul_valid else "S_LAST_BLOCK"
+
+        if state == "S_IDLE":
+            self.mul_output_reg = 0
+        elif mul_valid:
+            self.mul_output_reg = mul.result_o
+
+        en = not fifo.empty or mul_input_valid or state != "S_STD_BLOCK"
+        mul.tick(en, mul_input_valid, mul_input, self.h)
+        fifo.tick(din_valid, int(last) << 128 | reverse128(din), fifo_pop)
+
+        self.state = state_next
+        self.fifo_pop_reg = fifo_pop
+        if h_valid:
+            self.h = reverse128(h)
+            self.h_cfg_done = True
+
+
+class AESCTRCore:
+    """aes_ctr.sv: key expansion, AES pipeline and a keystream FIFO (DEPTH = 2)."""
+
+    __slots__ = ("key_exp", "aes", "fifo", "counter", "key_cfg_done", "iv_cfg_done",
+                 "dout_reg", "dout_valid")  # fmt: skip
+
+    def __init__(self, key_bits: int = 128, fifo_depth: int = 2):
+        if key_bits not in PARAMS:
+            raise ValueError("Key size must be 128, 192 or 256 bits.")
+
+        self.key_exp = KeyExpansion(key_bits)
+        self.aes = AESPipeline(self.key_exp.Nr)
+        self.fifo = Fifo(fifo_depth)
+        self.counter = 0
+        self.key_cfg_done = False
+        self.iv_cfg_done = False
+        self.dout_reg = 0
+        self.dout_valid = False
+
+    @property
+    def key_ready(self) -> bool:
+        return self.key_exp.ready
+
+    def din_ready(self, dout_ready: bool) -> bool:
+        return not self.fifo.empty and dout_ready
+
+    @property
+    def dout(self) -> int:
+        return self.dout_reg ^ self.fifo.data_o
+
+    def tick(self, key, key_valid, iv, iv_valid, din, din_valid, dout_ready):
+        aes, fifo = self.aes, self.fifo
+        aes_input_valid = self.key_cfg_done and self.iv_cfg_done
+        fifo_full = fifo.full
+        fifo_pop = din_valid and self.din_ready(dout_ready)
+
+        if key_valid or iv_valid:  # flush: asynchronous reset of the pipeline and FIFO
+            aes.reset()
+            fifo.reset()
+        else:
+            fifo.tick(aes.valid_o, aes.ciphertext_o, fifo_pop)
+            if aes_input_valid or aes.busy():
+                aes.tick(not fifo_full, aes_input_valid, self.counter, self.key_exp.round_keys())
+
+        key_exp_done = self.key_exp.valid
+        self.key_exp.tick(key_valid, key)
+
+        if iv_valid:
+            self.counter = iv
+        elif not fifo_full and aes_input_valid:
+            self.counter = _inc32(self.counter)
+
+        if key_valid:
+            self.key_cfg_done = False
+        elif key_exp_done:
+            self.key_cfg_done = True
+
+        if iv_valid:
+            self.iv_cfg_done = True
+
+        self.dout_valid = fifo_pop
+        if fifo_pop:
+            self.dout_reg = din
+
+
+class AESGCMCore:
+    """aes_gcm.sv: the S_IDLE ... S_DONE FSM around one AESCTRCore and one GHASHCore."""
+
+    __slots__ = ("state", "block_count", "iv", "iv_cfg_done", "din_reg", "din_valid_reg",
+                 "ghash_result", "ctr", "ghash")  # fmt: skip
+
+    def __init__(self, key_bits=128, ctr_fifo_depth=2, ghash_fifo_depth=32, mul_latency=4):
+        self.state = "S_IDLE"
+        self.block_count = 0
+        self.iv = 0
+        self.iv_cfg_done = False
+        self.din_reg = 0
+        self.din_valid_reg = False
+        self.ghash_result = 0
+        self.ctr = AESCTRCore(key_bits, ctr_fifo_depth)
+        self.ghash = GHASHCore(ghash_fifo_depth, mul_latency)
+
+    @property
+    def key_ready(self) -> bool:
+        return self.state == "S_IDLE"
+
+    @property
+    def din_ready(self) -> bool:
+        return self.state == "S_DATA_PROCESS" and self.ctr.din_ready(self.ghash.din_ready)
+
+    @property
+    def dout_valid(self) -> bool:
+        return self.state in ("S_DATA_PROCESS", "S_DATA_LAST") and self.ctr.dout_valid
+
+    @property
+    def dout(self) -> int:
+        return self.ctr.dout
+
+    @property
+    def tag_valid(self) -> bool:
+        return self.state == "S_DONE"
+
+    @property
+    def tag(self) -> int:
+        return self.ctr.dout if self.state == "S_DONE" else 0
+
+    def tick(self, decrypt, key, key_valid, iv, iv_valid, din, din_valid, din_last):
+        state, ctr, ghash = self.state, self.ctr, self.ghash
+        ghash_ready = ghash.din_ready
+        din_ready = self.din_ready
+        accepted = din_valid and din_ready
+
+        # AES-CTR control
+        ctr_key, ctr_key_valid = 0, False
+        ctr_iv, ctr_iv_valid = 0, False
+        ctr_din, ctr_din_valid = 0, False
+        ctr_dout_ready = True
+        if state == "S_IDLE":
+            ctr_key, ctr_key_valid = key & M128, key_valid  # key_i[127:0]
+        elif state == "S_H_SETUP":
+            ctr_iv_valid = True
+        elif state == "S_H_CALC":
+            ctr_din_valid = True
+        elif state == "S_DATA_SETUP":
+            ctr_iv, ctr_iv_valid = self.iv << 32 | 2, self.iv_cfg_done
+        elif state == "S_DATA_PROCESS":
+            ctr_din, ctr_din_valid = din, din_valid
+            ctr_dout_ready = ghash_ready
+        elif state == "S_TAG_SETUP":
+            ctr_iv, ctr_iv_valid = self.iv << 32 | 1, True
+        elif state == "S_TAG_CALC":
+            ctr_din, ctr_din_valid = self.ghash_result, True
+        ctr_din_ready = ctr.din_ready(ctr_dout_ready)
+
+        # GHASH control
+        gh_h, gh_h_valid = 0, False
+        gh_din, gh_din_valid, gh_last = 0, False, False
+        if state == "S_H_WAIT":
+            gh_h, gh_h_valid = ctr.dout, ctr.dout_valid
+        elif state in ("S_DATA_PROCESS", "S_DATA_LAST"):
+            if decrypt:
+                gh_din, gh_din_valid = self.din_reg, self.din_valid_reg
+            else:
+                gh_din, gh_din_valid = ctr.dout, ctr.dout_valid
+        elif state == "S_GHASH_LEN":
+            gh_din, gh_din_valid, gh_last = self.block_count << 7, True, True
+
+        # FSM
+        if state == "S_IDLE":
+            state_next = "S_H_SETUP" if key_valid else "S_IDLE"
+        elif state == "S_H_SETUP":
+            state_next = "S_H_CALC"
+        elif state == "S_H_CALC":
+            state_next = "S_H_WAIT" if ctr_din_ready else "S_H_CALC"
+        elif state == "S_H_WAIT":
+            state_next = "S_DATA_SETUP" if ctr.dout_valid else "S_H_WAIT"
+        elif state == "S_DATA_SETUP":
+            state_next = "S_DATA_PROCESS" if self.iv_cfg_done else "S_DATA_SETUP"
+        elif state == "S_DATA_PROCESS":
+            state_next = "S_DATA_LAST" if din_last and accepted else "S_DATA_PROCESS"
+        elif state == "S_DATA_LAST":
+            state_next = "S_GHASH_LEN" if ghash_ready else "S_DATA_LAST"
+        elif state == "S_GHASH_LEN":
+            state_next = "S_GHASH_LEN_WAIT"
+        elif state == "S_GHASH_LEN_WAIT":
+            state_next = "S_TAG_SETUP" if ghash.dout_valid else "S_GHASH_LEN_WAIT"
+        elif state == "S_TAG_SETUP":
+            state_next = "S_TAG_CALC"
+        elif state == "S_TAG_CALC":
+            state_next = "S_DONE" if ctr_din_ready else "S_TAG_CALC"
+        else:
+            state_next = "S_IDLE"
+
+        if iv_valid:
+            self.iv = iv
+            self.iv_cfg_done = True
+
+        if state == "S_IDLE":
+            self.block_count = 0
+        elif accepted:
+            self.block_count += 1
+
+        if ghash.dout_valid:
+            self.ghash_result = ghash.dout
+
+        if state in ("S_DATA_PROCESS", "S_DATA_LAST"):
+            self.din_valid_reg = din_valid and din != self.din_reg
+            self.din_reg = din
+
+        ghash.tick(gh_din, gh_din_valid, gh_last, gh_h, gh_h_valid)
+        ctr.tick(ctr_key, ctr_key_valid, ctr_iv, ctr_iv_valid, ctr_din, ctr_din_valid,
+                 ctr_dout_ready)  # fmt: skip
+        self.state = state_next
+
+
+class Report(NamedTuple):
+    output: bytes
+    tag: bytes  # empty for CTR
+    cycles: int  # from key_valid_i to the last output
+    data_cycles: int  # from the first to the last accepted input block
+    blocks_per_cycle: float  # sustained input rate over data_cycles
+    fill_cycles: int  # from key_valid_i to the first accepted input block
+    stall_cycles: int  # cycles with din_valid_i high and din_ready_o low, after fill
+    fifo_peak: int  # highest GHASH FIFO occupancy (keystream FIFO for CTR)
+    state_cycles: dict  # cycles spent per aes_gcm.sv state (empty for CTR)
+    matches: bool  # output and tag equal the Python reference
+
+
+def _blocks(data: bytes):
+    if not data or len(data) % 16:
+        raise ValueError("The RTL processes a non-empty whole number of 16-byte blocks.")
+
+    return [int.from_bytes(data[i : i + 16], "big") for i in range(0, len(data), 16)]
+
+
+def _pattern(pattern):
+    """Infinite iterator of bools from None (always on) or a repeating sequence."""
+
+    if pattern is None:
+        return cycle((True,))
+    return cycle(bool(int(p)) if isinstance(p, str) else bool(p) for p in pattern)
+
+
+def _report(outputs, tag, n, first, last, end, stalls, fifo_peak, state_cycles, matches):
+    data_cycles = last - first + 1
+    return Report(
+        output=b"".join(x.to_bytes(16, "big") for x in outputs),
+        tag=tag,
+        cycles=end + 1,
+        data_cycles=data_cycles,
+        blocks_per_cycle=n / data_cycles,
+        fill_cycles=first,
+        stall_cycles=stalls,
+        fifo_peak=fifo_peak,
+        state_cycles=state_cycles,
+        matches=matches,
+    )
+
+
+def simulate_ctr(key: bytes, iv: bytes, data: bytes, ready_pattern=None, valid_pattern=None,
+                 fifo_depth=2, max_cycles=None, check=True) -> Report:  # fmt: skip
+    """Run aes_ctr.sv over data, key and IV presented on cycle 0 like its testbench.
+
+    ready_pattern drives dout_ready_i and valid_pattern din_valid_i, one entry per cycle,
+    repeated (e.g. "1101"); None holds the signal high.
+    """
+
+    blocks = _blocks(data)
+    n = len(blocks)
+    core = AESCTRCore(len(key) * 8, fifo_depth)
+    k, v = int.from_bytes(key, "big"), int.from_bytes(iv, "big")
+    ready, valid = _pattern(ready_pattern), _pattern(valid_pattern)
+    max_cycles = max_cycles or 1000 + 100 * n
+
+    outputs = []
+    i = 0
+    first = last = None
+    stalls = 0
+    for t in range(max_cycles):
+        if core.dout_valid:
+            outputs.append(core.dout)
+            if len(outputs) == n:
+                break
+
+        dout_ready = next(ready)
+        din_valid = i < n and next(valid)
+        din = blocks[i] if i < n else 0  # held while din_valid_i is low
+        accepted = din_valid and core.din_ready(dout_ready)
+        if accepted:
+            first = t if first is None else first
+            last = t
+        elif din_valid and first is not None:
+            stalls += 1
+
+        core.tick(k, t == 0, v, t == 0, din, din_valid, dout_ready)
+        i += accepted
+    else:
+        raise RuntimeError(f"No result after {max_cycles} cycles.")
+
+    report = _report(outputs, b"", n, first, last, t, stalls, core.fifo.peak, {}, None)
+    if check:
+        expected = ctr_xor(AES(key), iv, data, bits=32)  # inc #(.s(32))
+        report = report._replace(matches=report.output == expected)
+
+    return report
+
+
+def simulate_gcm(key: bytes, iv: bytes, data: bytes, decrypt=False, valid_pattern=None,
+                 ghash_fifo_depth=32, ctr_fifo_depth=2, mul_latency=4, max_cycles=None,
+                 check=True) -> Report:  # fmt: skip
+    """Run aes_gcm.sv over data (no AAD), key and IV presented on cycle 0 like its testbench.
+
+    valid_pattern drives din_valid_i, one entry per cycle, repeated (e.g. "1101"); None
+    holds it high. With check, output and tag are compared with AESGCM.
+    """
+
+    if len(iv) != 12:
+        raise ValueError("aes_gcm.sv takes a 96-bit IV.")
+
+    blocks = _blocks(data)
+    n = len(blocks)
+    core = AESGCMCore(len(key) * 8, ctr_fifo_depth, ghash_fifo_depth, mul_latency)
+    k, v = int.from_bytes(key, "big"), int.from_bytes(iv, "big")
+    valid = _pattern(valid_pattern)
+    max_cycles = max_cycles or 2000 + 100 * n
+
+    outputs = []
+    state_cycles = {}
+    i = 0
+    first = last = None
+    stalls = 0
+    for t in range(max_cycles):
+        state_cycles[core.state] = state_cycles.get(core.state, 0) + 1
+        if core.dout_valid:
+            outputs.append(core.dout)
+        if core.tag_valid:
+            break
+
+        din_valid = i < n and next(valid)
+        din = blocks[i] if i < n else 0  # held while din_valid_i is low
+        accepted = din_valid and core.din_ready
+        if accepted:
+            first = t if first is None else first
+            last = t
+        elif din_valid and first is not None:
+            stalls += 1
+
+        core.tick(decrypt, k, t == 0, v, t == 0, din, din_valid, i == n - 1)
+        i += accepted
+    else:
+        raise RuntimeError(f"No tag after {max_cycles} cycles.")
+
+    tag = core.tag.to_bytes(16, "big")
+    report = _report(outputs, tag, n, first, last, t, stalls, core.ghash.fifo.peak,
+                     state_cycles, None)  # fmt: skip
+    if check:
+        gcm = AESGCM(key, AES)
+        if decrypt:
+            expected = gcm._gctr(gcm._inc32(gcm._j0(iv)), data)
+            ok = report.output == expected and tag == gcm.encrypt(expected, iv, b"")[1]
+        else:
+            ok = (report.output, tag) == gcm.encrypt(data, iv, b"")
+        report = report._replace(matches=ok)
+
+    return report
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Cycle-level model of the AES RTL")
+    parser.add_argument("module", choices=["gcm", "ctr"])
+    parser.add_argument("--blocks", type=int, default=100, help="message length in blocks")
+    parser.add_argument("--key-bits", type=int, default=128, choices=sorted(PARAMS))
+    parser.add_argument("--decrypt", action="store_true")
+    parser.add_argument("--valid-pattern", help="din_valid_i per cycle, repeated (e.g. 1101)")
+    parser.add_argument("--ready-pattern", help="dout_ready_i per cycle, repeated (ctr only)")
+    parser.add_argument("--ghash-fifo-depth", type=int, default=32)
+    parser.add_argument("--ctr-fifo-depth", type=int, default=2)
+    parser.add_argument("--mul-latency", type=int, default=4)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    key = rng.randbytes(args.key_bits // 8)
+    data = rng.randbytes(16 * args.blocks)
+
+    if args.module == "gcm":
+        iv = rng.randbytes(12)
+        report = simulate_gcm(
+            key, iv, data, args.decrypt, args.valid_pattern,
+            args.ghash_fifo_depth, args.ctr_fifo_depth, args.mul_latency,
+        )  # fmt: skip
+    else:
+        iv = rng.randbytes(16)
+        report = simulate_ctr(key, iv, data, args.ready_pattern, args.valid_pattern,
+                              args.ctr_fifo_depth)  # fmt: skip
+
+    print(f"cycles:           {report.cycles}")
+    print(f"fill cycles:      {report.fill_cycles}")
+    print(f"data cycles:      {report.data_cycles}")
+    print(f"blocks/cycle:     {report.blocks_per_cycle:.3f}")
+    print(f"stall cycles:     {report.stall_cycles}")
+    print(f"FIFO peak:        {report.fifo_peak}")
+    for state, count in report.state_cycles.items():
+        print(f"  {state:18s}{count}")
+    print(f"matches reference: {report.matches}")
+
+    return 0 if report.matches else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,99 @@
+import random
+
+import pytest
+
+import aes_bitslice
+from aes import AES, INV_SBOX, SBOX
+from aes_bitslice import BitslicedAES
+from aes_gcm import AESGCM
+
+
+def test_bitsliced_sbox():
+    """Check the S-box circuits against SBOX and INV_SBOX on every byte value"""
+
+    data = bytes(range(256))
+    n = len(data) // 16
+    one = (1 << len(data)) - 1
+    planes = aes_bitslice._pack(data, n)
+
+    assert aes_bitslice._unpack(planes, n) == data
+    assert aes_bitslice._unpack(aes_bitslice._sub_bytes(planes, one), n) == bytes(SBOX)
+    assert aes_bitslice._unpack(aes_bitslice._inv_sub_bytes(planes, one), n) == bytes(INV_SBOX)
+
+
+def test_bitsliced_transpose():
+    """Bit j * n + b of plane k is bit k of byte j of block b"""
+
+    rng = random.Random(3)
+    for n in (1, 8, 24):
+        data = rng.randbytes(16 * n)
+        planes = aes_bitslice._pack(data, n)
+        for k, plane in enumerate(planes):
+            for j in range(16):
+                for b in range(n):
+                    assert plane >> (j * n + b) & 1 == data[16 * b + j] >> k & 1
+        assert aes_bitslice._unpack(planes, n) == data
+
+
+def test_bitsliced_aes():
+    """Test bitsliced AES with the example vectors from FIPS 197 Appendix C"""
+
+    plaintext = bytes.fromhex("00112233445566778899aabbccddeeff")
+    vectors = (
+        ("000102030405060708090a0b0c0d0e0f", "69c4e0d86a7b0430d8cdb78070b4c55a"),
+        ("000102030405060708090a0b0c0d0e0f1011121314151617", "dda97ca4864cdfe06eaf70a0ec0d7191"),
+        (
+            "000102030405060708090a0b0c0d0e0f101112131415161718191a1b1c1d1e1f",
+            "8ea2b7ca516745bfeafc49904b496089",
+        ),
+    )
+
+    for key, expected in vectors:
+        aes = BitslicedAES(bytes.fromhex(key))
+        ciphertext = aes.encrypt(plaintext)
+        assert ciphertext == bytes.fromhex(expected)
+        assert aes.decrypt(ciphertext) == plaintext
+
+        for buffer in (memoryview(bytes.fromhex(key)), bytearray.fromhex(key)):
+            assert BitslicedAES(buffer).encrypt(plaintext) == bytes.fromhex(expected)
+
+
+def test_bitsliced_aes_blocks(monkeypatch):
+    """Compare batched encryption against the reference, across batch boundaries"""
+
+    monkeypatch.setattr(aes_bitslice, "BATCH_BLOCKS", 8)
+    rng = random.Random(2)
+
+    for key_len in (16, 24, 32):
+        key = rng.randbytes(key_len)
+        ref = AES(key)
+        aes = BitslicedAES(key)
+        assert aes.rk == tuple(b"".join(ref.w[4 * r : 4 * r + 4]) for r in range(ref.Nr + 1))
+
+        for n in (0, 1, 8, 21):
+            data = rng.randbytes(16 * n)
+            expected = b"".join(ref.encrypt(data[i : i + 16]) for i in range(0, len(data), 16))
+
+            assert aes.encrypt_blocks(data) == expected
+            assert aes.decrypt_blocks(expected) == data
+
+    with pytest.raises(ValueError):
+        BitslicedAES(bytes(15))
+    with pytest.raises(ValueError):
+        aes.encrypt_blocks(bytes(17))
+    with pytest.raises(ValueError):
+        aes.encrypt(bytes(17))
+
+
+def test_bitsliced_aes_gcm():
+    """BitslicedAES plugs into AESGCM as the block cipher"""
+
+    rng = random.Random(3)
+    key = rng.randbytes(16)
+    iv = rng.randbytes(12)
+    plaintext = rng.randbytes(200)
+    aad = rng.randbytes(20)
+
+    c, t = AESGCM(key).encrypt(plaintext, iv, aad)
+    assert AESGCM(key, cipher=BitslicedAES).encrypt(plaintext, iv, aad) == (c, t)
+    assert AESGCM(key, cipher=BitslicedAES).decrypt(c, iv, aad, t) == plaintext
@@ -0,0 +1,105 @@
+import random
+from pathlib import Path
+
+import pytest
+
+from aes import AES
+from aes_ctr import AESCTR, advance, counter_blocks
+
+VECTORS = Path(__file__).parent / "test_aes_ctr"
+
+
+def _read_hex(path):
+    return bytes.fromhex("".join(path.read_text().split()))
+
+
+@pytest.mark.parametrize("key_size", [128, 192, 256])
+def test_aes_ctr(key_size):
+    """Test AES-CTR with the RTL testbench vectors (NIST SP 800-38A Appendix F.5)"""
+
+    vectors = VECTORS / f"aes{key_size}"
+    key = _read_hex(vectors / "key.hex")
+    iv = _read_hex(vectors / "iv.hex")
+    plaintext = _read_hex(vectors / "plaintext.hex")
+    ciphertext = _read_hex(vectors / "ciphertext.hex")
+
+    ctr = AESCTR(key, iv)
+    assert ctr.encrypt(plaintext) == ciphertext
+    assert ctr.decrypt(ciphertext) == plaintext
+
+
+def test_aes_ctr_seek():
+    """Test random access into the keystream against one-shot encryption"""
+
+    rng = random.Random(0)
+    key = rng.randbytes(16)
+    iv = rng.randbytes(16)
+    data = rng.randbytes(300)
+
+    ctr = AESCTR(key, iv)
+    expected = ctr.encrypt(data)
+
+    for _ in range(50):
+        start = rng.randrange(0, len(data))
+        end = rng.randrange(start, len(data) + 1)
+        ctr.seek(start)
+        assert ctr.update(data[start:end]) == expected[start:end]
+        assert ctr.tell() == end
+
+    ctr.seek(0)
+    assert b"".join(ctr.update(data[i : i + 7]) for i in range(0, len(data), 7)) == expected
+
+    with pytest.raises(ValueError):
+        ctr.seek(-1)
+
+
+@pytest.mark.parametrize("bits", [8, 32, 64, 96, 128])
+def test_aes_ctr_counter_width(bits):
+    """Test counter wraparound against per-block encryption with the reference cipher"""
+
+    rng = random.Random(bits)
+    key = rng.randbytes(16)
+    iv = bytes(8) + bytes.fromhex("fffffffffffffffe")
+    data = rng.randbytes(16 * 5)
+    ref = AES(key)
+
+    blocks = counter_blocks(iv, 5, bits)
+    assert blocks == b"".join(advance(iv, i, bits) for i in range(5))
+
+    expected = bytes(a ^ b for a, b in zip(data, b"".join(map(ref.encrypt, _split(blocks)))))
+    assert AESCTR(key, iv, counter_bits=bits).encrypt(data) == expected
+
+
+def _split(blocks):
+    return [blocks[i : i + 16] for i in range(0, len(blocks), 16)]
+
+
+def test_aes_ctr_invalid():
+    with pytest.raises(ValueError):
+        AESCTR(bytes(16), bytes(12))
+    with pytest.raises(ValueError):
+        AESCTR(bytes(16), bytes(16), counter_bits=0)
+
+
+def test_aes_ctr_into():
+    """Encrypt into a caller buffer and in place"""
+
+    rng = random.Random(5)
+    ctr = AESCTR(rng.randbytes(16), rng.randbytes(16))
+    data = rng.randbytes(100)
+    expected = ctr.encrypt(data)
+
+    out = bytearray(128)
+    ctr.encrypt_into(memoryview(data), out)
+    assert out[:100] == expected and out[100:] == bytes(28)
+
+    buf = bytearray(data)
+    ctr.encrypt_into(buf, buf)
+    assert buf == expected
+    ctr.decrypt_into(buf, buf)
+    assert buf == data
+
+    with pytest.raises(ValueError):
+        ctr.encrypt_into(data, bytearray(99))
+    with pytest.raises(TypeError):
+        ctr.encrypt_into(data, bytes(100))
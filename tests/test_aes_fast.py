@@ -0,0 +1,116 @@
+import os
+import random
+
+import pytest
+
+import aes_fast
+from aes import AES
+from aes_bitslice import BitslicedAES
+from aes_fast import FastAES
+
+
+def test_fast_aes():
+    """Test T-table AES with the example vectors from FIPS 197 Appendix C"""
+
+    plaintext = bytes.fromhex("00112233445566778899aabbccddeeff")
+
+    # AES-128
+    key = bytes.fromhex("000102030405060708090a0b0c0d0e0f")
+    aes = FastAES(key)
+    ciphertext = aes.encrypt(plaintext)
+    assert ciphertext == bytes.fromhex("69c4e0d86a7b0430d8cdb78070b4c55a")
+    assert aes.decrypt(ciphertext) == plaintext
+
+    # AES-192
+    key = bytes.fromhex("000102030405060708090a0b0c0d0e0f1011121314151617")
+    aes = FastAES(key)
+    ciphertext = aes.encrypt(plaintext)
+    assert ciphertext == bytes.fromhex("dda97ca4864cdfe06eaf70a0ec0d7191")
+    assert aes.decrypt(ciphertext) == plaintext
+
+    # AES-256
+    key = bytes.fromhex("000102030405060708090a0b0c0d0e0f101112131415161718191a1b1c1d1e1f")
+    aes = FastAES(key)
+    ciphertext = aes.encrypt(plaintext)
+    assert ciphertext == bytes.fromhex("8ea2b7ca516745bfeafc49904b496089")
+    assert aes.decrypt(ciphertext) == plaintext
+
+
+def test_fast_aes_matches_reference():
+    """Compare T-table AES against the reference implementation on random inputs"""
+
+    rng = random.Random(0)
+
+    for key_len in (16, 24, 32):
+        for _ in range(20):
+            key = rng.randbytes(key_len)
+            block = rng.randbytes(16)
+
+            ref = AES(key)
+            fast = FastAES(key)
+
+            assert fast.ek == tuple(int.from_bytes(w, "big") for w in ref.w)
+            assert fast.encrypt(block) == ref.encrypt(block)
+            assert fast.decrypt(block) == ref.decrypt(block)
+
+
+def test_fast_aes_invalid_length():
+    aes = FastAES(os.urandom(16))
+
+    for data in (b"", bytes(15), bytes(17)):
+        with pytest.raises(ValueError):
+            aes.encrypt(data)
+        with pytest.raises(ValueError):
+            aes.decrypt(data)
+
+
+def test_fast_aes_blocks():
+    """Compare batched encryption against single-block calls, on both sides of the NumPy cutoff"""
+
+    rng = random.Random(1)
+
+    for key_len in (16, 24, 32):
+        key = rng.randbytes(key_len)
+        ref = AES(key)
+        fast = FastAES(key)
+
+        for n in (0, 1, 7, 8, 33):
+            data = rng.randbytes(16 * n)
+            expected = b"".join(ref.encrypt(data[i : i + 16]) for i in range(0, len(data), 16))
+
+            assert fast.encrypt_blocks(data) == expected
+            assert ref.encrypt_blocks(data) == expected
+            assert fast.decrypt_blocks(expected) == data
+            assert ref.decrypt_blocks(expected) == data
+
+    with pytest.raises(ValueError):
+        fast.encrypt_blocks(bytes(17))
+    with pytest.raises(ValueError):
+        fast.decrypt_blocks(bytes(17))
+
+
+def test_fast_aes_buffers(monkeypatch):
+    """Accept any buffer-protocol input, and write into caller buffers"""
+
+    np = pytest.importorskip("numpy")
+    monkeypatch.setattr(aes_fast, "INTO_CHUNK_BLOCKS", 8)  # a NumPy chunk, then a short one
+    rng = random.Random(2)
+    key = rng.randbytes(16)
+    data = rng.randbytes(16 * 10)
+    expected = AES(key).encrypt_blocks(data)
+
+    for cipher in (AES, FastAES, BitslicedAES):
+        aes = cipher(key)
+        words = np.frombuffer(data, dtype=np.uint32).copy()  # 4 bytes per element
+        assert aes.encrypt(words[:4]) == expected[:16]
+        assert aes.encrypt_blocks(words) == expected
+        assert aes.encrypt_blocks(memoryview(data)[16:]) == expected[16:]
+
+        aes.encrypt_into(words, words)
+        assert words.tobytes() == expected
+        aes.decrypt_into(words, words)
+        assert words.tobytes() == data
+
+        out = bytearray(48)
+        aes.encrypt_into(data[:48], out)  # below NUMPY_MIN_BLOCKS: block by block
+        assert out == expected[:48]
@@ -0,0 +1,136 @@
+import asyncio
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import pytest
+
+from aes_gcm import AESGCM
+from aes_gcm_async import decrypt_stream, encrypt_stream
+
+
+class _Sink:
+    """StreamWriter stand-in collecting what is written."""
+
+    def __init__(self):
+        self.data = bytearray()
+
+    def write(self, data):
+        self.data += data
+
+    async def drain(self):
+        pass
+
+
+def _reader(data: bytes) -> asyncio.StreamReader:
+    reader = asyncio.StreamReader()
+    reader.feed_data(data)
+    reader.feed_eof()
+    return reader
+
+
+class _Recording(ThreadPoolExecutor):
+    """Thread pool that records the name of every function submitted."""
+
+    def __init__(self):
+        super().__init__(max_workers=1)
+        self.names = []
+
+    def submit(self, fn, *args):
+        self.names.append(fn.__name__)
+        return super().submit(fn, *args)
+
+
+async def _pieces(data: bytes, rng):
+    i = 0
+    while i < len(data):
+        n = rng.randrange(1, 100)
+        yield data[i : i + n]
+        i += n
+
+
+def test_aes_gcm_async_stream():
+    """Stream through a StreamReader and an async iterator, matching AESGCM.encrypt"""
+
+    rng = random.Random(0)
+    gcm = AESGCM(rng.randbytes(16))
+    options = {"chunk_size": 48, "max_in_flight": 2}
+
+    async def run():
+        for length in (0, 15, 48, 1000):
+            iv = rng.randbytes(12)
+            aad = rng.randbytes(rng.randrange(40))
+            plaintext = rng.randbytes(length)
+            c, t = gcm.encrypt(plaintext, iv, aad)
+
+            sink = _Sink()
+            assert await encrypt_stream(gcm, iv, _reader(plaintext), sink, aad, **options) == t
+            assert sink.data == c
+
+            sink = _Sink()
+            await encrypt_stream(gcm, iv, _pieces(plaintext, rng), sink, aad, True, **options)
+            assert sink.data == c + t
+
+            sink = _Sink()
+            await decrypt_stream(gcm, iv, _pieces(c, rng), sink, t, aad, **options)
+            assert sink.data == plaintext
+
+            sink = _Sink()
+            await decrypt_stream(gcm, iv, _reader(c + t), sink, aad=aad, **options)
+            assert sink.data == plaintext
+
+            with pytest.raises(ValueError):
+                await decrypt_stream(gcm, iv, _reader(c + t), _Sink(), aad=aad + b"x", **options)
+        with pytest.raises(ValueError):
+            await decrypt_stream(gcm, iv, _reader(bytes(5)), _Sink())
+
+    asyncio.run(run())
+
+
+def test_aes_gcm_async_executor():
+    """Offload to a process pool while another coroutine keeps running"""
+
+    rng = random.Random(1)
+    gcm = AESGCM(rng.randbytes(32))
+    iv = rng.randbytes(12)
+    plaintext = rng.randbytes(1 << 16)
+    c, t = gcm.encrypt(plaintext, iv, b"")
+
+    async def ticker(ticks):
+        while True:
+            ticks.append(time.perf_counter())
+            await asyncio.sleep(0)
+
+    async def run(executor):
+        ticks = []
+        task = asyncio.create_task(ticker(ticks))
+        sink = _Sink()
+        options = {"executor": executor, "chunk_size": 4096}
+        tag = await encrypt_stream(gcm, iv, _reader(plaintext), sink, **options)
+        task.cancel()
+        return bytes(sink.data), tag, len(ticks)
+
+    with ProcessPoolExecutor(max_workers=2) as pool:
+        ciphertext, tag, ticks = asyncio.run(run(pool))
+    assert (ciphertext, tag) == (c, t)
+    assert ticks > 1
+
+
+@pytest.mark.parametrize("length", [0, 100])
+def test_aes_gcm_async_aad_offloaded(length):
+    """The AAD GHASH runs in the executor, not on the event loop"""
+
+    rng = random.Random(2)
+    gcm = AESGCM(rng.randbytes(16))
+    iv, aad, plaintext = rng.randbytes(12), rng.randbytes(5000), rng.randbytes(length)
+    c, t = gcm.encrypt(plaintext, iv, aad)
+
+    async def run(executor):
+        sink = _Sink()
+        options = {"executor": executor, "chunk_size": 48}
+        tag = await encrypt_stream(gcm, iv, _reader(plaintext), sink, aad, **options)
+        return bytes(sink.data), tag
+
+    with _Recording() as executor:
+        assert asyncio.run(run(executor)) == (c, t)
+    assert executor.names == ["_ghash_aad"] + ["_crypt_chunk"] * -(-length // 48)
@@ -1,3 +1,11 @@
+import random
+
+import pytest
+
+import aes_gcm
+import instrument
+from aes import AES
+from aes_fast import FastAES
 from aes_gcm import AESGCM
 
 
@@ -121,3 +129,246 @@ def test_aes_gctr():
     )
     ciphertext = aesgcm._gctr(icb, plaintext)
     assert ciphertext == expected_ciphertext
+
+
+def test_aes_gctr_chunks(monkeypatch):
+    """Test GCTR across keystream chunks and inc32 wraparound against the reference cipher"""
+
+    monkeypatch.setattr(aes_gcm, "GCTR_CHUNK_BLOCKS", 3)
+
+    rng = random.Random(0)
+    key = rng.randbytes(16)
+    ref = AES(key)
+    aesgcm = AESGCM(key)
+
+    icb = rng.randbytes(12) + bytes.fromhex("fffffffe")
+    for length in (0, 1, 16, 47, 48, 49, 100):
+        x = rng.randbytes(length)
+
+        expected = bytearray()
+        cb = icb
+        for i in range(0, length, 16):
+            expected += bytes(a ^ b for a, b in zip(x[i : i + 16], ref.encrypt(cb)))
+            cb = aesgcm._inc32(cb)
+
+        assert aesgcm._gctr(icb, x) == expected
+
+
+def _split(data, rng):
+    """Cut data into random-sized pieces, including empty ones."""
+
+    pieces = []
+    i = 0
+    while i < len(data):
+        n = rng.randrange(0, 40)
+        pieces.append(data[i : i + n])
+        i += n
+    return pieces
+
+
+def test_aes_gcm_streaming():
+    """Test incremental encryption/decryption against the one-shot API"""
+
+    rng = random.Random(1)
+
+    for key_len in (16, 24, 32):
+        key = rng.randbytes(key_len)
+        aesgcm = AESGCM(key)
+
+        for pt_len, aad_len in ((0, 0), (0, 20), (16, 0), (60, 17), (200, 64)):
+            iv = rng.randbytes(12)
+            plaintext = rng.randbytes(pt_len)
+            aad = rng.randbytes(aad_len)
+            c, t = aesgcm.encrypt(plaintext, iv, aad)
+
+            enc = aesgcm.encryptor(iv)
+            for piece in _split(aad, rng):
+                enc.update_aad(piece)
+            assert b"".join(enc.update(piece) for piece in _split(plaintext, rng)) == c
+            assert enc.finalize() == t
+
+            dec = aesgcm.decryptor(iv)
+            for piece in _split(aad, rng):
+                dec.update_aad(piece)
+            assert b"".join(dec.update(piece) for piece in _split(c, rng)) == plaintext
+            dec.finalize_and_verify(t)
+
+
+def test_aes_gcm_streaming_errors():
+    aesgcm = AESGCM(bytes(16))
+    iv = bytes(12)
+    c, t = aesgcm.encrypt(b"payload", iv, b"header")
+
+    enc = aesgcm.encryptor(iv)
+    enc.update(b"payload")
+    with pytest.raises(ValueError):
+        enc.update_aad(b"header")
+    enc.finalize()
+    with pytest.raises(ValueError):
+        enc.update(b"more")
+    with pytest.raises(ValueError):
+        enc.finalize()
+
+    dec = aesgcm.decryptor(iv)
+    dec.update_aad(b"header")
+    dec.update(c)
+    with pytest.raises(ValueError):
+        dec.finalize_and_verify(bytes(16))
+
+    dec = aesgcm.decryptor(iv)
+    dec.update_aad(b"header")
+    dec.update(c)
+    with pytest.raises(ValueError):
+        dec.finalize_and_verify(t[:12])
+
+
+@pytest.mark.parametrize("count", [1, 30])
+def test_aes_gcm_many(count):
+    """Batched encryption matches one-at-a-time encryption, across a counter wrap"""
+
+    rng = random.Random(6)
+    aesgcm = AESGCM(rng.randbytes(16))
+    messages = [
+        (rng.randbytes(12), rng.randbytes(rng.randrange(100)), rng.randbytes(rng.randrange(40)))
+        for _ in range(count)
+    ]
+    messages[0] = (bytes(8) + b"\xff\xff\xff\xfd", rng.randbytes(64), b"")  # counter wraps
+
+    results = aesgcm.encrypt_many(messages)
+    assert results == [aesgcm.encrypt(p, iv, aad) for iv, p, aad in messages]
+
+    batch = [(iv, c, aad, t) for (iv, _, aad), (c, t) in zip(messages, results)]
+    batch[-1] = batch[-1][:3] + (bytes(16),)
+    plaintexts = aesgcm.decrypt_many(batch)
+    assert plaintexts[:-1] == [p for _, p, _ in messages[:-1]]
+    assert plaintexts[-1] is None
+
+    batch.insert(0, (b"",) + batch[0][1:])  # an empty IV fails only its own slot
+    assert aesgcm.decrypt_many(batch) == [None] + plaintexts
+
+
+def test_aes_gcm_verify_before_decrypt():
+    """A forged message is rejected after GHASH and the tag block, with no keystream"""
+
+    rng = random.Random(7)
+    aesgcm = AESGCM(rng.randbytes(16))
+    iv = rng.randbytes(12)
+    aad = rng.randbytes(20)
+    c, t = aesgcm.encrypt(rng.randbytes(100), iv, aad)
+
+    assert aesgcm.verify(c, iv, aad, t)
+    assert not aesgcm.verify(c, iv, aad + b"x", t)
+    assert not aesgcm.verify(c, iv, aad, t[:12])
+
+    stats = instrument.enable()
+    try:
+        with pytest.raises(ValueError):
+            aesgcm.decrypt(c, iv, aad, bytes(16))
+        assert stats.block_encryptions == 1  # E_K(J0) only
+        assert stats.stage_seconds["gctr"] == 0
+
+        aesgcm.decrypt(c, iv, aad, t)
+        assert stats.block_encryptions == 1 + 1 + len(c) // 16 + 1
+    finally:
+        instrument.disable()
+
+
+def test_aes_gcm_into():
+    """Encrypt and decrypt into caller buffers and in place, from any buffer type"""
+
+    rng = random.Random(8)
+    aesgcm = AESGCM(rng.randbytes(16))
+    iv = rng.randbytes(12)
+    aad = rng.randbytes(20)
+    plaintext = rng.randbytes(100)
+    c, t = aesgcm.encrypt(plaintext, iv, aad)
+
+    assert aesgcm.encrypt(memoryview(plaintext), iv, bytearray(aad)) == (c, t)
+    assert aesgcm.decrypt(bytearray(c), iv, memoryview(aad), t) == plaintext
+
+    out = bytearray(100)
+    assert aesgcm.encrypt_into(plaintext, out, iv, aad) == t
+    assert out == c
+
+    buf = bytearray(plaintext)
+    assert aesgcm.encrypt_into(buf, buf, iv, aad) == t
+    assert buf == c
+
+    with pytest.raises(ValueError):
+        aesgcm.decrypt_into(buf, buf, iv, aad, bytes(16))
+    assert buf == c  # untouched on a tag mismatch
+
+    aesgcm.decrypt_into(buf, buf, iv, aad, t)
+    assert buf == plaintext
+
+    with pytest.raises(TypeError):
+        aesgcm.encrypt_into(plaintext, bytes(c), iv, aad)
+
+
+def test_aes_gmac():
+    """GMAC tags equal GCM tags with an empty plaintext, one-shot and incremental"""
+
+    rng = random.Random(9)
+
+    for key_len in (16, 32):
+        aesgcm = AESGCM(rng.randbytes(key_len))
+        for aad_len in (0, 16, 20, 1000):
+            iv = rng.randbytes(12)
+            aad = rng.randbytes(aad_len)
+            _, t = aesgcm.encrypt(b"", iv, aad)
+
+            assert aesgcm.mac(iv, aad) == t
+            assert aesgcm.verify_mac(iv, aad, t)
+            assert not aesgcm.verify_mac(iv, aad + b"x", t)
+            assert not aesgcm.verify_mac(iv, aad, t[:8])
+
+            gmac = aesgcm.gmac(iv)
+            for piece in _split(aad, rng):
+                gmac.update(piece)
+            assert gmac.finalize() == t
+
+            gmac = aesgcm.gmac(iv)
+            gmac.update(aad)
+            gmac.finalize_and_verify(t)
+
+            gmac = aesgcm.gmac(iv)
+            with pytest.raises(ValueError):
+                gmac.finalize_and_verify(bytes(16))
+            with pytest.raises(ValueError):
+                gmac.update(aad)
+
+
+def test_aes_gcm_iv_and_tag_lengths():
+    """Non-96-bit IVs (Test Case 5 of the GCM test vectors) and truncated tags"""
+
+    key = bytes.fromhex("feffe9928665731c6d6a8f9467308308")
+    plaintext = bytes.fromhex(
+        "d9313225f88406e5a55909c5aff5269a"
+        "86a7a9531534f7da2e4c303d8a318a72"
+        "1c3c0c95956809532fcf0e2449a6b525"
+        "b16aedf5aa0de657ba637b39"
+    )
+    aad = bytes.fromhex("feedfacedeadbeeffeedfacedeadbeefabaddad2")
+    iv = bytes.fromhex("cafebabefacedbad")
+    c = bytes.fromhex(
+        "61353b4c2806934a777ff51fa22a4755"
+        "699b2a714fcdc6f83766e5f97b6c7423"
+        "73806900e49f24b22b097544d4896b42"
+        "4989b5e1ebac0f07c23f4598"
+    )
+    t = bytes.fromhex("3612d2e79e3b0785561be14aaca2fccb")
+
+    for cipher in (FastAES, AES):
+        assert AESGCM(key, cipher).encrypt(plaintext, iv, aad) == (c, t)
+
+    for tag_length in aes_gcm.TAG_LENGTHS:
+        aesgcm = AESGCM(key, tag_length=tag_length)
+        assert aesgcm.encrypt(plaintext, iv, aad) == (c, t[:tag_length])
+        assert aesgcm.decrypt(c, iv, aad, t[:tag_length]) == plaintext
+        with pytest.raises(ValueError):
+            aesgcm.decrypt(c, iv, aad, t[: tag_length - 1])
+
+    with pytest.raises(ValueError):
+        AESGCM(key, tag_length=10)
+    with pytest.raises(ValueError):
+        AESGCM(key).encrypt(plaintext, b"", aad)
@@ -0,0 +1,184 @@
+import random
+
+import pytest
+
+import cavp
+from aes import AES
+from aes_bitslice import BitslicedAES
+from aes_fast import FastAES
+
+ECB_RSP = """\
+# CAVS 11.1
+# Config info for aes_values
+# AESVS GFSbox test data for ECB
+
+[ENCRYPT]
+
+COUNT = 0
+KEY = 00000000000000000000000000000000
+PLAINTEXT = f34481ec3cc627bacd5dc3fb08f273e6
+CIPHERTEXT = 0336763e966d92595a567cc9ce537f5e
+
+[DECRYPT]
+
+COUNT = 0
+KEY = 000102030405060708090a0b0c0d0e0f
+CIPHERTEXT = 69c4e0d86a7b0430d8cdb78070b4c55a
+PLAINTEXT = 00112233445566778899aabbccddeeff
+"""
+
+CTR_RSP = """\
+[ENCRYPT]
+
+COUNT = 0
+KEY = 2b7e151628aed2a6abf7158809cf4f3c
+IV = f0f1f2f3f4f5f6f7f8f9fafbfcfdfeff
+PLAINTEXT = 6bc1bee22e409f96e93d7e117393172aae2d8a571e03ac9c9eb76fac45af8e51
+CIPHERTEXT = 874d6191b620e3261bef6864990db6ce9806f66b7970fdff8617187bb9fffdff
+"""
+
+GCM_RSP = """\
+[Keylen = 128]
+[IVlen = 96]
+[PTlen = 0]
+[AADlen = 0]
+[Taglen = 128]
+
+Count = 0
+Key = 11754cd72aec309bf52f7687212e8957
+IV = 3c819d9a9bed087615030b65
+PT =
+AAD =
+CT =
+Tag = 250327c674aaf477aef2675748cf6971
+
+[Keylen = 128]
+[IVlen = 64]
+[PTlen = 480]
+[AADlen = 160]
+[Taglen = 128]
+
+Count = 0
+Key = feffe9928665731c6d6a8f9467308308
+IV = cafebabefacedbad
+PT = d9313225f88406e5a55909c5aff5269a86a7a9531534f7da2e4c303d8a318a721c3c0c95956809532fcf0e2449a6b525b16aedf5aa0de657ba637b39
+AAD = feedfacedeadbeeffeedfacedeadbeefabaddad2
+CT = 61353b4c2806934a777ff51fa22a4755699b2a714fcdc6f83766e5f97b6c742373806900e49f24b22b097544d4896b424989b5e1ebac0f07c23f4598
+Tag = 3612d2e79e3b0785561be14aaca2fccb
+
+Count = 1
+Key = feffe9928665731c6d6a8f9467308308
+IV = cafebabefacedbad
+CT = 61353b4c2806934a777ff51fa22a4755699b2a714fcdc6f83766e5f97b6c742373806900e49f24b22b097544d4896b424989b5e1ebac0f07c23f4598
+AAD = feedfacedeadbeeffeedfacedeadbeefabaddad2
+Tag = 3612d2e79e3b0785561be14aaca2fccc
+FAIL
+"""
+
+# GCM spec test case 6 (60-byte IV), with the published tag truncated to 96 bits
+EXT_IV_RSP = """\
+[Keylen = 128]
+[IVlen = 480]
+[PTlen = 480]
+[AADlen = 160]
+[Taglen = 96]
+
+Count = 0
+Key = feffe9928665731c6d6a8f9467308308
+IV = 9313225df88406e555909c5aff5269aa6a7a9538534f7da1e4c303d2a318a728c3c0c95156809539fcf0e2429a6b525416aedbf5a0de6a57a637b39b
+PT = d9313225f88406e5a55909c5aff5269a86a7a9531534f7da2e4c303d8a318a721c3c0c95956809532fcf0e2449a6b525b16aedf5aa0de657ba637b39
+AAD = feedfacedeadbeeffeedfacedeadbeefabaddad2
+CT = 8ce24998625615b603a033aca13fb894be9112a5c3a211a8ba262a3cca7e2ca701e4a9a4fba43c90ccdcb281d48c7c6fd62875d2aca417034c34aee5
+Tag = 619cc5aefffe0bfa462af43c
+"""
+
+
+class _BrokenAES(FastAES):
+    """Decrypts batches of more than one block wrongly."""
+
+    def decrypt_blocks(self, data):
+        out = super().decrypt_blocks(data)
+        return out[:16] + bytes(len(out) - 16) if len(out) > 16 else out
+
+
+def _truncated_tag_rsp(rng, count):
+    """gcmEncryptExtIV-style cases with short tags and IVs, made by the SP 800-38D reference."""
+
+    lines = []
+    for i in range(count):
+        key, iv = rng.randbytes(32), rng.randbytes(rng.randrange(1, 40))
+        p, a = rng.randbytes(rng.randrange(0, 50)), rng.randbytes(rng.randrange(0, 30))
+        t = rng.choice((4, 8, 12, 13, 14, 15))
+        c, tag = cavp._reference_gcm(key, iv, p, a, t)
+        fields = (("Key", key), ("IV", iv), ("PT", p), ("AAD", a), ("CT", c), ("Tag", tag))
+        lines += [f"Count = {i}", *(f"{n} = {v.hex()}" for n, v in fields), ""]
+
+    return "\n".join(lines)
+
+
+def test_read_rsp():
+    cases = list(cavp.read_rsp(GCM_RSP.splitlines(), "gcm.rsp"))
+    assert [location for location, _, _ in cases] == ["gcm.rsp:7", "gcm.rsp:21", "gcm.rsp:29"]
+
+    _, section, fields = cases[1]
+    assert section["IVLEN"] == "64" and section["TAGLEN"] == "128"
+    assert fields["IV"] == bytes.fromhex("cafebabefacedbad")
+    assert len(fields["PLAINTEXT"]) == 60 and "FAIL" not in fields
+    assert "FAIL" in cases[2][2] and "PLAINTEXT" not in cases[2][2]
+
+    assert cavp.file_mode("vectors/ECBMCT128.rsp") == "ecb"
+    with pytest.raises(ValueError):
+        cavp.file_mode("CBCGFSbox128.rsp")
+
+
+@pytest.mark.parametrize("engine", [AES, FastAES, BitslicedAES])
+def test_run(tmp_path, engine):
+    """Known ECB, CTR and GCM vectors pass, with variable IV and tag lengths and forgeries"""
+
+    rng = random.Random(0)
+    key, p = rng.randbytes(24), rng.randbytes(16)
+    c = p
+    for _ in range(cavp.MCT_ITERATIONS):
+        c = AES(key).encrypt(c)
+    fields = f"KEY = {key.hex()}\nPLAINTEXT = {p.hex()}\nCIPHERTEXT = {c.hex()}\n"
+    mct = f"[ENCRYPT]\n\nCOUNT = 0\n{fields}"
+
+    files = {
+        "ECBGFSbox128.rsp": ECB_RSP,
+        "ECBMCT192.rsp": mct,
+        "CTR128.rsp": CTR_RSP,
+        "gcmDecrypt128.rsp": GCM_RSP,
+        "gcmEncryptExtIV128.rsp": EXT_IV_RSP,
+        "gcmEncryptExtIV256.rsp": _truncated_tag_rsp(rng, 20),
+    }
+    for name, text in files.items():
+        (tmp_path / name).write_text(text)
+
+    paths = [tmp_path / name for name in files]
+    assert cavp.run(paths, engine) == (2 + 1 + 1 + 3 + 1 + 20, [])
+
+
+def test_run_failures(tmp_path):
+    """Mismatches are reported per case, in a process pool too"""
+
+    path = tmp_path / "gcmDecrypt128.rsp"
+    path.write_text(GCM_RSP.replace("FAIL\n", "PT = 00\n"))
+    failures = [(f"{path}:29", "authentic message rejected")]
+    assert cavp.run([path], FastAES, workers=2) == (3, failures)
+
+    path = tmp_path / "ECBGFSbox128.rsp"
+    path.write_text(ECB_RSP.replace("PLAINTEXT = 0011", "PLAINTEXT = 0111"))
+    assert cavp.run([path], FastAES) == (2, [(f"{path}:14", "ciphertext differs")])
+
+
+def test_fuzz():
+    """Engines agree with the reference; a broken one is caught at its first bad case"""
+
+    assert cavp.fuzz(FastAES, cases=200, seed=1, workers=2) is None
+    assert cavp.fuzz(BitslicedAES, cases=50, seed=2) is None
+
+    index, mode, key, params, message = cavp.fuzz(_BrokenAES, cases=200, seed=1)
+    assert (mode, message) == ("ecb", "decrypt_blocks differs")
+    assert cavp.fuzz_case(1, index) == (mode, key, params)
+    for i in range(index):
+        assert cavp.check_fuzz_case(_BrokenAES, *cavp.fuzz_case(1, i)) is None
@@ -0,0 +1,85 @@
+import random
+
+import pytest
+
+import file_crypt
+from aes_ctr import AESCTR
+from aes_gcm import AESGCM
+
+
+@pytest.mark.parametrize("size", [0, 1, 100, 4096])
+def test_gcm_file(tmp_path, size):
+    rng = random.Random(size)
+    key = rng.randbytes(16)
+    iv = rng.randbytes(12)
+    aad = rng.randbytes(10)
+    data = rng.randbytes(size)
+
+    src = tmp_path / "plain.bin"
+    enc = tmp_path / "cipher.bin"
+    dec = tmp_path / "decrypted.bin"
+    src.write_bytes(data)
+
+    tag = file_crypt.gcm_encrypt_file(key, iv, src, enc, aad, chunk_size=48)
+    assert (enc.read_bytes(), tag) == AESGCM(key).encrypt(data, iv, aad)
+
+    file_crypt.gcm_decrypt_file(key, iv, enc, dec, tag, aad, chunk_size=48)
+    assert dec.read_bytes() == data
+
+    with pytest.raises(ValueError):
+        file_crypt.gcm_decrypt_file(key, iv, enc, tmp_path / "." / "cipher.bin", tag, aad)
+    assert enc.exists() and dec.read_bytes() == data
+
+    forged = tmp_path / "forged.bin"
+    with pytest.raises(ValueError):
+        file_crypt.gcm_decrypt_file(key, iv, enc, forged, bytes(16), aad)
+    assert not forged.exists()  # rejected before the output is opened
+
+
+def test_cli(tmp_path):
+    rng = random.Random(0)
+    key = rng.randbytes(32)
+    data = rng.randbytes(1000)
+
+    src = tmp_path / "plain.bin"
+    enc = tmp_path / "cipher.bin"
+    dec = tmp_path / "decrypted.bin"
+    src.write_bytes(data)
+
+    # GCM, tag written to and read from the sidecar
+    iv = rng.randbytes(12)
+    args = ["--key", key.hex(), "--iv", iv.hex(), "--aad", "abcd"]
+    assert file_crypt.main(["encrypt", str(src), str(enc), *args], "gcm") == 0
+    c, t = AESGCM(key).encrypt(data, iv, bytes.fromhex("abcd"))
+    assert enc.read_bytes() == c
+    assert (tmp_path / "cipher.bin.tag").read_text().strip() == t.hex()
+
+    assert file_crypt.main(["decrypt", str(enc), str(dec), *args], "gcm") == 0
+    assert dec.read_bytes() == data
+
+    assert file_crypt.main(["decrypt", str(enc), str(dec), *args, "--tag", "00" * 16], "gcm") == 1
+
+    # CTR
+    iv = rng.randbytes(16)
+    args = ["--key", key.hex(), "--iv", iv.hex(), "--chunk-size", "64"]
+    assert file_crypt.main(["encrypt", str(src), str(enc), *args], "ctr") == 0
+    assert enc.read_bytes() == AESCTR(key, iv).encrypt(data)
+    assert file_crypt.main(["decrypt", str(enc), str(dec), *args], "ctr") == 0
+    assert dec.read_bytes() == data
+
+    # Malformed hex and missing files are reported, not raised
+    missing = str(tmp_path / "missing")
+    iv_args = ["--iv", iv.hex()]
+    for args in (
+        ["--key", "zz", *iv_args],
+        ["--key", key.hex(), "--iv", "xyz"],
+        ["--key-file", missing, *iv_args],
+        ["--key", key.hex(), *iv_args, "--tag-file", missing],
+    ):
+        assert file_crypt.main(["decrypt", str(enc), str(dec), *args], "gcm") == 1
+    assert file_crypt.main(["encrypt", missing, str(enc), "--key", key.hex(), *iv_args], "ctr") == 1
+
+    # INPUT and OUTPUT naming one file is refused before the output is truncated
+    same = str(tmp_path / "." / "cipher.bin")
+    assert file_crypt.main(["decrypt", str(enc), same, "--key", key.hex(), *iv_args], "ctr") == 1
+    assert enc.read_bytes() == AESCTR(key, iv).encrypt(data)
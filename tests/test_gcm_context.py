@@ -0,0 +1,65 @@
+import random
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from aes import AES
+from aes_fast import SCHEDULE_CACHE
+from aes_gcm import H_CACHE, AESGCM
+from gcm_context import attach_context, context_size, export_context, import_context, share_context
+
+
+def _encrypt_attached(name, plaintext, iv, aad):
+    return attach_context(name).encrypt(plaintext, iv, aad)
+
+
+@pytest.mark.parametrize("key_bits", [128, 192, 256])
+@pytest.mark.parametrize("table_bits, aggregate", [(8, 0), (4, 0), (8, 3)])
+def test_context_round_trip(key_bits, table_bits, aggregate):
+    """An imported context encrypts like the original and exports to the same bytes"""
+
+    rng = random.Random(key_bits + table_bits + aggregate)
+    key = rng.randbytes(key_bits // 8)
+    gcm = AESGCM(key, table_bits=table_bits, aggregate=aggregate)
+    data = export_context(gcm)
+    assert len(data) == context_size(len(key), table_bits, aggregate)
+
+    H_CACHE.clear()
+    SCHEDULE_CACHE.clear()
+    other = import_context(bytearray(data))
+    assert other.ciph.key == key
+    assert export_context(other) == data
+
+    iv, aad, plaintext = rng.randbytes(12), rng.randbytes(20), rng.randbytes(100)
+    C, T = gcm.encrypt(plaintext, iv, aad)
+    assert other.encrypt(plaintext, iv, aad) == (C, T)
+    assert other.decrypt(C, iv, aad, T) == plaintext
+    assert AESGCM(key, table_bits=table_bits)._htable is other._htable  # seeded H_CACHE
+
+
+def test_context_invalid():
+    data = export_context(AESGCM(bytes(16)))
+
+    for bad in (b"", b"XGCM" + data[4:], data[:4] + b"\x02" + data[5:], data[:-1]):
+        with pytest.raises(ValueError):
+            import_context(bad)
+
+    with pytest.raises(ValueError):
+        export_context(AESGCM(bytes(16), AES))
+
+
+def test_context_shared_memory():
+    """Process pool workers attach to one shared context"""
+
+    rng = random.Random(1)
+    gcm = AESGCM(rng.randbytes(16), aggregate=4)
+    messages = [(rng.randbytes(n), rng.randbytes(12), rng.randbytes(n % 7)) for n in (0, 40, 999)]
+
+    shm = share_context(gcm)
+    try:
+        with ProcessPoolExecutor(max_workers=2) as pool:
+            futures = [pool.submit(_encrypt_attached, shm.name, *m) for m in messages]
+            assert [f.result() for f in futures] == [gcm.encrypt(*m) for m in messages]
+    finally:
+        shm.close()
+        shm.unlink()
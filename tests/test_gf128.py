@@ -0,0 +1,117 @@
+import random
+
+import pytest
+
+from aes_gcm import AESGCM
+from gf128 import (
+    AggregatedGHASH,
+    GF128Table,
+    clmul,
+    gf_mul,
+    gf_pow,
+    karatsuba,
+    reduce256,
+    reverse128,
+)
+
+
+def test_gf128_table():
+    """Compare table-driven multiplication against the bit-serial reference"""
+
+    rng = random.Random(0)
+    aesgcm = AESGCM(bytes(16))
+
+    for bits in (4, 8):
+        for _ in range(20):
+            h = rng.randbytes(16)
+            x = rng.randbytes(16)
+            table = GF128Table(int.from_bytes(h, "big"), bits)
+
+            assert table.mul(int.from_bytes(x, "big")).to_bytes(16, "big") == aesgcm._gf_mul(x, h)
+
+        assert table.mul(0) == 0
+
+    with pytest.raises(ValueError):
+        GF128Table(1, 6)
+
+
+def test_ghash_table_sizes():
+    rng = random.Random(1)
+    key = rng.randbytes(16)
+    x = rng.randbytes(16 * 9)
+
+    expected = AESGCM(key)._ghash_ref(x)
+    for bits in (4, 8):
+        assert AESGCM(key, table_bits=bits)._ghash(x) == expected
+
+
+def test_karatsuba_reduction():
+    """Check the RTL-style Karatsuba product and deferred reduction against GF128Table"""
+
+    rng = random.Random(2)
+
+    for _ in range(20):
+        a = rng.getrandbits(128)
+        b = rng.getrandbits(128)
+
+        product = reduce256(karatsuba(reverse128(a), reverse128(b)))
+        assert reverse128(product) == GF128Table(b).mul(a)
+        assert karatsuba(a, b) == clmul(a, b)
+
+
+def test_aggregated_ghash():
+    rng = random.Random(3)
+    key = rng.randbytes(16)
+    aesgcm = AESGCM(key)
+
+    for k in (1, 3, 4, 8):
+        aggregated = AggregatedGHASH(int.from_bytes(aesgcm.H, "big"), k)
+        for n in (0, 1, 4, 5, 17):
+            x = rng.randbytes(16 * n)
+            assert aggregated.ghash(x).to_bytes(16, "big") == aesgcm._ghash(x)
+
+    # Continuing from a running value
+    x = rng.randbytes(16 * 7)
+    y = int.from_bytes(aesgcm._ghash(x[:48]), "big")
+    assert aggregated.ghash(x[48:], y).to_bytes(16, "big") == aesgcm._ghash(x)
+
+    with pytest.raises(ValueError):
+        AggregatedGHASH(1, 0)
+
+
+def test_aes_gcm_aggregate():
+    rng = random.Random(4)
+    key = rng.randbytes(16)
+    iv = rng.randbytes(12)
+    plaintext = rng.randbytes(100)
+    aad = rng.randbytes(20)
+
+    c, t = AESGCM(key).encrypt(plaintext, iv, aad)
+    assert AESGCM(key, aggregate=4).encrypt(plaintext, iv, aad) == (c, t)
+    assert AESGCM(key, aggregate=4).decrypt(c, iv, aad, t) == plaintext
+
+
+def test_gf_pow():
+    rng = random.Random(5)
+    h = rng.getrandbits(128)
+    table = GF128Table(h)
+
+    z = 1 << 127
+    for n in range(6):
+        assert gf_pow(h, n) == z
+        z = table.mul(z)
+
+    assert gf_mul(h, z) == table.mul(z)
+
+
+@pytest.mark.parametrize("bits", [4, 8])
+def test_gf128_mul_many(bits):
+    np = pytest.importorskip("numpy")
+    rng = random.Random(7)
+    table = GF128Table(rng.getrandbits(128), bits)
+    xs = [rng.getrandbits(128) for _ in range(50)]
+
+    hi = np.array([x >> 64 for x in xs], dtype=np.uint64)
+    lo = np.array([x & ((1 << 64) - 1) for x in xs], dtype=np.uint64)
+    z_hi, z_lo = table.mul_many(hi, lo)
+    assert [int(a) << 64 | int(b) for a, b in zip(z_hi, z_lo)] == [table.mul(x) for x in xs]
@@ -0,0 +1,80 @@
+import pytest
+
+import golden
+from aes import AES
+from aes_ctr import AESCTR
+from aes_gcm import AESGCM
+from gf128 import gf_mul, karatsuba, reduce256
+
+
+def _read(path):
+    text = path.read_text()
+    assert not text.endswith("\n")  # $readmemh layout of the checked-in files
+    return [bytes.fromhex(line) for line in text.split("\n")]
+
+
+@pytest.fixture
+def small_chunks(monkeypatch):
+    monkeypatch.setattr(golden, "CHUNK_BLOCKS", 7)  # several chunks for a few blocks
+
+
+@pytest.mark.parametrize("key_bits", [128, 192, 256])
+def test_golden_keyed(tmp_path, small_chunks, key_bits):
+    """Check generated AES, key expansion, CTR and GCM vectors against the reference"""
+
+    for test in golden.KEYED:
+        golden.generate(tmp_path, test, key_bits, blocks=20, seed=1)
+
+    d = tmp_path / "test_aes" / f"aes{key_bits}"
+    round_keys = _read(d / "round_key.hex")
+    ciph = AES(b"".join(round_keys)[: key_bits // 8])
+    assert b"".join(round_keys) == b"".join(ciph.w)
+    plaintext = _read(d / "plaintext.hex")
+    assert len(plaintext) == 20
+    assert [ciph.encrypt(p) for p in plaintext] == _read(d / "ciphertext.hex")
+
+    d = tmp_path / "test_key_expansion" / f"aes{key_bits}"
+    keys = _read(d / "key.hex")
+    assert b"".join(_read(d / "round_key.hex")) == b"".join(b"".join(AES(k).w) for k in keys)
+
+    d = tmp_path / "test_aes_ctr" / f"aes{key_bits}"
+    (key,), (iv,) = _read(d / "key.hex"), _read(d / "iv.hex")
+    plaintext = b"".join(_read(d / "plaintext.hex"))
+    assert AESCTR(key, iv).encrypt(plaintext) == b"".join(_read(d / "ciphertext.hex"))
+
+    d = tmp_path / "test_aes_gcm" / f"aes{key_bits}"
+    (key,), (iv,), (tag,) = _read(d / "key.hex"), _read(d / "iv.hex"), _read(d / "tag.hex")
+    plaintext = b"".join(_read(d / "plaintext.hex"))
+    c, t = AESGCM(key).encrypt(plaintext, iv, b"")
+    assert (c, t) == (b"".join(_read(d / "ciphertext.hex")), tag)
+
+
+def test_golden_arithmetic(tmp_path, small_chunks):
+    """Check generated GHASH, GF(2^128) and Karatsuba vectors, in and out of a process pool"""
+
+    for test in ("test_mix_columns", "test_gf128_mul", "test_karatsuba", "test_ghash"):
+        golden.generate(tmp_path / "serial", test, blocks=30, seed=2)
+        golden.generate(tmp_path / "pool", test, blocks=30, seed=2, workers=2)
+
+    for path in sorted((tmp_path / "serial").rglob("*.hex")):
+        other = tmp_path / "pool" / path.relative_to(tmp_path / "serial")
+        assert path.read_text() == other.read_text()
+
+    d = tmp_path / "serial"
+    ints = lambda p: [int.from_bytes(x, "big") for x in _read(p)]  # noqa: E731
+
+    a, b = ints(d / "test_gf128_mul" / "a.hex"), ints(d / "test_gf128_mul" / "b.hex")
+    expected = [reduce256(karatsuba(x, y)) for x, y in zip(a, b)]
+    assert ints(d / "test_gf128_mul" / "result.hex") == expected
+
+    a, b = ints(d / "test_karatsuba" / "a.hex"), ints(d / "test_karatsuba" / "b.hex")
+    assert ints(d / "test_karatsuba" / "result.hex") == [karatsuba(x, y) for x, y in zip(a, b)]
+
+    (h,) = ints(d / "test_ghash" / "h.hex")
+    y = 0
+    for x in ints(d / "test_ghash" / "din.hex"):
+        y = gf_mul(y ^ x, h)
+    assert ints(d / "test_ghash" / "dout.hex") == [y]
+
+    with pytest.raises(ValueError):
+        golden.generate(tmp_path, "test_fifo")
@@ -0,0 +1,90 @@
+import pytest
+
+import aes_gcm
+import instrument
+from aes_gcm import AESGCM
+
+
+@pytest.fixture
+def stats():
+    calls = []
+    stats = instrument.enable(calls.append)
+    yield stats, calls
+    instrument.disable()
+
+
+def test_instrument_counters(stats):
+    stats, calls = stats
+    aes_gcm.H_CACHE.clear()
+
+    gcm = AESGCM(bytes(16))
+    assert (stats.calls, stats.block_encryptions) == (1, 1)  # init: H
+    assert stats.stage_seconds["setup"] > 0
+    stats.reset()
+
+    iv = bytes(12)
+    c, t = gcm.encrypt(bytes(40), iv, bytes(20))
+    assert gcm.decrypt(c, iv, bytes(20), t) == bytes(40)
+
+    # Per call: 3 data blocks + the J0 block; 2 AAD + 3 data + 1 length multiplies;
+    # output and its copy, counter blocks and keystream of the data and of the tag,
+    # the tag's output and its copy
+    assert stats.calls == 2
+    assert stats.block_encryptions == 2 * 4
+    assert stats.gf_multiplies == 2 * 6
+    assert stats.bytes_processed == 2 * 60
+    assert stats.allocations == 2 * 8
+
+    assert [call["op"] for call in calls] == ["init", "encrypt", "decrypt"]
+    for call in calls[1:]:
+        assert (call["aad_bytes"], call["data_bytes"]) == (20, 40)
+        assert all(call[stage] >= 0 for stage in ("j0", "gctr", "ghash", "tag"))
+
+    totals = stats.as_dict()["stage_seconds"]
+    assert totals["gctr"] == pytest.approx(sum(call["gctr"] for call in calls[1:]))
+
+    stats.reset()
+    assert stats.as_dict()["calls"] == 0
+
+
+@pytest.mark.parametrize("aggregate", [0, 4])
+def test_instrument_counted_at_source(stats, aggregate):
+    """Counters follow the work done: long IVs, aggregated GHASH and every entry point"""
+
+    stats, calls = stats
+    gcm = AESGCM(bytes(16), aggregate=aggregate)
+    stats.reset()
+    calls.clear()
+
+    c, t = gcm.encrypt(bytes(40), bytes(8), bytes(20))
+    assert stats.gf_multiplies == 2 + 6  # J0: IV and length blocks
+    assert stats.block_encryptions == 4
+
+    stats.reset()
+    calls.clear()
+    assert gcm.verify(c, bytes(8), bytes(20), t)
+    assert gcm.verify_mac(bytes(12), bytes(20), gcm.mac(bytes(12), bytes(20)))
+    gcm.encrypt_many([(bytes(12), bytes(40), bytes(20))] * 3)
+    gcm.decrypt_many([(bytes(8), c, bytes(20), t)])
+    enc = gcm.encryptor(bytes(12))
+    enc.update_aad(bytes(20))
+    enc.update(bytes(40))
+    enc.finalize()
+
+    ops = ["verify", "mac", "verify_mac", "encrypt_many", "decrypt_many", "encryptor"]
+    assert [call["op"] for call in calls] == ops
+    assert stats.calls == len(ops)
+    assert stats.bytes_processed == 60 + 20 + 20 + 3 * 60 + 60 + 60
+    assert stats.gf_multiplies == 8 + 3 + 3 + 3 * 6 + 8 + 6
+    assert stats.block_encryptions == 1 + 1 + 1 + 3 * 4 + (1 + 4) + 4  # J0 again after the check
+
+
+def test_instrument_disabled():
+    stats = instrument.enable()
+    assert instrument.disable() is stats
+    assert instrument.current is None
+
+    gcm = AESGCM(bytes(16))
+    gcm.encrypt(bytes(16), bytes(12), b"")
+    assert stats.calls == 0
+    assert stats.block_encryptions == 0
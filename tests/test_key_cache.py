@@ -0,0 +1,45 @@
+import pytest
+
+import aes_fast
+from aes_fast import FastAES
+from key_cache import LRUCache
+
+
+def test_lru_cache():
+    cache = LRUCache(maxsize=2)
+
+    assert cache.get(b"a", lambda: 1) == 1
+    assert cache.get(b"b", lambda: 2) == 2
+    assert cache.get(b"a", lambda: -1) == 1  # hit, "a" becomes most recent
+    assert cache.get(b"c", lambda: 3) == 3  # evicts "b"
+    assert cache.get(b"b", lambda: 4) == 4
+
+    info = cache.info()
+    assert (info.hits, info.misses, info.maxsize, info.currsize) == (1, 4, 2, 2)
+
+    cache.resize(1)
+    assert cache.info().currsize == 1
+    assert cache.get(b"b", lambda: -1) == 4
+
+    cache.resize(0)
+    assert cache.get(b"b", lambda: 5) == 5
+    assert cache.info().currsize == 0
+
+    with pytest.raises(ValueError):
+        cache.resize(-1)
+
+    cache.clear()
+    assert cache.info() == (0, 0, 0, 0)
+
+
+def test_schedule_cache():
+    aes_fast.SCHEDULE_CACHE.clear()
+
+    key = bytes(range(16))
+    first = FastAES(key)
+    second = FastAES(bytearray(key))
+
+    assert second.ek is first.ek
+    assert second.dk is first.dk
+    assert aes_fast.SCHEDULE_CACHE.info().hits == 1
+    assert aes_fast.SCHEDULE_CACHE.info().misses == 1
@@ -0,0 +1,69 @@
+import random
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from aes_gcm import AESGCM
+from keystream import KeystreamPool
+
+
+def test_keystream_pool():
+    """Encryption from reserved keystream matches AESGCM.encrypt, with or without a reservation"""
+
+    rng = random.Random(0)
+    gcm = AESGCM(rng.randbytes(16))
+    aad = rng.randbytes(20)
+
+    with KeystreamPool(gcm, max_reservations=8) as pool:
+        for reserved, length in ((64, 64), (100, 37), (32, 100), (0, 50), (200, 0)):
+            iv = rng.randbytes(12)
+            plaintext = rng.randbytes(length)
+
+            pool.reserve(iv, reserved)
+            with pytest.raises(ValueError):
+                pool.reserve(iv, reserved)
+
+            assert pool.encrypt(plaintext, iv, aad) == gcm.encrypt(plaintext, iv, aad)
+            assert len(pool) == 0
+
+        iv = rng.randbytes(12)
+        assert pool.encrypt(b"no reservation", iv, aad) == gcm.encrypt(b"no reservation", iv, aad)
+        assert type(pool.encrypt(b"no reservation", iv, aad)[0]) is bytes
+
+        with pytest.raises(ValueError):
+            pool.reserve(iv, -1)
+
+
+def test_keystream_pool_wipe():
+    """Evicted and released keystream is zeroed"""
+
+    gcm = AESGCM(bytes(16))
+    ivs = [bytes(11) + bytes([i]) for i in range(3)]
+
+    with KeystreamPool(gcm, max_reservations=2) as pool:
+        pool.reserve(ivs[0], 64)
+        pool.reserve(ivs[1], 64)
+        futures = [future for _, future in pool._reserved.values()]
+        for future in futures:
+            future.result()  # generated, so wiping happens on discard
+        pool.reserve(ivs[2], 64)  # evicts ivs[0]
+        assert len(pool) == 2
+
+        pool.release(ivs[1])
+        assert len(pool) == 1
+        for future in futures:
+            assert future.result() == bytes(80)
+
+        c, t = gcm.encrypt(bytes(64), ivs[0], b"")
+        assert pool.encrypt(bytes(64), ivs[0], b"") == (c, t)
+
+
+def test_keystream_pool_process_executor():
+    gcm = AESGCM(bytes(32))
+    iv = bytes(12)
+
+    with ProcessPoolExecutor(max_workers=1) as executor:
+        pool = KeystreamPool(gcm, executor=executor)
+        pool.reserve(iv, 100)
+        assert pool.encrypt(bytes(100), iv, b"aad") == gcm.encrypt(bytes(100), iv, b"aad")
+        pool.close()
@@ -0,0 +1,80 @@
+import random
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+import parallel
+from aes_ctr import AESCTR
+from aes_gcm import AESGCM
+
+
+@pytest.fixture(scope="module")
+def executor():
+    with ProcessPoolExecutor(max_workers=2) as pool:
+        yield pool
+
+
+def test_parallel_gcm(executor):
+    """Test that chunked multi-process GCM matches the serial path bit for bit"""
+
+    rng = random.Random(0)
+    key = rng.randbytes(32)
+    aesgcm = AESGCM(key)
+
+    for length, aad_len in ((100, 0), (1000, 13), (1024, 64)):
+        iv = rng.randbytes(12)
+        plaintext = rng.randbytes(length)
+        aad = rng.randbytes(aad_len)
+        c, t = aesgcm.encrypt(plaintext, iv, aad)
+
+        options = {"chunk_size": 80, "executor": executor}
+
+        assert parallel.gcm_encrypt(aesgcm, plaintext, iv, aad, **options) == (c, t)
+        assert parallel.gcm_decrypt(aesgcm, c, iv, aad, t, **options) == plaintext
+
+        with pytest.raises(ValueError):
+            parallel.gcm_decrypt(aesgcm, c, iv, aad + b"x", t, **options)
+
+    # Chunked and serial paths both return bytes
+    for options in ({"chunk_size": 80, "executor": executor}, {}):
+        assert type(parallel.gcm_encrypt(aesgcm, plaintext, iv, aad, **options)[0]) is bytes
+        assert type(parallel.gcm_decrypt(aesgcm, c, iv, aad, t, **options)) is bytes
+
+
+class _Spy:
+    """Executor wrapper that records the GHASH mode of every task."""
+
+    def __init__(self, executor):
+        self.executor, self.modes = executor, []
+
+    def map(self, fn, tasks):
+        tasks = list(tasks)
+        self.modes += [task[-1] for task in tasks]
+        return self.executor.map(fn, tasks)
+
+
+def test_parallel_gcm_verify_first(executor):
+    """A forged tag is rejected before any chunk is decrypted"""
+
+    rng = random.Random(2)
+    aesgcm = AESGCM(rng.randbytes(16))
+    iv, aad, plaintext = rng.randbytes(12), rng.randbytes(7), rng.randbytes(300)
+    c, t = aesgcm.encrypt(plaintext, iv, aad)
+
+    spy = _Spy(executor)
+    with pytest.raises(ValueError):
+        parallel.gcm_decrypt(aesgcm, c, iv, aad, bytes(16), chunk_size=64, executor=spy)
+    assert spy.modes == [parallel._GHASH_INPUT] * 5
+
+    spy.modes.clear()
+    assert parallel.gcm_decrypt(aesgcm, c, iv, aad, t, chunk_size=64, executor=spy) == plaintext
+    assert spy.modes == [parallel._GHASH_INPUT] * 5 + [parallel._GHASH_NONE] * 5
+
+
+def test_parallel_ctr(executor):
+    rng = random.Random(1)
+    ctr = AESCTR(rng.randbytes(16), bytes(12) + bytes.fromhex("fffffffd"))
+    data = rng.randbytes(777)
+
+    assert parallel.ctr_crypt(ctr, data, chunk_size=64, executor=executor) == ctr.encrypt(data)
+    assert parallel.ctr_crypt(ctr, data, workers=2, chunk_size=256) == ctr.encrypt(data)
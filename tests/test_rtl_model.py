@@ -0,0 +1,81 @@
+import random
+from pathlib import Path
+
+import pytest
+
+from rtl_model import simulate_ctr, simulate_gcm
+
+TESTS = Path(__file__).parent
+
+
+def _read_hex(path):
+    return bytes.fromhex("".join(path.read_text().split()))
+
+
+@pytest.mark.parametrize("key_size", [128, 192, 256])
+def test_rtl_model_ctr(key_size):
+    """Run the aes_ctr.sv model over its testbench vectors, with and without backpressure"""
+
+    vectors = TESTS / "test_aes_ctr" / f"aes{key_size}"
+    key = _read_hex(vectors / "key.hex")
+    iv = _read_hex(vectors / "iv.hex")
+    plaintext = _read_hex(vectors / "plaintext.hex")
+    ciphertext = _read_hex(vectors / "ciphertext.hex")
+
+    report = simulate_ctr(key, iv, plaintext)
+    assert report.matches and report.output == ciphertext
+    assert report.blocks_per_cycle == 1.0  # one block per cycle once the pipeline is full
+
+    report = simulate_ctr(key, iv, plaintext, ready_pattern="1101", valid_pattern="10111")
+    assert report.matches
+    assert report.blocks_per_cycle < 1.0
+
+
+def test_rtl_model_gcm():
+    """Run the aes_gcm.sv model over its testbench vectors in both directions"""
+
+    vectors = TESTS / "test_aes_gcm" / "aes128"
+    key = _read_hex(vectors / "key.hex")
+    iv = _read_hex(vectors / "iv.hex")
+    plaintext = _read_hex(vectors / "plaintext.hex")
+    ciphertext = _read_hex(vectors / "ciphertext.hex")
+    tag = _read_hex(vectors / "tag.hex")
+
+    report = simulate_gcm(key, iv, plaintext)
+    assert report.matches
+    assert (report.output, report.tag) == (ciphertext, tag)
+    assert report.cycles == sum(report.state_cycles.values())
+
+    report = simulate_gcm(key, iv, ciphertext, decrypt=True)
+    assert report.matches
+    assert (report.output, report.tag) == (plaintext, tag)
+
+    report = simulate_gcm(key, iv, plaintext, valid_pattern="110")
+    assert report.matches
+
+    # Decryption GHASH skips blocks that arrive with din_valid_i low (see rtl_model)
+    report = simulate_gcm(key, iv, ciphertext, decrypt=True, valid_pattern="110")
+    assert report.output == plaintext
+    assert not report.matches
+
+
+def test_rtl_model_gcm_throughput():
+    """GHASH limits GCM to one block per multiplier round trip, however deep its FIFO"""
+
+    rng = random.Random(0)
+    key = rng.randbytes(16)
+    iv = rng.randbytes(12)
+    data = rng.randbytes(16 * 200)
+
+    for depth in (4, 32):
+        report = simulate_gcm(key, iv, data, ghash_fifo_depth=depth, mul_latency=4)
+        assert report.matches
+        assert report.fifo_peak <= depth
+        assert 0.2 <= report.blocks_per_cycle < 0.3
+
+    report = simulate_gcm(key, iv, data, mul_latency=1)
+    assert report.matches
+    assert report.blocks_per_cycle > 0.5
+
+    with pytest.raises(ValueError):
+        simulate_gcm(key, iv, data[:20])